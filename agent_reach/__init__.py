@@ -4,6 +4,13 @@
 __version__ = "1.4.0"
 __author__ = "Neo Reid"
 
-from agent_reach.core import AgentReach
-
 __all__ = ["AgentReach"]
+
+
+def __getattr__(name):
+    # Imported on first use so `agent-reach version` doesn't load config/yaml
+    if name == "AgentReach":
+        from agent_reach.core import AgentReach
+
+        return AgentReach
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""TTL cache for the JSON APIs behind the V2EX and Xueqiu channels.
+
+Each channel declares CacheRules: a regex matched against the request URL,
+how long a response stays fresh (*ttl*), and how much longer it may still
+be served (*stale*) while a background thread fetches a new one. URLs no
+rule matches are never cached. So a quote is reused for seconds, a hot list
+for minutes and a user profile for hours. Repeated calls within one agent
+task return at once and never spend API quota.
+
+Responses live in an in-memory LRU per channel. ``AGENT_REACH_API_CACHE``
+picks the mode:
+
+    memory   (default) in-memory only
+    disk     also kept under ~/.agent-reach/api-cache/<channel>/, so later
+             processes start warm (rules with ``disk=False`` stay in
+             memory); files past every rule's ttl + stale are swept, and
+             the directory is capped at *max_disk_bytes*
+    off      every call goes to the network
+
+Errors are never cached, nor are 200 responses whose body is an error
+(is_error_payload). A failed background refresh leaves the stale response
+in place until its stale window runs out.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+MODE_ENV = "AGENT_REACH_API_CACHE"
+MODES = ("memory", "disk", "off")
+CACHE_DIRNAME = "api-cache"
+
+# Responses kept in memory per channel
+DEFAULT_MAX_ENTRIES = 512
+# Size of one channel's disk tier
+DEFAULT_MAX_DISK_BYTES = 16 * 1024 * 1024
+# Seconds between sweeps of the disk tier
+SWEEP_INTERVAL = 300.0
+
+# Every ApiCache created by for_rules(), so clear_all() can reset them
+_registry: "Set[ApiCache]" = set()
+
+
+class CacheRule(NamedTuple):
+    """How long responses from URLs matching *pattern* are reused."""
+
+    pattern: str
+    ttl: float  # seconds served as fresh
+    stale: float = 0.0  # further seconds served while a refresh runs
+    disk: bool = True  # also kept in the disk tier when it is enabled
+
+
+def is_error_payload(value: Any) -> bool:
+    """True for a 200 response that reports an error instead of data.
+
+    Covers the v2 envelope ``{"success": false}``, v1's ``{"status":
+    "error", "message": ...}``, Xueqiu's nonzero ``error_code`` and a bare
+    ``{"message": ...}``.
+    """
+    if not isinstance(value, dict):
+        return False
+    if value.get("success") is False or value.get("status") == "error":
+        return True
+    if value.get("error_code") not in (None, 0, "0", ""):
+        return True
+    return "message" in value and set(value) <= {"message", "status", "success", "code", "error"}
+
+
+class ApiCache:
+    """In-memory LRU of JSON responses, with an optional on-disk tier."""
+
+    def __init__(
+        self,
+        rules: Iterable[CacheRule],
+        root: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        enabled: bool = True,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        self.rules = [(re.compile(rule.pattern), rule) for rule in rules]
+        self.root = Path(root) if root is not None else None
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.max_disk_bytes = max_disk_bytes
+        self._swept_at: Optional[float] = None
+        # url -> (fetched_at, value)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = dict.fromkeys(("hits", "stale", "misses", "refreshes"), 0)
+
+    def rule_for(self, url: str) -> Optional[CacheRule]:
+        for regex, rule in self.rules:
+            if regex.search(url):
+                return rule
+        return None
+
+    def get(self, url: str, fetch: Callable[[], Any]) -> Any:
+        """Return the response for *url*, calling *fetch* only when it is not usable.
+
+        A fresh response is returned as is. A stale one is returned too, and
+        *fetch* runs in the background to replace it. Otherwise *fetch* runs
+        now and its result is stored. Errors from *fetch* propagate.
+        """
+        rule = self.rule_for(url) if self.enabled else None
+        if rule is None:
+            return fetch()
+        now = time.time()
+        cached = self._lookup(url, rule)
+        if cached is not None:
+            fetched_at, value = cached
+            age = now - fetched_at
+            if age < rule.ttl:
+                self._count("hits")
+                return copy.deepcopy(value)
+            if age < rule.ttl + rule.stale:
+                self._count("stale")
+                self._refresh(url, rule, fetch)
+                return copy.deepcopy(value)
+        self._count("misses")
+        value = fetch()
+        self._store(url, rule, value)
+        return copy.deepcopy(value)
+
+    def sweep(self) -> None:
+        """Delete disk files past every rule's ttl + stale, then the oldest over max_disk_bytes."""
+        if self.root is None:
+            return
+        self._swept_at = time.monotonic()
+        max_age = max((rule.ttl + rule.stale for _, rule in self.rules if rule.disk), default=0.0)
+        now = time.time()
+        files = []
+        try:
+            paths = list(self.root.glob("*.json"))
+        except OSError:
+            return
+        for path in paths:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if now - st.st_mtime > max_age:
+                _unlink(path)
+            else:
+                files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            _unlink(path)
+            total -= size
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (the disk tier is left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+    # -- internals ---------------------------------------------------------
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _lookup(self, url: str, rule: CacheRule) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            cached = self._entries.get(url)
+            if cached is not None:
+                self._entries.move_to_end(url)
+                return cached
+        if self.root is None or not rule.disk:
+            return None
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            cached = (float(data["fetched_at"]), data["value"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        self._remember(url, cached)
+        return cached
+
+    def _remember(self, url: str, cached: Tuple[float, Any]) -> None:
+        with self._lock:
+            self._entries[url] = cached
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _store(self, url: str, rule: CacheRule, value: Any) -> None:
+        if is_error_payload(value):
+            return
+        cached = (time.time(), value)
+        self._remember(url, cached)
+        if self.root is None or not rule.disk:
+            return
+        # Written atomically; failures are ignored — it is only a cache
+        path = self._path(url)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"url": url, "fetched_at": cached[0], "value": value}, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            _unlink(tmp)
+            return
+        if self._swept_at is None or time.monotonic() - self._swept_at >= SWEEP_INTERVAL:
+            self.sweep()
+
+    def _refresh(self, url: str, rule: CacheRule, fetch: Callable[[], Any]) -> None:
+        """Fetch *url* again in a daemon thread, unless a refresh is already running."""
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+            self.stats["refreshes"] += 1
+
+        def run():
+            try:
+                self._store(url, rule, fetch())
+            except Exception:
+                pass  # keep serving the stale response
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        threading.Thread(target=run, name="api-cache-refresh", daemon=True).start()
+
+    def _path(self, url: str) -> Path:
+        assert self.root is not None
+        return self.root / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _unlink(path: Path) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def cache_mode() -> str:
+    """The mode from AGENT_REACH_API_CACHE ("memory" when unset or unknown)."""
+    mode = (os.environ.get(MODE_ENV) or "memory").strip().lower()
+    return mode if mode in MODES else "memory"
+
+
+def for_rules(rules: Iterable[CacheRule], name: str = "", **kwargs) -> ApiCache:
+    """An ApiCache for channel *name*'s *rules*, set up according to cache_mode()."""
+    mode = cache_mode()
+    root = None
+    if mode == "disk":
+        try:
+            from agent_reach.config import Config
+
+            root = Config().config_dir / CACHE_DIRNAME
+            if name:
+                root = root / name
+        except Exception:
+            root = None
+    cache = ApiCache(rules, root=root, enabled=mode != "off", **kwargs)
+    _registry.add(cache)
+    return cache
+
+
+def clear_all() -> None:
+    """Empty the in-memory tier of every channel's cache."""
+    for cache in list(_registry):
+        cache.clear()
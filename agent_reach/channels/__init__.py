@@ -1,65 +1,212 @@
 # -*- coding: utf-8 -*-
 """
-Channel registry — lists all supported platforms for doctor checks.
+Channel registry — lists all supported platforms for doctor checks,
+and routes URLs to the channel that handles them.
+
+The registry is lazy. Each channel is described by a ChannelSpec (name,
+tier, URL patterns, and where its class lives); the channel module is
+imported only when the channel is first used, so ``get_channel("youtube")``
+imports the YouTube module and nothing else.
+
+Third-party packages can add channels through the ``agent_reach.channels``
+entry-point group, pointing at a Channel subclass:
+
+    [project.entry-points."agent_reach.channels"]
+    mastodon = "agent_reach_mastodon:MastodonChannel"
+
+Built-in channels win over plugins with the same name.
 """
 
-from typing import List, Optional
+import importlib
+import threading
+import warnings
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
 from .base import Channel
+from .hosts import HOSTS, PATH_MARKERS
+from .router import Router
+
+ENTRY_POINT_GROUP = "agent_reach.channels"
+
+
+class ChannelSpec:
+    """What the registry knows about a channel without importing it.
+
+    *target* is ``"module:ClassName"``. Plugin specs only know their name
+    and target until loaded, so their *tier* and URL patterns are None.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target: str,
+        tier: Optional[int] = 0,
+        hosts: Optional[Sequence[str]] = (),
+        path_markers: Sequence[str] = (),
+        catch_all: bool = False,
+    ):
+        self.name = name
+        self.target = target
+        self.tier = tier
+        self.hosts = list(hosts) if hosts is not None else None
+        self.path_markers = list(path_markers)
+        self.catch_all = catch_all
+        self._instance: Optional[Channel] = None
 
-# Import all channels
-from .web import WebChannel
-from .github import GitHubChannel
-from .twitter import TwitterChannel
-from .youtube import YouTubeChannel
-from .reddit import RedditChannel
-from .rss import RSSChannel
-from .bilibili import BilibiliChannel
-from .exa_search import ExaSearchChannel
-from .xiaohongshu import XiaoHongShuChannel
-from .douyin import DouyinChannel
-from .linkedin import LinkedInChannel
-from .wechat import WeChatChannel
-from .weibo import WeiboChannel
-from .xiaoyuzhou import XiaoyuzhouChannel
-from .v2ex import V2EXChannel
-from .xueqiu import XueqiuChannel
-
-
-ALL_CHANNELS: List[Channel] = [
-    GitHubChannel(),
-    TwitterChannel(),
-    YouTubeChannel(),
-    RedditChannel(),
-    BilibiliChannel(),
-    XiaoHongShuChannel(),
-    DouyinChannel(),
-    LinkedInChannel(),
-    WeChatChannel(),
-    WeiboChannel(),
-    XiaoyuzhouChannel(),
-    V2EXChannel(),
-    XueqiuChannel(),
-    RSSChannel(),
-    ExaSearchChannel(),
-    WebChannel(),
+    def __repr__(self):
+        return f"ChannelSpec({self.name!r}, {self.target!r})"
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def load(self) -> Channel:
+        """Import the channel module (once) and return the shared instance."""
+        if self._instance is None:
+            with _load_lock:
+                if self._instance is None:
+                    module_name, _, attr = self.target.partition(":")
+                    obj: Any = importlib.import_module(module_name)
+                    for part in attr.split("."):
+                        obj = getattr(obj, part)
+                    factory: Callable[[], Channel] = obj
+                    self._instance = factory()
+        return self._instance
+
+
+_load_lock = threading.RLock()
+
+
+def _builtin(name: str, target: str, tier: int, catch_all: bool = False) -> ChannelSpec:
+    """A built-in spec, with its URL patterns taken from hosts.py."""
+    return ChannelSpec(name, target, tier, hosts=HOSTS.get(name, ()),
+                       path_markers=PATH_MARKERS.get(name, ()), catch_all=catch_all)
+
+
+BUILTIN_SPECS: List[ChannelSpec] = [
+    _builtin("github", "agent_reach.channels.github:GitHubChannel", 0),
+    _builtin("twitter", "agent_reach.channels.twitter:TwitterChannel", 1),
+    _builtin("youtube", "agent_reach.channels.youtube:YouTubeChannel", 0),
+    _builtin("reddit", "agent_reach.channels.reddit:RedditChannel", 0),
+    _builtin("bilibili", "agent_reach.channels.bilibili:BilibiliChannel", 1),
+    _builtin("xiaohongshu", "agent_reach.channels.xiaohongshu:XiaoHongShuChannel", 1),
+    _builtin("douyin", "agent_reach.channels.douyin:DouyinChannel", 2),
+    _builtin("linkedin", "agent_reach.channels.linkedin:LinkedInChannel", 2),
+    _builtin("wechat", "agent_reach.channels.wechat:WeChatChannel", 0),
+    _builtin("weibo", "agent_reach.channels.weibo:WeiboChannel", 1),
+    _builtin("xiaoyuzhou", "agent_reach.channels.xiaoyuzhou:XiaoyuzhouChannel", 1),
+    _builtin("v2ex", "agent_reach.channels.v2ex:V2EXChannel", 0),
+    _builtin("xueqiu", "agent_reach.channels.xueqiu:XueqiuChannel", 1),
+    _builtin("rss", "agent_reach.channels.rss:RSSChannel", 0),
+    _builtin("exa_search", "agent_reach.channels.exa_search:ExaSearchChannel", 0),
+    _builtin("web", "agent_reach.channels.web:WebChannel", 0, catch_all=True),
 ]
 
+_BUILTIN_BY_NAME: Dict[str, ChannelSpec] = {spec.name: spec for spec in BUILTIN_SPECS}
+_plugin_specs: Optional[List[ChannelSpec]] = None
+
+
+def _discover_plugins() -> List[ChannelSpec]:
+    """Channel specs registered by other distributions (scanned once)."""
+    global _plugin_specs
+    if _plugin_specs is None:
+        from importlib.metadata import entry_points
+
+        specs: List[ChannelSpec] = []
+        for ep in entry_points(group=ENTRY_POINT_GROUP):
+            if ep.name in _BUILTIN_BY_NAME or any(s.name == ep.name for s in specs):
+                continue
+            specs.append(ChannelSpec(ep.name, ep.value, tier=None, hosts=None))
+        _plugin_specs = specs
+    return _plugin_specs
+
+
+def get_channel_specs() -> List[ChannelSpec]:
+    """Get every channel's spec (built-in, then plugins) without importing any."""
+    return BUILTIN_SPECS + _discover_plugins()
+
+
+def _load_all() -> List[Channel]:
+    channels = [spec.load() for spec in BUILTIN_SPECS]
+    for spec in _discover_plugins():
+        try:
+            channels.append(spec.load())
+        except Exception as e:
+            # A broken plugin must not take down doctor for everyone else
+            warnings.warn(f"skipping channel plugin {spec.name!r}: {e}", RuntimeWarning)
+    return channels
+
+
+_all_channels: Optional[List[Channel]] = None
+
 
 def get_channel(name: str) -> Optional[Channel]:
-    """Get a channel by name."""
-    for ch in ALL_CHANNELS:
-        if ch.name == name:
-            return ch
-    return None
+    """Get a channel by name, importing only its module."""
+    spec = _BUILTIN_BY_NAME.get(name)
+    if spec is None:
+        spec = next((s for s in _discover_plugins() if s.name == name), None)
+    return spec.load() if spec is not None else None
 
 
 def get_all_channels() -> List[Channel]:
-    """Get all registered channels."""
-    return ALL_CHANNELS
+    """Get all registered channels (imports every channel module)."""
+    global _all_channels
+    if _all_channels is None:
+        _all_channels = _load_all()
+    return _all_channels
+
+
+def __getattr__(name: str):
+    # ALL_CHANNELS used to be built at import time; keep it as a lazy alias
+    if name == "ALL_CHANNELS":
+        return get_all_channels()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_router: Optional[Router] = None
+
+
+def _get_router() -> Router:
+    """Index specs by their declared URL patterns; plugins are loaded to learn theirs."""
+    global _router
+    if _router is None:
+        entries: List[Union[ChannelSpec, Channel]] = list(BUILTIN_SPECS)
+        for spec in _discover_plugins():
+            try:
+                entries.append(spec.load())
+            except Exception as e:
+                warnings.warn(f"skipping channel plugin {spec.name!r}: {e}", RuntimeWarning)
+        _router = Router(entries)  # type: ignore[arg-type]
+    return _router
+
+
+def _as_channel(entry) -> Optional[Channel]:
+    return entry.load() if isinstance(entry, ChannelSpec) else entry
+
+
+def route(url: str) -> Optional[Channel]:
+    """Get the channel that handles *url* (WebChannel if no platform matches)."""
+    return _as_channel(_get_router().route(url))
+
+
+def route_many(urls: Iterable[str]) -> List[Optional[Channel]]:
+    """Route a batch of URLs; the result is aligned with *urls*."""
+    loaded: Dict[int, Optional[Channel]] = {}
+    out = []
+    for entry in _get_router().route_many(urls):
+        key = id(entry)
+        if key not in loaded:
+            loaded[key] = _as_channel(entry)
+        out.append(loaded[key])
+    return out
 
 
 __all__ = [
     "Channel",
+    "ChannelSpec",
     "ALL_CHANNELS",
-    "get_channel", "get_all_channels",
+    "BUILTIN_SPECS",
+    "ENTRY_POINT_GROUP",
+    "get_channel", "get_all_channels", "get_channel_specs",
+    "route", "route_many",
 ]
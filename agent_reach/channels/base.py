@@ -4,16 +4,22 @@ Channel base class — platform availability checking.
 
 Each channel represents a platform (YouTube, Twitter, GitHub, etc.)
 and provides:
-  - can_handle(url) → does this URL belong to this platform?
+  - can_handle(url) → does this URL belong to this platform? (from the
+    declared ``hosts`` / ``path_markers``; see router.py)
   - check(config) → is the upstream tool installed and configured?
 
+Channels also declare which inputs their check depends on (binaries,
+files, config keys, env vars) so doctor can cache results and re-probe
+only when one of those inputs changes.
+
 After installation, agents call upstream tools directly.
 """
 
-import shutil
-from abc import ABC, abstractmethod
+from abc import ABC
 from typing import List, Tuple
 
+from .router import host_matches, path_matches, split_url
+
 
 class Channel(ABC):
     """Base class for all channels."""
@@ -23,14 +29,31 @@ class Channel(ABC):
     backends: List[str] = []          # e.g. ["yt-dlp"] — what upstream tool is used
     tier: int = 0                     # 0=zero-config, 1=needs free key, 2=needs setup
 
-    @abstractmethod
+    # URLs this channel handles — indexed by the router
+    hosts: List[str] = []             # e.g. ["youtube.com", "youtu.be"] — subdomains included
+    path_markers: List[str] = []      # e.g. ["/feed"] — matched in the URL path, any host
+    catch_all: bool = False           # handles any URL nothing else claims
+
+    # Inputs check() depends on — a change invalidates the cached doctor result
+    probe_binaries: List[str] = []    # e.g. ["yt-dlp"] — looked up on PATH
+    probe_files: List[str] = []       # e.g. ["~/.config/rdt-cli/credential.json"]
+    config_keys: List[str] = []       # e.g. ["bilibili_proxy"]
+    env_vars: List[str] = []          # e.g. ["BILIBILI_PROXY"]
+
     def can_handle(self, url: str) -> bool:
         """Check if this channel can handle this URL."""
-        ...
+        if self.catch_all:
+            return True
+        host, path = split_url(url)
+        return host_matches(host, self.hosts) or path_matches(path, self.path_markers)
 
-    def check(self, config=None) -> Tuple[str, str]:
+    def check(self, config=None, probe=None) -> Tuple[str, str]:
         """
         Check if this channel's upstream tool is available.
         Returns (status, message) where status is 'ok'/'warn'/'off'/'error'.
+
+        *probe* is the ProbeContext shared by one doctor run; checks should
+        route PATH lookups and subprocess probes through it, and stop early
+        when ``probe.allows("config")`` / ``probe.allows("live")`` is False.
         """
         return "ok", f"{'、'.join(self.backends) if self.backends else '内置'}"
@@ -1,26 +1,29 @@
 # -*- coding: utf-8 -*-
 """Bilibili — video via yt-dlp, search/browse via bili-cli or API."""
 
-import json
 import os
-import shutil
-import subprocess
-import urllib.request
+
+from agent_reach.probe import ProbeContext
+from agent_reach.transport import build_opener
+
 from .base import Channel
+from .hosts import HOSTS
 
 _UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-_TIMEOUT = 10
 _SEARCH_API = "https://api.bilibili.com/x/web-interface/search/all/v2?keyword=test&page=1"
 
+_opener = build_opener()
+
 
-def _search_api_ok() -> bool:
+def _search_api_ok(probe=None) -> bool:
     """Return True if Bilibili search API responds with code 0."""
-    req = urllib.request.Request(_SEARCH_API, headers={"User-Agent": _UA})
+    probe = probe or ProbeContext()
+    result = probe.fetch(_SEARCH_API, headers={"User-Agent": _UA}, opener=_opener)
+    if not result.ok:
+        return False
     try:
-        with urllib.request.urlopen(req, timeout=_TIMEOUT) as resp:
-            data = json.loads(resp.read())
-            return data.get("code") == 0
-    except Exception:
+        return result.json().get("code") == 0
+    except (ValueError, AttributeError):
         return False
 
 
@@ -29,18 +32,18 @@ class BilibiliChannel(Channel):
     description = "B站视频、字幕和搜索"
     backends = ["yt-dlp", "bili-cli (可选)", "B站搜索 API"]
     tier = 1
+    hosts = HOSTS["bilibili"]
+    probe_binaries = ["yt-dlp", "bili"]
+    config_keys = ["bilibili_proxy"]
+    env_vars = ["BILIBILI_PROXY"]
 
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        d = urlparse(url).netloc.lower()
-        return "bilibili.com" in d or "b23.tv" in d
-
-    def check(self, config=None):
-        if not shutil.which("yt-dlp"):
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
+        if not probe.which("yt-dlp"):
             return "off", "yt-dlp 未安装。安装：pip install yt-dlp"
 
         proxy = (config.get("bilibili_proxy") if config else None) or os.environ.get("BILIBILI_PROXY")
-        has_bili_cli = bool(shutil.which("bili"))
+        has_bili_cli = bool(probe.which("bili"))
 
         parts = []
 
@@ -51,16 +54,22 @@ class BilibiliChannel(Channel):
             parts.append("视频读取：yt-dlp")
 
         # bili-cli 增强
+        api_ok = False
         if has_bili_cli:
             parts.append("搜索/热门/排行：bili-cli 可用")
+        elif not probe.allows("live"):
+            # Don't fail a shallow check on the network; search is optional
+            parts.append("搜索：B站 API（未检测连通性）")
+            parts.append("提示：安装 bili-cli 可解锁热门/排行/动态：pipx install bilibili-cli")
+            return "ok", "。".join(parts)
         else:
-            # 检测搜索 API 连通性
-            api_ok = _search_api_ok()
+            # 检测搜索 API 连通性（只请求一次，状态和提示共用结果）
+            api_ok = _search_api_ok(probe)
             if api_ok:
                 parts.append("搜索：B站 API 可用")
             else:
                 parts.append("搜索：B站 API 不可达")
             parts.append("提示：安装 bili-cli 可解锁热门/排行/动态：pipx install bilibili-cli")
 
-        status = "ok" if has_bili_cli or _search_api_ok() else "warn"
+        status = "ok" if has_bili_cli or api_ok else "warn"
         return status, "。".join(parts)
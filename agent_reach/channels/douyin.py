@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 """Douyin (抖音) — check if mcporter + douyin-mcp-server is available."""
 
-import shutil
-import subprocess
+from agent_reach.probe import ProbeContext
+from agent_reach.utils.mcporter import MCPORTER_CONFIG_FILES, has_server
+
 from .base import Channel
+from .hosts import HOSTS
 
 
 class DouyinChannel(Channel):
@@ -11,14 +13,13 @@ class DouyinChannel(Channel):
     description = "抖音短视频"
     backends = ["douyin-mcp-server"]
     tier = 2
+    hosts = HOSTS["douyin"]
+    probe_binaries = ["mcporter"]
+    probe_files = MCPORTER_CONFIG_FILES
 
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        d = urlparse(url).netloc.lower()
-        return "douyin.com" in d or "iesdouyin.com" in d
-
-    def check(self, config=None):
-        mcporter = shutil.which("mcporter")
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
+        mcporter = probe.which("mcporter")
         if not mcporter:
             return "off", (
                 "需要 mcporter + douyin-mcp-server。安装步骤：\n"
@@ -28,12 +29,10 @@ class DouyinChannel(Channel):
                 "  4. mcporter config add douyin http://localhost:18070/mcp\n"
                 "  详见 https://github.com/yzfly/douyin-mcp-server"
             )
+        if not probe.allows("config"):
+            return "ok", "mcporter 已安装（未检查抖音 MCP 配置）"
         try:
-            r = subprocess.run(
-                [mcporter, "config", "list"], capture_output=True,
-                encoding="utf-8", errors="replace", timeout=5
-            )
-            if "douyin" not in r.stdout:
+            if not has_server(probe, mcporter, "douyin"):
                 return "off", (
                     "mcporter 已装但抖音 MCP 未配置。运行：\n"
                     "  pip install douyin-mcp-server\n"
@@ -42,13 +41,12 @@ class DouyinChannel(Channel):
                 )
         except Exception:
             return "off", "mcporter 连接异常"
+        if not probe.allows("live"):
+            return "ok", "抖音 MCP 已配置（未检测服务是否在运行）"
         # Verify MCP connectivity by listing available tools instead of
         # calling with a hardcoded (invalid) share link that always fails.
         try:
-            r = subprocess.run(
-                [mcporter, "list", "douyin"],
-                capture_output=True, encoding="utf-8", errors="replace", timeout=15
-            )
+            r = probe.run([mcporter, "list", "douyin"], timeout=15)
             if r.returncode == 0 and r.stdout.strip():
                 return "ok", "完整可用（视频解析、下载链接获取）"
             return "warn", "MCP 已连接但工具列表为空，检查 douyin-mcp-server 服务是否在运行"
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 """Exa Search — check if mcporter + Exa MCP is available."""
 
-import shutil
-import subprocess
+from agent_reach.probe import ProbeContext
+from agent_reach.utils.mcporter import MCPORTER_CONFIG_FILES, has_server
+
 from .base import Channel
 
 
@@ -11,24 +12,23 @@ class ExaSearchChannel(Channel):
     description = "全网语义搜索"
     backends = ["Exa via mcporter"]
     tier = 0
+    # Search-only channel: declares no hosts, so can_handle() is always False
+    probe_binaries = ["mcporter"]
+    probe_files = MCPORTER_CONFIG_FILES
 
-    def can_handle(self, url: str) -> bool:
-        return False  # Search-only channel
-
-    def check(self, config=None):
-        mcporter = shutil.which("mcporter")
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
+        mcporter = probe.which("mcporter")
         if not mcporter:
             return "off", (
                 "需要 mcporter + Exa MCP。安装：\n"
                 "  npm install -g mcporter\n"
                 "  mcporter config add exa https://mcp.exa.ai/mcp"
             )
+        if not probe.allows("config"):
+            return "ok", "mcporter 已安装（未检查 Exa 配置）"
         try:
-            r = subprocess.run(
-                [mcporter, "config", "list"], capture_output=True,
-                encoding="utf-8", errors="replace", timeout=5
-            )
-            if "exa" in r.stdout.lower():
+            if has_server(probe, mcporter, "exa"):
                 return "ok", "全网语义搜索可用（免费，无需 API Key）"
             return "off", (
                 "mcporter 已装但 Exa 未配置。运行：\n"
@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
 """GitHub — check if gh CLI is available."""
 
-import shutil
-import subprocess
+import os
+
+from agent_reach.probe import ProbeContext
+
 from .base import Channel
+from .hosts import HOSTS
+
+
+_HOSTS_FILE = "~/.config/gh/hosts.yml"
+_UNAUTHENTICATED = "gh CLI 已安装但未认证。运行 gh auth login 可解锁完整功能"
 
 
 class GitHubChannel(Channel):
@@ -11,22 +18,28 @@ class GitHubChannel(Channel):
     description = "GitHub 仓库和代码"
     backends = ["gh CLI"]
     tier = 0
+    hosts = HOSTS["github"]
+    probe_binaries = ["gh"]
+    probe_files = [_HOSTS_FILE]
+    env_vars = ["GH_TOKEN", "GITHUB_TOKEN"]
 
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        return "github.com" in urlparse(url).netloc.lower()
-
-    def check(self, config=None):
-        gh = shutil.which("gh")
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
+        gh = probe.which("gh")
         if not gh:
             return "warn", "gh CLI 未安装。安装：https://cli.github.com"
+        if not probe.allows("config"):
+            return "ok", "gh CLI 已安装（未检查登录状态）"
+        if not probe.allows("live"):
+            # gh reads a token from the environment or from hosts.yml
+            has_token = any(os.environ.get(v) for v in self.env_vars)
+            if has_token or (probe.read_text(_HOSTS_FILE) or "").strip():
+                return "ok", "gh CLI 已安装，已找到登录凭据（未在线验证）"
+            return "warn", _UNAUTHENTICATED
         try:
-            r = subprocess.run(
-                [gh, "auth", "status"],
-                capture_output=True, encoding="utf-8", errors="replace", timeout=5
-            )
+            r = probe.run([gh, "auth", "status"], timeout=5)
             if r.returncode == 0:
                 return "ok", "完整可用（读取、搜索、Fork、Issue、PR 等）"
-            return "warn", "gh CLI 已安装但未认证。运行 gh auth login 可解锁完整功能"
+            return "warn", _UNAUTHENTICATED
         except Exception:
             return "warn", "gh CLI 状态检查失败，运行 gh auth status 查看详情"
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""URL patterns of the built-in channels.
+
+The lazy registry (ChannelSpec) routes URLs without importing any channel
+module, while each Channel class answers can_handle() itself. Both read
+their hosts and path markers from here, so the two cannot drift apart.
+"""
+
+from typing import Dict, List
+
+# Channel name -> hosts it serves (subdomains included; see router.py)
+HOSTS: Dict[str, List[str]] = {
+    "github": ["github.com"],
+    "twitter": ["x.com", "twitter.com"],
+    "youtube": ["youtube.com", "youtu.be"],
+    "reddit": ["reddit.com", "redd.it"],
+    "bilibili": ["bilibili.com", "b23.tv"],
+    "xiaohongshu": ["xiaohongshu.com", "xhslink.com"],
+    "douyin": ["douyin.com", "iesdouyin.com"],
+    "linkedin": ["linkedin.com"],
+    "wechat": ["weixin.qq.com"],
+    "weibo": ["weibo.com", "weibo.cn"],
+    "xiaoyuzhou": ["xiaoyuzhoufm.com"],
+    "v2ex": ["v2ex.com"],
+    "xueqiu": ["xueqiu.com"],
+}
+
+# Channel name -> URL path substrings it serves
+PATH_MARKERS: Dict[str, List[str]] = {
+    "rss": ["/feed", "/rss", ".xml", "atom"],
+}
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 """LinkedIn — check if linkedin-scraper-mcp is available."""
 
-import shutil
-import subprocess
+from agent_reach.probe import ProbeContext
+from agent_reach.utils.mcporter import MCPORTER_CONFIG_FILES, has_server
+
 from .base import Channel
+from .hosts import HOSTS
 
 
 class LinkedInChannel(Channel):
@@ -11,13 +13,13 @@ class LinkedInChannel(Channel):
     description = "LinkedIn 职业社交"
     backends = ["linkedin-scraper-mcp", "Jina Reader"]
     tier = 2
+    hosts = HOSTS["linkedin"]
+    probe_binaries = ["mcporter"]
+    probe_files = MCPORTER_CONFIG_FILES
 
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        return "linkedin.com" in urlparse(url).netloc.lower()
-
-    def check(self, config=None):
-        mcporter = shutil.which("mcporter")
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
+        mcporter = probe.which("mcporter")
         if not mcporter:
             return "off", (
                 "基本内容可通过 Jina Reader 读取。完整功能需要：\n"
@@ -25,12 +27,10 @@ class LinkedInChannel(Channel):
                 "  mcporter config add linkedin http://localhost:3000/mcp\n"
                 "  详见 https://github.com/stickerdaniel/linkedin-mcp-server"
             )
+        if not probe.allows("config"):
+            return "ok", "mcporter 已安装（未检查 LinkedIn MCP 配置）"
         try:
-            r = subprocess.run(
-                [mcporter, "config", "list"], capture_output=True,
-                encoding="utf-8", errors="replace", timeout=5
-            )
-            if "linkedin" in r.stdout.lower():
+            if has_server(probe, mcporter, "linkedin"):
                 return "ok", "完整可用（Profile、公司、职位搜索）"
         except Exception:
             pass
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""URL router — find the channel for a URL with one parse and a dict lookup.
+
+Channels declare the hosts they serve (``hosts = ["x.com", "twitter.com"]``).
+A host matches itself and its subdomains, so ``mobile.x.com`` routes to
+Twitter while ``notx.com`` does not. The index maps every declared host to
+its channel; a lookup walks the URL's host from the longest suffix to the
+shortest (``a.b.x.com`` → ``b.x.com`` → ``x.com`` → ``com``), so its cost
+depends on the number of labels, not the number of channels.
+
+Routing order:
+  1. host index (most specific declared host wins)
+  2. channels matching on the URL path (``path_markers``, e.g. RSS ``/feed``)
+  3. the catch-all channel (web)
+"""
+
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .base import Channel
+
+_SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+.\-]*://")
+
+
+def split_url(url: str) -> Tuple[str, str]:
+    """Return ``(host, path)``: host lower-cased without port/userinfo/trailing dot.
+
+    Scheme-less URLs (``x.com/user``) are parsed as if they had one. This is
+    a minimal urlsplit: only the authority and path are extracted.
+    """
+    scheme = _SCHEME.match(url)
+    if scheme is not None:
+        start = scheme.end()
+    elif url.startswith("//"):
+        start = 2
+    else:
+        start = 0
+    end = len(url)
+    for sep in "/?#":
+        i = url.find(sep, start, end)
+        if i >= 0:
+            end = i
+    path_end = len(url)
+    for sep in "?#":
+        i = url.find(sep, end, path_end)
+        if i >= 0:
+            path_end = i
+    host = url[start:end].rpartition("@")[2]
+    if host.startswith("["):  # IPv6 literal
+        host = host[1:host.find("]")]
+    else:
+        host = host.partition(":")[0]
+    return host.lower().rstrip("."), url[end:path_end]
+
+
+def host_matches(host: str, hosts: Iterable[str]) -> bool:
+    """True if *host* is one of *hosts* or a subdomain of one."""
+    return any(host == h or host.endswith("." + h) for h in hosts)
+
+
+def path_matches(path: str, markers: Iterable[str]) -> bool:
+    path = path.lower()
+    return any(m in path for m in markers)
+
+
+class Router:
+    """Host-suffix index over a fixed set of channels.
+
+    Entries only need ``hosts``, ``path_markers`` and ``catch_all``, so the
+    registry can index ChannelSpecs without importing the channels.
+    """
+
+    def __init__(self, channels: Sequence["Channel"]):
+        self._hosts: Dict[str, "Channel"] = {}
+        self._by_path: List["Channel"] = []
+        self._fallback: Optional["Channel"] = None
+        for ch in channels:
+            for host in ch.hosts:
+                # First registration wins, mirroring registry order
+                self._hosts.setdefault(host.lower().strip("."), ch)
+            if ch.path_markers:
+                self._by_path.append(ch)
+            if ch.catch_all and self._fallback is None:
+                self._fallback = ch
+
+    def lookup_host(self, host: str) -> Optional["Channel"]:
+        """Channel owning *host* or its closest declared parent domain."""
+        hosts = self._hosts
+        suffix = host
+        while True:
+            ch = hosts.get(suffix)
+            if ch is not None:
+                return ch
+            dot = suffix.find(".")
+            if dot < 0:
+                return None
+            suffix = suffix[dot + 1:]
+
+    def _route(self, host: str, path: str) -> Optional["Channel"]:
+        ch = self.lookup_host(host)
+        if ch is not None:
+            return ch
+        for ch in self._by_path:
+            if path_matches(path, ch.path_markers):
+                return ch
+        return self._fallback
+
+    def route(self, url: str) -> Optional["Channel"]:
+        """Return the channel for *url* (the catch-all channel if nothing else matches)."""
+        return self._route(*split_url(url))
+
+    def route_many(self, urls: Iterable[str]) -> List[Optional["Channel"]]:
+        """Route a batch of URLs; the result is aligned with *urls*.
+
+        Host lookups are memoized for the batch, since large URL lists tend
+        to repeat a handful of hosts.
+        """
+        by_host: Dict[str, Optional["Channel"]] = {}
+        out: List[Optional["Channel"]] = []
+        for url in urls:
+            host, path = split_url(url)
+            try:
+                ch = by_host[host]
+            except KeyError:
+                ch = by_host[host] = self.lookup_host(host)
+            out.append(ch if ch is not None else self._route(host, path))
+        return out
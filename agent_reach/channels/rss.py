@@ -2,6 +2,7 @@
 """RSS — check if feedparser is available."""
 
 from .base import Channel
+from .hosts import PATH_MARKERS
 
 
 class RSSChannel(Channel):
@@ -9,11 +10,9 @@ class RSSChannel(Channel):
     description = "RSS/Atom 订阅源"
     backends = ["feedparser"]
     tier = 0
+    path_markers = PATH_MARKERS["rss"]
 
-    def can_handle(self, url: str) -> bool:
-        return any(x in url.lower() for x in ["/feed", "/rss", ".xml", "atom"])
-
-    def check(self, config=None):
+    def check(self, config=None, probe=None):
         try:
             import feedparser
             return "ok", "可读取 RSS/Atom 源"
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 """Twitter/X — check if twitter-cli or bird CLI is available."""
 
-import shutil
-import subprocess
+import os
+
+from agent_reach.probe import ProbeContext
+
 from .base import Channel
+from .hosts import HOSTS
 
 
 class TwitterChannel(Channel):
@@ -11,21 +14,29 @@ class TwitterChannel(Channel):
     description = "Twitter/X 推文"
     backends = ["twitter-cli", "bird CLI (legacy)"]
     tier = 1
+    hosts = HOSTS["twitter"]
+    probe_binaries = ["twitter", "bird", "birdx"]
+    config_keys = ["twitter_auth_token", "twitter_ct0"]
+    env_vars = ["TWITTER_AUTH_TOKEN", "TWITTER_CT0", "AUTH_TOKEN", "CT0"]
 
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        d = urlparse(url).netloc.lower()
-        return "x.com" in d or "twitter.com" in d
-
-    def check(self, config=None):
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
         # Prefer twitter-cli, fallback to bird/birdx
-        twitter = shutil.which("twitter")
-        bird = shutil.which("bird") or shutil.which("birdx")
+        twitter = probe.which("twitter")
+        bird = probe.which("bird") or probe.which("birdx")
+
+        if (twitter or bird) and not probe.allows("config"):
+            tool = "twitter-cli" if twitter else "bird CLI"
+            return "ok", f"{tool} 已安装（未检查认证状态）"
 
         if twitter:
-            return self._check_twitter_cli(twitter)
+            if not probe.allows("live"):
+                return self._check_twitter_cookies(config)
+            return self._check_twitter_cli(twitter, probe)
         elif bird:
-            return self._check_bird(bird)
+            if not probe.allows("live"):
+                return self._check_bird_env()
+            return self._check_bird(bird, probe)
         else:
             return "warn", (
                 "Twitter CLI 未安装。安装方式：\n"
@@ -34,12 +45,26 @@ class TwitterChannel(Channel):
                 "  uv tool install twitter-cli"
             )
 
-    def _check_twitter_cli(self, binary: str):
+    def _check_twitter_cookies(self, config):
+        """Look for the cookies twitter-cli would use, without running it."""
+        configured = bool(config and config.get("twitter_auth_token") and config.get("twitter_ct0"))
+        if configured or (os.environ.get("TWITTER_AUTH_TOKEN") and os.environ.get("TWITTER_CT0")):
+            return "ok", "twitter-cli 已安装，已配置 Cookie（未在线验证）"
+        # twitter-cli can still pick up the browser's login session
+        return "ok", "twitter-cli 已安装，未配置 Cookie，将尝试读取浏览器登录态（未在线验证）"
+
+    def _check_bird_env(self):
+        if os.environ.get("AUTH_TOKEN") and os.environ.get("CT0"):
+            return "ok", "bird CLI 已安装，已设置认证环境变量（未在线验证）"
+        return "warn", (
+            "bird CLI 已安装但未配置认证。设置环境变量：\n"
+            "  export AUTH_TOKEN=\"xxx\"\n"
+            "  export CT0=\"yyy\""
+        )
+
+    def _check_twitter_cli(self, binary: str, probe: ProbeContext):
         try:
-            r = subprocess.run(
-                [binary, "status"], capture_output=True,
-                encoding="utf-8", errors="replace", timeout=10
-            )
+            r = probe.run([binary, "status"], timeout=10)
             output = (r.stdout or "") + (r.stderr or "")
             if r.returncode == 0 and "ok: true" in output:
                 return "ok", (
@@ -60,12 +85,9 @@ class TwitterChannel(Channel):
         except Exception:
             return "warn", "twitter-cli 已安装但连接失败"
 
-    def _check_bird(self, binary: str):
+    def _check_bird(self, binary: str, probe: ProbeContext):
         try:
-            r = subprocess.run(
-                [binary, "check"], capture_output=True,
-                encoding="utf-8", errors="replace", timeout=10
-            )
+            r = probe.run([binary, "check"], timeout=10)
             output = (r.stdout or "") + (r.stderr or "")
             if r.returncode == 0:
                 return "ok", "bird CLI 可用（读取、搜索推文，含长文/X Article）"
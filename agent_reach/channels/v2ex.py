@@ -1,20 +1,267 @@
 # -*- coding: utf-8 -*-
-"""V2EX — public API channel for topics, nodes, users, and replies."""
+"""V2EX — public API channel for topics, nodes, users, and replies.
+
+The public v1 API allows a limited number of calls per IP per hour and
+reports the quota in ``X-Rate-Limit-Limit`` / ``-Remaining`` / ``-Reset``
+headers. Each API's quota is tracked from those headers (RateLimit). When
+few calls remain before the reset, requests are spaced out. When none
+remain, a call waits for the reset if it is close, or fails with
+RateLimited.
+
+With a personal access token (config key ``v2ex_token`` or ``V2EX_TOKEN``,
+from https://www.v2ex.com/settings/tokens), topics and node listings go
+through the authenticated v2 API, which has its own and larger quota. Each
+call falls back to the other API when one is out of quota or the token is
+rejected. User profiles and hot topics only exist in v1.
+
+Responses are reused for a while per endpoint (CACHE_RULES, see
+api_cache.py); a cached response costs no quota.
+"""
 
 import json
+import threading
+import time
+import urllib.error
 import urllib.request
-from typing import Any
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from agent_reach.api_cache import CacheRule, for_rules
+from agent_reach.probe import ProbeContext
+from agent_reach.transport import build_opener
+
 from .base import Channel
+from .hosts import HOSTS
+
+if TYPE_CHECKING:
+    from agent_reach.v2ex_mirror import V2EXMirror
 
 _UA = "agent-reach/1.0"
 _TIMEOUT = 10
+# Smallest public endpoint — enough to tell whether the API is reachable
+_SITE_INFO_URL = "https://www.v2ex.com/api/site/info.json"
+_V1 = "https://www.v2ex.com/api"
+_V2 = "https://www.v2ex.com/api/v2"
+
+# The v1 replies endpoint returns this many replies per page
+REPLIES_PER_PAGE = 100
+# Reply pages requested at once when assembling a whole thread
+REPLY_PAGE_WORKERS = 4
+# ... and by the v2 API, which is read five pages per v1 page
+V2_REPLIES_PER_PAGE = 20
+# Requests in flight at once for get_topics — matches the transport's
+# idle connections per host, so a batch keeps reusing the same sockets
+TOPIC_WORKERS = 4
+
+# Longest a call waits for quota (pacing or the hourly reset) before failing
+MAX_RATE_WAIT = 30.0
+# With fewer calls left than this, spread them evenly until the reset,
+# but never more than MAX_PACE seconds apart
+PACE_BELOW = 10
+MAX_PACE = 5.0
+
+# Keep-alive connections to www.v2ex.com, shared with the other channels
+_opener = build_opener()
+
+# Seconds each endpoint's responses are reused (and then served stale while refreshed)
+CACHE_RULES = [
+    CacheRule(r"/api/topics/hot\.json", ttl=300, stale=600),
+    CacheRule(r"/api/members/show\.json", ttl=6 * 3600, stale=24 * 3600),
+    CacheRule(r"/api/topics/show\.json\?node_name=|/api/v2/nodes/[^/]+/topics", ttl=120, stale=300),
+    CacheRule(r"/api/replies/show\.json|/api/v2/topics/\d+/replies", ttl=120, stale=300),
+    CacheRule(r"/api/topics/show\.json\?id=|/api/v2/topics/\d+$", ttl=300, stale=600),
+]
+_cache = for_rules(CACHE_RULES, "v2ex")
+
+
+class RateLimited(urllib.error.URLError):
+    """An API's quota is used up and its reset is further away than the caller will wait."""
+
+    def __init__(self, api: str, retry_after: float):
+        super().__init__(f"V2EX {api} API 调用额度已用完，约 {max(1, int(retry_after))} 秒后恢复")
+        self.api = api
+        self.retry_after = retry_after
+
+
+class RateLimit:
+    """One API's hourly quota, as last reported by its X-Rate-Limit-* headers."""
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset: Optional[float] = None  # epoch seconds
+        self._next = 0.0  # earliest start of the next paced call
+        self._lock = threading.Lock()
+
+    def update(self, headers) -> None:
+        if headers is None:
+            return
+        try:
+            remaining = headers.get("X-Rate-Limit-Remaining")
+            reset = headers.get("X-Rate-Limit-Reset")
+            limit = headers.get("X-Rate-Limit-Limit")
+            with self._lock:
+                if remaining is not None:
+                    self.remaining = int(remaining)
+                if reset is not None:
+                    self.reset = float(reset)
+                if limit is not None:
+                    self.limit = int(limit)
+        except (TypeError, ValueError):
+            pass
+
+    def exhaust(self) -> None:
+        """Record a 429: nothing left until the reset (an hour if none was reported)."""
+        with self._lock:
+            self.remaining = 0
+            if self.reset is None or self.reset <= time.time():
+                self.reset = time.time() + 3600
+
+    def delay(self, now: Optional[float] = None) -> float:
+        """Seconds the next call should wait to stay inside the quota."""
+        now = time.time() if now is None else now
+        if self.remaining is None or self.reset is None or now >= self.reset:
+            return 0.0
+        if self.remaining <= 0:
+            return self.reset - now
+        if self.remaining < PACE_BELOW:
+            return max(0.0, self._next - now)
+        return 0.0
+
+    def acquire(self, api: str, max_wait: float) -> None:
+        """Wait for a call slot, or raise RateLimited if it is more than *max_wait* away."""
+        with self._lock:
+            now = time.time()
+            wait = self.delay(now)
+            if wait > max_wait:
+                raise RateLimited(api, wait)
+            if self.remaining is not None and self.reset is not None and now < self.reset:
+                # Out of quota, remaining stays 0 until a response reports the
+                # new window, so concurrent callers also wait for the reset
+                if self.remaining > 0:
+                    start = now + wait
+                    if self.remaining < PACE_BELOW:
+                        self._next = start + min((self.reset - start) / self.remaining, MAX_PACE)
+                    # Spend the call now; the response headers correct the count
+                    self.remaining -= 1
+        if wait > 0:
+            time.sleep(wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"limit": self.limit, "remaining": self.remaining, "reset": self.reset}
+
 
+# Quotas are per IP (v1) and per token (v2), so one tracker each per process
+_quotas: Dict[str, RateLimit] = {"v1": RateLimit(), "v2": RateLimit()}
 
-def _get_json(url: str) -> Any:
-    """Fetch *url* and return parsed JSON. Raises on HTTP/network errors."""
-    req = urllib.request.Request(url, headers={"User-Agent": _UA})
-    with urllib.request.urlopen(req, timeout=_TIMEOUT) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+
+def _get_json(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    api: str = "v1",
+    max_wait: float = MAX_RATE_WAIT,
+) -> Any:
+    """Fetch *url* and return parsed JSON, within *api*'s quota.
+
+    Served from the response cache when a CACHE_RULES entry allows it.
+    Raises RateLimited when the quota is out for longer than *max_wait*,
+    and on HTTP/network errors.
+    """
+    return _cache.get(url, lambda: _fetch_json(url, headers, api, max_wait))
+
+
+def _fetch_json(url: str, headers: Optional[Dict[str, str]], api: str, max_wait: float) -> Any:
+    quota = _quotas[api]
+    quota.acquire(api, max_wait)
+    req = urllib.request.Request(url, headers={"User-Agent": _UA, **(headers or {})})
+    try:
+        with _opener.open(req, timeout=_TIMEOUT) as resp:
+            quota.update(getattr(resp, "headers", None))
+            return json.loads(resp.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        quota.update(e.headers)
+        if e.code == 429 or (e.code == 403 and quota.remaining == 0):
+            quota.exhaust()
+            raise RateLimited(api, quota.delay()) from e
+        raise
+
+
+class TopicResult(NamedTuple):
+    """One topic of a get_topics batch; *position* is its index in the input."""
+
+    position: int
+    topic_id: int
+    topic: Optional[dict]
+    error: Optional[str]
+    elapsed_ms: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_default_mirrors: Dict[str, "V2EXMirror"] = {}
+_default_mirrors_lock = threading.Lock()
+
+
+def _default_mirror() -> Optional["V2EXMirror"]:
+    """The config directory's mirror if `agent-reach v2ex sync` has created it.
+
+    Opened once per process and shared (V2EXMirror is thread-safe). Never
+    creates the database; any failure means no mirror.
+    """
+    try:
+        from agent_reach.config import Config
+        from agent_reach.v2ex_mirror import DB_FILENAME, V2EXMirror
+
+        path = Config().config_dir / DB_FILENAME
+        if not path.is_file():
+            return None
+        with _default_mirrors_lock:
+            mirror = _default_mirrors.get(str(path))
+            if mirror is None:
+                mirror = _default_mirrors[str(path)] = V2EXMirror(path)
+            return mirror
+    except Exception:
+        return None
+
+
+def _v1_topic(item: dict, node_name: str = "") -> dict:
+    """Reshape a v2 API topic into the v1 layout the rest of the channel reads."""
+    node = item.get("node") or {}
+    return {
+        "id": item.get("id", 0),
+        "title": item.get("title", ""),
+        "url": item.get("url", ""),
+        "content": item.get("content", ""),
+        "replies": item.get("replies", 0),
+        "created": item.get("created", 0),
+        "last_modified": item.get("last_modified", 0),
+        "last_touched": item.get("last_touched", 0),
+        "node": {"name": node.get("name", node_name), "title": node.get("title", "")},
+        "member": {"username": (item.get("member") or {}).get("username", "")},
+    }
+
+
+def _reply(raw: dict, floor: int) -> dict:
+    return {
+        "floor": floor,
+        "author": (raw.get("member") or {}).get("username", ""),
+        "content": raw.get("content", ""),
+        "created": raw.get("created", 0),
+    }
 
 
 class V2EXChannel(Channel):
@@ -22,28 +269,143 @@ class V2EXChannel(Channel):
     description = "V2EX 节点、主题与回复"
     backends = ["V2EX API (public)"]
     tier = 0
+    hosts = HOSTS["v2ex"]
+    config_keys = ["v2ex_token"]
+    env_vars = ["V2EX_TOKEN"]
+
+    def __init__(self, mirror: Optional["V2EXMirror"] = None, token: Optional[str] = None):
+        # Synced nodes are answered from the local mirror while fresh
+        self._mirror = mirror
+        self._mirror_resolved = mirror is not None
+        self._token = token
+
+    @property
+    def mirror(self) -> Optional["V2EXMirror"]:
+        """The mirror given, else ~/.agent-reach/v2ex.db once `v2ex sync` has created it."""
+        if not self._mirror_resolved:
+            self._mirror = _default_mirror()
+            # Until a sync creates the database, look again on the next call
+            self._mirror_resolved = self._mirror is not None
+        return self._mirror
+
+    @property
+    def token(self) -> str:
+        """The v2 API access token, from the config or V2EX_TOKEN ("" if none)."""
+        if self._token is None:
+            try:
+                from agent_reach.config import Config
+
+                self._token = Config().get("v2ex_token") or ""
+            except Exception:
+                self._token = ""
+        return self._token
 
     # ------------------------------------------------------------------ #
-    # URL routing
+    # API selection
     # ------------------------------------------------------------------ #
 
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        d = urlparse(url).netloc.lower()
-        return "v2ex.com" in d
+    def _v2_get(self, path: str, max_wait: float = MAX_RATE_WAIT) -> Any:
+        """GET a v2 API path and unwrap its ``{"success", "result"}`` envelope."""
+        data = _get_json(
+            f"{_V2}{path}", headers={"Authorization": f"Bearer {self.token}"},
+            api="v2", max_wait=max_wait,
+        )
+        if isinstance(data, dict) and "success" in data:
+            if not data["success"]:
+                raise ValueError(f"V2EX v2 API 错误：{data.get('message', '未知错误')}")
+            return data.get("result")
+        return data
+
+    @staticmethod
+    def _fallback(attempts: List[Tuple[str, Callable[[float], Any]]]) -> Any:
+        """Run the first of *attempts* ``(api, call(max_wait))`` that has quota.
+
+        All but the last attempt fail fast instead of waiting for quota, so
+        an exhausted API hands over to the next one at once. A rejected
+        token (v2 401/403) also moves on. The last error is re-raised.
+        """
+        error: Optional[Exception] = None
+        for i, (api, call) in enumerate(attempts):
+            last = i == len(attempts) - 1
+            try:
+                return call(MAX_RATE_WAIT if last else 0.0)
+            except RateLimited as e:
+                error = e
+            except urllib.error.HTTPError as e:
+                if api != "v2" or e.code not in (401, 403):
+                    raise
+                error = e
+        assert error is not None
+        raise error
+
+    def _node_page(self, node_name: str, page: int = 1) -> list:
+        """One page of a node's topics as v1-shaped dicts, newest first."""
+        def v1(max_wait: float) -> list:
+            return _get_json(
+                f"{_V1}/topics/show.json?node_name={node_name}&page={page}", max_wait=max_wait,
+            ) or []
+
+        def v2(max_wait: float) -> list:
+            items = self._v2_get(f"/nodes/{node_name}/topics?p={page}", max_wait) or []
+            return [_v1_topic(item, node_name) for item in items]
+
+        return self._fallback([("v2", v2), ("v1", v1)] if self.token else [("v1", v1)])
+
+    def _topic(self, topic_id: int) -> dict:
+        """A topic as a v1-shaped dict ({} if it does not exist)."""
+        def v1(max_wait: float) -> dict:
+            data = _get_json(f"{_V1}/topics/show.json?id={topic_id}", max_wait=max_wait)
+            # API returns a list even for single-ID queries
+            if isinstance(data, list):
+                return data[0] if data else {}
+            return data or {}
+
+        def v2(max_wait: float) -> dict:
+            return _v1_topic(self._v2_get(f"/topics/{topic_id}", max_wait) or {})
+
+        return self._fallback([("v2", v2), ("v1", v1)] if self.token else [("v1", v1)])
+
+    def _reply_page(self, topic_id: int, page: int = 1) -> list:
+        """One v1-sized page (REPLIES_PER_PAGE) of a topic's raw replies.
+
+        The v1 endpoint serves it in one call; when v1 is out of quota the
+        same replies are read from the v2 API's smaller pages.
+        """
+        def v1(max_wait: float) -> list:
+            return _get_json(
+                f"{_V1}/replies/show.json?topic_id={topic_id}&page={page}", max_wait=max_wait,
+            ) or []
+
+        def v2(max_wait: float) -> list:
+            per_page = REPLIES_PER_PAGE // V2_REPLIES_PER_PAGE
+            replies: list = []
+            for sub in range((page - 1) * per_page + 1, page * per_page + 1):
+                items = self._v2_get(f"/topics/{topic_id}/replies?p={sub}", max_wait) or []
+                replies.extend(items)
+                if len(items) < V2_REPLIES_PER_PAGE:
+                    break
+            return replies
+
+        return self._fallback([("v1", v1), ("v2", v2)] if self.token else [("v1", v1)])
+
+    def rate_limits(self) -> Dict[str, dict]:
+        """Last known quota of each API: {"v1": {limit, remaining, reset}, "v2": ...}."""
+        return {api: quota.snapshot() for api, quota in _quotas.items()}
 
     # ------------------------------------------------------------------ #
     # Health check
     # ------------------------------------------------------------------ #
 
-    def check(self, config=None):
-        try:
-            _get_json(
-                "https://www.v2ex.com/api/topics/show.json?node_name=python&page=1"
-            )
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
+        if not probe.allows("live"):
+            return "ok", "公开 API（未检测连通性）"
+        result = probe.fetch(_SITE_INFO_URL, headers={"User-Agent": _UA}, opener=_opener)
+        if result.ok:
+            if self.token:
+                return "ok", "公开 API 可用，已配置 v2 token（额度用完时自动切换）"
             return "ok", "公开 API 可用（热门主题、节点浏览、主题详情、用户信息）"
-        except Exception as e:
-            return "warn", f"V2EX API 连接失败（可能需要代理）：{e}"
+        return "warn", f"V2EX API 连接失败（可能需要代理）：{result.error}"
 
     # ------------------------------------------------------------------ #
     # Data-fetching methods
@@ -84,11 +446,11 @@ class V2EXChannel(Channel):
         Returns a list of dicts with keys:
           title, url, replies, node_name, node_title, content
         """
-        url = (
-            f"https://www.v2ex.com/api/topics/show.json"
-            f"?node_name={node_name}&page=1"
-        )
-        data = _get_json(url)
+        if self.mirror is not None:
+            cached = self.mirror.node_topics(node_name, limit)
+            if cached is not None:
+                return cached
+        data = self._node_page(node_name, 1)
         results = []
         for item in data[:limit]:
             node = item.get("node") or {}
@@ -107,46 +469,130 @@ class V2EXChannel(Channel):
             )
         return results
 
-    def get_topic(self, topic_id: int) -> dict:
+    def get_topic(self, topic_id: int, all_replies: bool = False, max_pages: Optional[int] = None) -> dict:
         """获取单个帖子详情和回复列表。
 
         Args:
-            topic_id: 帖子 ID（从 URL https://www.v2ex.com/t/<id> 中获取）
+            topic_id:    帖子 ID（从 URL https://www.v2ex.com/t/<id> 中获取）
+            all_replies: 获取全部回复（默认只取第一页，即前 100 条）
+            max_pages:   all_replies 时最多获取的回复页数
 
         Returns a dict with keys:
           id, title, url, content, replies_count, node_name, node_title,
-          author, created, replies (list of dicts with: author, content, created)
+          author, created, replies (list of dicts with: floor, author, content, created)
+
+        With *all_replies*, the reply pages are fetched concurrently (see
+        iter_reply_pages) and merged in floor order. If a page fails, the
+        replies before it are returned.
         """
-        topic_data = _get_json(
-            f"https://www.v2ex.com/api/topics/show.json?id={topic_id}"
-        )
-        # API returns a list even for single-ID queries
-        if isinstance(topic_data, list):
-            topic = topic_data[0] if topic_data else {}
+        if self.mirror is not None:
+            cached = self.mirror.topic(topic_id, all_replies, max_pages)
+            if cached is not None:
+                return cached
+        topic = self._topic(topic_id)
+        if all_replies:
+            replies = self._all_replies(topic_id, topic, max_pages)
         else:
-            topic = topic_data
+            # Fetch replies (first page)
+            try:
+                replies_raw = self._reply_page(topic_id, 1)
+            except Exception:
+                replies_raw = []
+            replies = [_reply(r, floor) for floor, r in enumerate(replies_raw or [], 1)]
+        return self._topic_dict(topic_id, topic, replies)
 
-        node = topic.get("node") or {}
-        member = topic.get("member") or {}
+    def get_topics(
+        self,
+        topic_ids: Iterable[int],
+        workers: int = TOPIC_WORKERS,
+        all_replies: bool = False,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[TopicResult]:
+        """批量获取帖子详情，每个帖子获取完成即产出（顺序与输入不同）。
 
-        # Fetch replies (first page)
+        Each item is what get_topic() returns for that ID. Topic bodies and
+        first reply pages are requested independently, at most *workers* at
+        a time, over the shared keep-alive pool. Topics fresh in the mirror
+        are yielded first without a request. A topic that fails is yielded
+        with *error* set and never aborts the batch; as in get_topic, a
+        failed reply page leaves that topic's replies empty. With
+        *all_replies*, each topic's reply pages are read one after another
+        so the batch stays within *workers*.
+        """
+        topic_ids = list(topic_ids)
+        started: Dict[int, float] = {}
+
+        def timed(position: int, call: Callable, *args) -> Any:
+            started.setdefault(position, time.monotonic())
+            return call(*args)
+
+        def whole(topic_id: int) -> dict:
+            topic = self._topic(topic_id)
+            return self._topic_dict(topic_id, topic, self._all_replies(topic_id, topic, max_pages, workers=1))
+
+        def result(position: int, topic: Optional[dict] = None, error: Optional[str] = None) -> TopicResult:
+            elapsed = time.monotonic() - started.get(position, time.monotonic())
+            return TopicResult(position, topic_ids[position], topic, error, round(elapsed * 1000, 1))
+
+        todo = []
+        for position, topic_id in enumerate(topic_ids):
+            cached = self.mirror.topic(topic_id, all_replies, max_pages) if self.mirror is not None else None
+            if cached is not None:
+                yield result(position, cached)
+            else:
+                todo.append(position)
+
+        pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="v2ex-topics")
         try:
-            replies_raw = _get_json(
-                f"https://www.v2ex.com/api/replies/show.json"
-                f"?topic_id={topic_id}&page=1"
-            )
-        except Exception:
-            replies_raw = []
+            parts: Dict[Future, Tuple[int, str]] = {}
+            for position in todo:
+                topic_id = topic_ids[position]
+                if all_replies:
+                    parts[pool.submit(timed, position, whole, topic_id)] = (position, "whole")
+                else:
+                    parts[pool.submit(timed, position, self._topic, topic_id)] = (position, "topic")
+                    parts[pool.submit(timed, position, self._reply_page, topic_id, 1)] = (position, "replies")
 
-        replies = [
-            {
-                "author": (r.get("member") or {}).get("username", ""),
-                "content": r.get("content", ""),
-                "created": r.get("created", 0),
-            }
-            for r in (replies_raw or [])
-        ]
+            fetched: Dict[int, dict] = {}
+            for future in as_completed(parts):
+                position, part = parts[future]
+                got = fetched.setdefault(position, {})
+                if "error" in got:
+                    continue  # already reported
+                try:
+                    got[part] = future.result()
+                except Exception as e:
+                    if part != "replies":
+                        got["error"] = str(e) or type(e).__name__
+                        yield result(position, error=got["error"])
+                        continue
+                    got[part] = []
+                if part == "whole":
+                    yield result(position, got["whole"])
+                elif "topic" in got and "replies" in got:
+                    replies = [_reply(r, floor) for floor, r in enumerate(got["replies"] or [], 1)]
+                    yield result(position, self._topic_dict(topic_ids[position], got["topic"], replies))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
+    def _all_replies(
+        self, topic_id: int, topic: dict, max_pages: Optional[int], workers: int = REPLY_PAGE_WORKERS,
+    ) -> List[dict]:
+        """Every reply of *topic*, or those before the first page that failed."""
+        replies: List[dict] = []
+        try:
+            for page in self.iter_reply_pages(
+                topic_id, replies_count=topic.get("replies", 0), max_pages=max_pages, workers=workers,
+            ):
+                replies.extend(page)
+        except Exception:
+            pass
+        return replies
+
+    @staticmethod
+    def _topic_dict(topic_id: int, topic: dict, replies: List[dict]) -> dict:
+        node = topic.get("node") or {}
+        member = topic.get("member") or {}
         return {
             "id": topic.get("id", topic_id),
             "title": topic.get("title", ""),
@@ -160,6 +606,56 @@ class V2EXChannel(Channel):
             "replies": replies,
         }
 
+    def iter_reply_pages(
+        self,
+        topic_id: int,
+        replies_count: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        workers: int = REPLY_PAGE_WORKERS,
+        start_page: int = 1,
+    ) -> Iterator[List[dict]]:
+        """逐页产出帖子的回复（按楼层顺序），适合回复很多的热帖。
+
+        The page count comes from *replies_count* (looked up from the topic
+        when not given). Up to *workers* pages are requested ahead over the
+        shared keep-alive pool while earlier pages are consumed; stopping
+        the iteration early cancels the rest. A reply that shifts onto the
+        next page while the thread is being read is only yielded once.
+        *start_page* skips the pages before it (floors keep their numbers),
+        for callers that already have them. Errors propagate to the caller.
+        """
+        if replies_count is None:
+            replies_count = self._topic(topic_id).get("replies", 0)
+        pages = max(1, -(-(replies_count or 0) // REPLIES_PER_PAGE))
+        if max_pages is not None:
+            pages = max(1, min(pages, max_pages))
+
+        def fetch(page: int) -> list:
+            return self._reply_page(topic_id, page)
+
+        seen = set()
+        floor = (start_page - 1) * REPLIES_PER_PAGE
+        pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="v2ex-replies")
+        try:
+            futures: Dict[int, Future] = {}
+            ahead = start_page
+            for page in range(start_page, pages + 1):
+                while ahead <= pages and ahead < page + max(1, workers):
+                    futures[ahead] = pool.submit(fetch, ahead)
+                    ahead += 1
+                batch = []
+                for raw in futures.pop(page).result():
+                    reply_id = raw.get("id")
+                    if reply_id is not None:
+                        if reply_id in seen:
+                            continue
+                        seen.add(reply_id)
+                    floor += 1
+                    batch.append(_reply(raw, floor))
+                yield batch
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     def get_user(self, username: str) -> dict:
         """获取用户信息。
 
@@ -1,10 +1,208 @@
 # -*- coding: utf-8 -*-
 """Web — any URL via Jina Reader. Always available."""
 
+import codecs
+import io
+import time
+import urllib.error
 import urllib.request
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from email.message import Message
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from agent_reach.transport import HostLimiter, Limiter, build_opener
+
 from .base import Channel
+from .router import host_matches, split_url
+
+if TYPE_CHECKING:
+    from agent_reach.web_cache import WebCache
+
+_opener = build_opener()
 
 _UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+_JINA = "https://r.jina.ai/"
+_JINA_HOST = "r.jina.ai"
+_TIMEOUT = 30
+
+# read_many defaults: worker threads, concurrent requests per site, and
+# concurrent requests to Jina Reader itself (every page goes through it;
+# its keyless rate limit is low, cache hits don't count against it)
+BATCH_WORKERS = 8
+BATCH_PER_HOST = 2
+BATCH_JINA_CONCURRENCY = 4
+
+# Where read() gets the Markdown: "jina" (Jina Reader), "local" (fetch the
+# page directly and extract it here, see agent_reach.extract), "auto"
+# (local first, Jina when the page is thin or the fetch fails) or "race"
+# (both at once, first usable result wins)
+BACKENDS = ("jina", "local", "auto", "race")
+# Direct fetches: deadline in auto mode, and the largest page parsed
+LOCAL_TIMEOUT = 10
+LOCAL_MAX_BYTES = 5 * 1024 * 1024
+# Hosts whose pages came out thin locally (client-side rendered); auto mode
+# goes straight to Jina for them for the rest of the process
+_thin_hosts: Set[str] = set()
+
+# read_stream pulls the body in chunks of this many bytes
+STREAM_CHUNK = 64 * 1024
+# Appended when read_stream stops at max_bytes / max_chars
+TRUNCATION_MARKER = "\n\n[…内容过长，已截断]\n"
+
+
+class ReaderOptions(NamedTuple):
+    """Jina Reader request options — select and trim the page server-side.
+
+    ``None`` leaves a setting to Jina's default (or to the site profile, see
+    options_for). Every set option changes the page, so it is part of the
+    cache key.
+    """
+
+    target_selector: Optional[str] = None  # CSS selector(s) of the content to keep
+    remove_selector: Optional[str] = None  # CSS selector(s) to drop first (nav, footer…)
+    wait_for_selector: Optional[str] = None  # wait until this appears (JS-rendered pages)
+    return_format: Optional[str] = None  # "markdown", "text" or "html"
+    images: Optional[bool] = None  # False strips images
+    links: Optional[bool] = None  # False keeps link text, drops the URLs
+
+    def merged(self, override: Optional["ReaderOptions"]) -> "ReaderOptions":
+        """These options with every field *override* sets taken from it."""
+        if override is None:
+            return self
+        return self._replace(**{k: v for k, v in override._asdict().items() if v is not None})
+
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.target_selector:
+            headers["X-Target-Selector"] = self.target_selector
+        if self.remove_selector:
+            headers["X-Remove-Selector"] = self.remove_selector
+        if self.wait_for_selector:
+            headers["X-Wait-For-Selector"] = self.wait_for_selector
+        if self.return_format:
+            headers["X-Return-Format"] = self.return_format
+        if self.images is False:
+            headers["X-Retain-Images"] = "none"
+        if self.links is False:
+            headers["X-Md-Link-Style"] = "discarded"
+        return headers
+
+    def cache_options(self) -> dict:
+        """The options recorded in the cache key (unchanged for the defaults)."""
+        options: dict = {"accept": "text/plain"}
+        options.update({k: v for k, v in self._asdict().items() if v is not None})
+        return options
+
+
+# Per-site defaults, matched like channel hosts (a host and its subdomains).
+# Documentation sites repeat their navigation on every page; dropping it
+# server-side saves bytes and output tokens.
+_DOCS_CHROME = "nav, header, footer, aside, .sidebar, .toc, .breadcrumbs"
+SITE_PROFILES: Dict[str, ReaderOptions] = {
+    "docs.python.org": ReaderOptions(target_selector="div.body", images=False),
+    "readthedocs.io": ReaderOptions(remove_selector=_DOCS_CHROME, images=False),
+    "developer.mozilla.org": ReaderOptions(target_selector="main article", images=False),
+    "docs.github.com": ReaderOptions(remove_selector=_DOCS_CHROME, images=False),
+    "learn.microsoft.com": ReaderOptions(target_selector="main", images=False),
+}
+
+
+def options_for(url: str, options: Optional[ReaderOptions] = None, profile: bool = True) -> ReaderOptions:
+    """Reader options for *url*: its site profile (if any) overridden by *options*."""
+    base = ReaderOptions()
+    if profile:
+        host = split_url(url)[0]
+        for site, site_options in SITE_PROFILES.items():
+            if host_matches(host, (site,)):
+                base = site_options
+                break
+    return base.merged(options)
+
+
+class Page(NamedTuple):
+    """A page read by read_page(), and which backend produced it ("jina" or "local")."""
+
+    text: str
+    backend: str
+
+
+class ReadResult(NamedTuple):
+    """One page of a read_many batch; *position* is its index in the input."""
+
+    position: int
+    url: str
+    text: Optional[str]
+    error: Optional[str]
+    elapsed_ms: float
+    backend: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _decode_capped(
+    read: Callable[[int], bytes],
+    max_bytes: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> Iterator[str]:
+    """Decode a UTF-8 body chunk by chunk, stopping at either cap.
+
+    *read(n)* returns up to n bytes, b"" at the end. At most one chunk is
+    held at a time. When a cap cuts the body short, a character split by
+    the cut is dropped and TRUNCATION_MARKER is yielded last.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    n_bytes = n_chars = 0
+    while True:
+        size = STREAM_CHUNK
+        if max_bytes is not None:
+            # One byte past the cap tells "exactly max_bytes" from "more"
+            size = min(size, max_bytes - n_bytes + 1)
+        chunk = read(size)
+        if not chunk:
+            decoder.decode(b"", final=True)  # raises on a truncated final character
+            return
+        truncated = False
+        if max_bytes is not None and n_bytes + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - n_bytes]
+            truncated = True
+        n_bytes += len(chunk)
+        text = decoder.decode(chunk)
+        if max_chars is not None and n_chars + len(text) > max_chars:
+            text = text[:max_chars - n_chars]
+            truncated = True
+        n_chars += len(text)
+        if text:
+            yield text
+        if truncated:
+            yield TRUNCATION_MARKER
+            return
+
+
+class _ClockedLimiter:
+    """A Limiter view that calls *on_start* once the slots are held."""
+
+    def __init__(self, limiter: Limiter, on_start: Callable[[], object]):
+        self._limiter = limiter
+        self._on_start = on_start
+
+    @contextmanager
+    def hold(self, *hosts: str) -> Iterator[None]:
+        with self._limiter.hold(*hosts):
+            self._on_start()
+            yield
 
 
 class WebChannel(Channel):
@@ -12,21 +210,305 @@ class WebChannel(Channel):
     description = "任意网页"
     backends = ["Jina Reader"]
     tier = 0
+    catch_all = True  # Fallback — handles any URL
 
-    def can_handle(self, url: str) -> bool:
-        return True  # Fallback — handles any URL
-
-    def check(self, config=None):
+    def check(self, config=None, probe=None):
         return "ok", "通过 Jina Reader 读取任意网页（curl https://r.jina.ai/URL）"
 
-    def read(self, url: str) -> str:
-        """通过 Jina Reader 读取网页，返回 Markdown 全文。"""
+    def _request(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        options: Optional[ReaderOptions] = None,
+    ) -> urllib.request.Request:
+        return urllib.request.Request(
+            _JINA + url,
+            headers={
+                "User-Agent": _UA,
+                "Accept": "text/plain",
+                **(options.headers() if options else {}),
+                **(headers or {}),
+            },
+        )
+
+    def _fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = _TIMEOUT,
+        limiter: Optional[Limiter] = None,
+        options: Optional[ReaderOptions] = None,
+    ) -> Tuple[str, Message]:
+        """GET *url* through Jina Reader; return the Markdown and response headers."""
+        if limiter is not None:
+            with limiter.hold(_JINA_HOST, split_url(url)[0]):
+                return self._fetch(url, headers, timeout, options=options)
+        with _opener.open(self._request(url, headers, options), timeout=timeout) as resp:
+            return resp.read().decode("utf-8"), resp.headers
+
+    def _fetch_local(
+        self,
+        url: str,
+        timeout: float = _TIMEOUT,
+        limiter: Optional[Limiter] = None,
+    ) -> Tuple[Page, Message]:
+        """GET *url* directly and extract its main content as Markdown.
+
+        Raises ValueError when the response isn't HTML, is too large, or
+        holds too little text to trust (see Extracted.ok).
+        """
+        host = split_url(url)[0]
+        if limiter is not None:
+            with limiter.hold(host):
+                return self._fetch_local(url, timeout)
+
+        from agent_reach.extract import extract
+
+        req = urllib.request.Request(url, headers={
+            "User-Agent": _UA,
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+        })
+        with _opener.open(req, timeout=timeout) as resp:
+            content_type = resp.headers.get("Content-Type") or ""
+            if "html" not in content_type.lower():
+                raise ValueError(f"不是 HTML 页面（{content_type or '未知类型'}）")
+            raw = resp.read(LOCAL_MAX_BYTES + 1)
+            headers = resp.headers
+        if len(raw) > LOCAL_MAX_BYTES:
+            raise ValueError(f"页面超过 {LOCAL_MAX_BYTES // (1024 * 1024)} MB，未本地提取")
+        charset = "utf-8"
+        for param in content_type.split(";")[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "charset" and value.strip():
+                charset = value.strip().strip('"')
+        try:
+            html = raw.decode(charset, errors="replace")
+        except LookupError:
+            html = raw.decode("utf-8", errors="replace")
+        try:
+            result = extract(html, url)
+        except RecursionError:
+            # Rendering is recursive; thousands of unclosed tags overflow it
+            _thin_hosts.add(host)
+            raise ValueError("页面嵌套过深，未本地提取")
+        if not result.ok:
+            _thin_hosts.add(host)
+            raise ValueError(f"本地提取内容不足（{result.content_chars} 字符）")
+        return Page(result.markdown, "local"), headers
+
+    def _fetch_page(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        timeout: float,
+        limiter: Optional[Limiter],
+        reader: ReaderOptions,
+        backend: str,
+    ) -> Tuple[Page, Message]:
+        if backend == "jina":
+            text, response_headers = self._fetch(url, headers, timeout, limiter, reader)
+            return Page(text, "jina"), response_headers
+        if backend == "local":
+            return self._fetch_local(url, timeout, limiter)
+        if backend == "auto":
+            if split_url(url)[0] not in _thin_hosts:
+                try:
+                    return self._fetch_local(url, min(timeout, LOCAL_TIMEOUT), limiter)
+                except (OSError, ValueError):
+                    pass
+            return self._fetch_page(url, headers, timeout, limiter, reader, "jina")
+        if backend == "race":
+            pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="web-race")
+            futures = {
+                pool.submit(self._fetch_local, url, timeout, limiter): "local",
+                pool.submit(self._fetch_page, url, headers, timeout, limiter, reader, "jina"): "jina",
+            }
+            errors: Dict[str, BaseException] = {}
+            try:
+                for future in as_completed(futures):
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        errors[futures[future]] = e
+                raise errors["jina"]
+            finally:
+                # The loser finishes in the background and returns its connection
+                pool.shutdown(wait=False, cancel_futures=True)
+        raise ValueError(f"未知的读取后端：{backend}（可选 {', '.join(BACKENDS)}）")
+
+    def read(
+        self,
+        url: str,
+        cache: Optional["WebCache"] = None,
+        timeout: float = _TIMEOUT,
+        limiter: Optional[Limiter] = None,
+        options: Optional[ReaderOptions] = None,
+        profile: bool = True,
+        backend: str = "jina",
+    ) -> str:
+        """通过 Jina Reader（或本地提取）读取网页，返回 Markdown 全文。
+
+        See read_page(), which also reports the backend used.
+        """
+        return self.read_page(url, cache, timeout, limiter, options, profile, backend).text
+
+    def read_page(
+        self,
+        url: str,
+        cache: Optional["WebCache"] = None,
+        timeout: float = _TIMEOUT,
+        limiter: Optional[Limiter] = None,
+        options: Optional[ReaderOptions] = None,
+        profile: bool = True,
+        backend: str = "jina",
+    ) -> Page:
+        """Read *url* as Markdown with the given *backend* (see BACKENDS).
+
+        *options* select and trim the page server-side, on top of the site
+        profile unless *profile* is False; they only apply to Jina Reader,
+        so explicit options make "auto" and "race" use Jina alone. With a
+        *cache*, a fresh copy is returned without a request; a stale Jina
+        page is revalidated with If-None-Match / If-Modified-Since. *limiter*
+        caps concurrent requests (see read_many).
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"未知的读取后端：{backend}（可选 {', '.join(BACKENDS)}）")
         if not url.startswith(("http://", "https://")):
             url = "https://" + url
-        jina_url = f"https://r.jina.ai/{url}"
-        req = urllib.request.Request(
-            jina_url,
-            headers={"User-Agent": _UA, "Accept": "text/plain"},
+        if backend in ("auto", "race") and options is not None and options != ReaderOptions():
+            backend = "jina"
+        reader = options_for(url, options, profile)
+        if cache is None:
+            return self._fetch_page(url, None, timeout, limiter, reader, backend)[0]
+
+        from agent_reach.web_cache import cache_key
+
+        cache_options = reader.cache_options()
+        if backend != "jina":
+            cache_options["backend"] = backend
+        canonical = cache.canonical(url)
+        key = cache_key(canonical, cache_options)
+        entry = cache.get(key)
+        if entry is not None and cache.is_fresh(entry):
+            cache.count("hits")
+            return Page(entry["text"], entry.get("backend") or "jina")
+        conditional = cache.conditional_headers(entry) if entry and backend == "jina" else None
+        try:
+            page, headers = self._fetch_page(url, conditional, timeout, limiter, reader, backend)
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and entry is not None:
+                cache.revalidated(key)
+                return Page(entry["text"], "jina")
+            raise
+        cache.count("misses")
+        jina = page.backend == "jina"
+        cache.put(
+            key, canonical, page.text,
+            etag=headers.get("ETag") if jina else None,
+            last_modified=headers.get("Last-Modified") if jina else None,
+            options=cache_options,
+            backend=page.backend,
         )
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            return resp.read().decode("utf-8")
+        return page
+
+    def read_stream(
+        self,
+        url: str,
+        max_bytes: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        cache: Optional["WebCache"] = None,
+        timeout: float = _TIMEOUT,
+        options: Optional[ReaderOptions] = None,
+        profile: bool = True,
+    ) -> Iterator[str]:
+        """Yield the page's Markdown in decoded chunks as it arrives.
+
+        Stops after *max_bytes* of body or *max_chars* of text, ending with
+        TRUNCATION_MARKER and closing the connection. The page is never held
+        in memory as a whole, so a fresh *cache* entry is served but a
+        streamed page is not stored. *options* / *profile* as for read().
+        """
+        if not url.startswith(("http://", "https://")):
+            url = "https://" + url
+        reader = options_for(url, options, profile)
+        if cache is not None:
+            from agent_reach.web_cache import cache_key
+
+            entry = cache.get(cache_key(cache.canonical(url), reader.cache_options()))
+            if entry is not None and cache.is_fresh(entry):
+                cache.count("hits")
+                yield from _decode_capped(io.BytesIO(entry["text"].encode("utf-8")).read, max_bytes, max_chars)
+                return
+            cache.count("misses")
+        with _opener.open(self._request(url, options=reader), timeout=timeout) as resp:
+            yield from _decode_capped(resp.read, max_bytes, max_chars)
+
+    def read_many(
+        self,
+        urls: Iterable[str],
+        cache: Optional["WebCache"] = None,
+        workers: int = BATCH_WORKERS,
+        per_host: int = BATCH_PER_HOST,
+        timeout: float = _TIMEOUT,
+        options: Optional[ReaderOptions] = None,
+        profile: bool = True,
+        backend: str = "jina",
+    ) -> Iterator[ReadResult]:
+        """Read a batch of pages concurrently, yielding each as it completes.
+
+        At most *workers* pages are read at once, *per_host* of them from
+        the same site and BATCH_JINA_CONCURRENCY through Jina Reader. Each
+        page gets *timeout* seconds from the moment its fetch starts; a page
+        still running after that is yielded as an error and left to finish
+        in the background. Failures are reported per page and never abort
+        the batch. *options* apply to every page, over each page's own site
+        profile unless *profile* is False; *backend* as for read_page().
+        """
+        urls = list(urls)
+        limiter = HostLimiter(per_host, {_JINA_HOST: BATCH_JINA_CONCURRENCY})
+        begun: Dict[int, float] = {}
+        # When each page's request got its slots — deadlines run from here,
+        # so time spent queued behind the per-host caps doesn't count
+        started: Dict[int, float] = {}
+
+        def read_one(position: int, url: str) -> Page:
+            begun[position] = time.monotonic()
+            clocked = _ClockedLimiter(limiter, lambda: started.setdefault(position, time.monotonic()))
+            return self.read_page(
+                url, cache=cache, timeout=timeout, limiter=clocked, options=options,
+                profile=profile, backend=backend,
+            )
+
+        def result(position: int, page: Optional[Page] = None, error=None) -> ReadResult:
+            elapsed = time.monotonic() - begun.get(position, time.monotonic())
+            return ReadResult(
+                position, urls[position], page.text if page else None, error,
+                round(elapsed * 1000, 1), page.backend if page else None,
+            )
+
+        pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="web-read")
+        try:
+            by_future: Dict[Future, int] = {
+                pool.submit(read_one, i, url): i for i, url in enumerate(urls)
+            }
+            pending = set(by_future)
+            while pending:
+                running = [started[i] for f, i in by_future.items() if f in pending and i in started]
+                wait_for = max(0.0, min(running) + timeout - time.monotonic()) if running else timeout
+                done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position = by_future[future]
+                    try:
+                        yield result(position, page=future.result())
+                    except Exception as e:
+                        yield result(position, error=str(e) or type(e).__name__)
+                now = time.monotonic()
+                for future in list(pending):
+                    position = by_future[future]
+                    if position in started and now - started[position] >= timeout:
+                        pending.discard(future)
+                        future.cancel()
+                        yield result(position, error=f"读取超时（超过 {timeout:g} 秒）")
+        finally:
+            # Don't wait for abandoned reads; their socket timeouts end them
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -5,21 +5,22 @@ Read:   Exa crawling (primary) / Camoufox stealth browser (optional)
 Search: Exa web_search with includeDomains mp.weixin.qq.com
 """
 
-import shutil
-import subprocess
+from agent_reach.probe import ProbeContext
+from agent_reach.utils.mcporter import MCPORTER_CONFIG_FILES, has_server
+
 from .base import Channel
+from .hosts import HOSTS
 
 
-def _exa_available() -> bool:
-    mcporter = shutil.which("mcporter")
+def _exa_available(probe=None) -> bool:
+    probe = probe or ProbeContext()
+    mcporter = probe.which("mcporter")
     if not mcporter:
         return False
+    if not probe.allows("config"):
+        return True  # mcporter present; its Exa config is not checked at this depth
     try:
-        r = subprocess.run(
-            [mcporter, "config", "list"],
-            capture_output=True, encoding="utf-8", errors="replace", timeout=5,
-        )
-        return "exa" in r.stdout.lower()
+        return has_server(probe, mcporter, "exa")
     except Exception:
         return False
 
@@ -29,14 +30,12 @@ class WeChatChannel(Channel):
     description = "微信公众号文章"
     backends = ["Exa via mcporter (搜索+阅读)", "Camoufox (可选阅读)"]
     tier = 0
+    hosts = HOSTS["wechat"]
+    probe_binaries = ["mcporter"]
+    probe_files = MCPORTER_CONFIG_FILES
 
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        d = urlparse(url).netloc.lower()
-        return "mp.weixin.qq.com" in d or "weixin.qq.com" in d
-
-    def check(self, config=None):
-        has_exa = _exa_available()
+    def check(self, config=None, probe=None):
+        has_exa = _exa_available(probe)
         has_camoufox = False
         try:
             import camoufox  # noqa: F401
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 """Weibo (微博) — check if mcporter + mcp-server-weibo is available."""
 
-import shutil
-import subprocess
+from agent_reach.probe import ProbeContext
+from agent_reach.utils.mcporter import MCPORTER_CONFIG_FILES, has_server
+
 from .base import Channel
+from .hosts import HOSTS
 
 
 class WeiboChannel(Channel):
@@ -11,14 +13,13 @@ class WeiboChannel(Channel):
     description = "微博动态与热搜"
     backends = ["mcp-server-weibo"]
     tier = 1
+    hosts = HOSTS["weibo"]
+    probe_binaries = ["mcporter"]
+    probe_files = MCPORTER_CONFIG_FILES
 
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        d = urlparse(url).netloc.lower()
-        return "weibo.com" in d or "weibo.cn" in d
-
-    def check(self, config=None):
-        mcporter = shutil.which("mcporter")
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
+        mcporter = probe.which("mcporter")
         if not mcporter:
             return "off", (
                 "需要 mcporter + mcp-server-weibo。安装步骤：\n"
@@ -27,12 +28,10 @@ class WeiboChannel(Channel):
                 "  3. mcporter config add weibo --command 'mcp-server-weibo'\n"
                 "  详见 https://github.com/Panniantong/mcp-server-weibo"
             )
+        if not probe.allows("config"):
+            return "ok", "mcporter 已安装（未检查微博 MCP 配置）"
         try:
-            r = subprocess.run(
-                [mcporter, "config", "list"], capture_output=True,
-                encoding="utf-8", errors="replace", timeout=5
-            )
-            if "weibo" not in r.stdout:
+            if not has_server(probe, mcporter, "weibo"):
                 return "off", (
                     "mcporter 已装但微博 MCP 未配置。运行：\n"
                     "  pip install git+https://github.com/Panniantong/mcp-server-weibo.git\n"
@@ -40,11 +39,10 @@ class WeiboChannel(Channel):
                 )
         except Exception:
             return "off", "mcporter 连接异常"
+        if not probe.allows("live"):
+            return "ok", "微博 MCP 已配置（未检测工具是否可加载）"
         try:
-            r = subprocess.run(
-                [mcporter, "list", "weibo"], capture_output=True,
-                encoding="utf-8", errors="replace", timeout=15
-            )
+            r = probe.run([mcporter, "list", "weibo"], timeout=15)
             if r.returncode == 0 and "search_users" in r.stdout:
                 return "ok", "完整可用（热搜、搜索、用户动态、评论）"
             return "warn", "MCP 已配置但工具加载失败，检查 mcp-server-weibo 版本"
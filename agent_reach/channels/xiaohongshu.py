@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 """XiaoHongShu — check if xhs-cli (xiaohongshu-cli) is available."""
 
-import shutil
-import subprocess
+from agent_reach.probe import ProbeContext
+
 from .base import Channel
+from .hosts import HOSTS
 
 
 def format_xhs_result(data):
@@ -120,14 +121,12 @@ class XiaoHongShuChannel(Channel):
     description = "小红书笔记"
     backends = ["xhs-cli (xiaohongshu-cli)"]
     tier = 1
+    hosts = HOSTS["xiaohongshu"]
+    probe_binaries = ["xhs"]
 
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        d = urlparse(url).netloc.lower()
-        return "xiaohongshu.com" in d or "xhslink.com" in d
-
-    def check(self, config=None):
-        xhs = shutil.which("xhs")
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
+        xhs = probe.which("xhs")
         if not xhs:
             return "off", (
                 "需要安装 xhs-cli：\n"
@@ -136,12 +135,12 @@ class XiaoHongShuChannel(Channel):
                 "  uv tool install xiaohongshu-cli\n"
                 "安装后运行 `xhs login` 登录"
             )
+        if not probe.allows("live"):
+            # xhs-cli keeps its session to itself; only `xhs status` can tell
+            return "ok", "xhs-cli 已安装（未检查登录状态）"
 
         try:
-            r = subprocess.run(
-                [xhs, "status"], capture_output=True,
-                encoding="utf-8", errors="replace", timeout=10,
-            )
+            r = probe.run([xhs, "status"], timeout=10)
             output = (r.stdout or "") + (r.stderr or "")
             if r.returncode == 0 and "ok: true" in output:
                 return "ok", (
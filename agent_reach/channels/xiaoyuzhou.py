@@ -2,9 +2,12 @@
 """Xiaoyuzhou Podcast (小宇宙播客) — transcribe podcasts via Groq Whisper API."""
 
 import os
-import shutil
+
 from agent_reach.config import Config
+from agent_reach.probe import ProbeContext
+
 from .base import Channel
+from .hosts import HOSTS
 
 
 class XiaoyuzhouChannel(Channel):
@@ -12,15 +15,16 @@ class XiaoyuzhouChannel(Channel):
     description = "小宇宙播客转文字"
     backends = ["groq-whisper", "ffmpeg"]
     tier = 1
-
-    def can_handle(self, url: str) -> bool:
-        from urllib.parse import urlparse
-        d = urlparse(url).netloc.lower()
-        return "xiaoyuzhoufm.com" in d
-
-    def check(self, config=None):
+    hosts = HOSTS["xiaoyuzhou"]
+    probe_binaries = ["ffmpeg"]
+    probe_files = ["~/.agent-reach/tools/xiaoyuzhou/transcribe.sh"]
+    config_keys = ["groq_api_key"]
+    env_vars = ["GROQ_API_KEY"]
+
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
         # Check ffmpeg
-        if not shutil.which("ffmpeg"):
+        if not probe.which("ffmpeg"):
             return "off", (
                 "需要 ffmpeg（音频转码和切片）。安装：\n"
                 "  Ubuntu/Debian: apt install -y ffmpeg\n"
@@ -36,6 +40,9 @@ class XiaoyuzhouChannel(Channel):
                 "  或手动复制 transcribe.sh 到 ~/.agent-reach/tools/xiaoyuzhou/"
             )
 
+        if not probe.allows("config"):
+            return "ok", "ffmpeg 和转录脚本已就绪（未检查 Groq API Key）"
+
         # Check GROQ_API_KEY — prefer env var, fall back to Agent Reach config
         has_key = bool(os.environ.get("GROQ_API_KEY"))
         if not has_key:
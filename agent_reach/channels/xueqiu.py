@@ -1,14 +1,24 @@
 # -*- coding: utf-8 -*-
-"""Xueqiu (雪球) — stock quotes, search, trending posts & hot stocks."""
+"""Xueqiu (雪球) — stock quotes, search, trending posts & hot stocks.
+
+Responses are reused for a while per endpoint (CACHE_RULES, see
+api_cache.py): quotes for seconds, lists for minutes.
+"""
 
 import http.cookiejar
+import importlib.util
 import json
 import re
 import urllib.parse
 import urllib.request
 from typing import Any
 
+from agent_reach.api_cache import CacheRule, for_rules
+from agent_reach.probe import ProbeContext
+from agent_reach.transport import build_opener
+
 from .base import Channel
+from .hosts import HOSTS
 
 _UA = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -18,15 +28,27 @@ _UA = (
 _REFERER = "https://xueqiu.com/"
 _TIMEOUT = 10
 _XUEQIU_HOME = "https://xueqiu.com"
+# Single-symbol quote — the cheapest call that proves the cookies work
+_QUOTE_PROBE_URL = "https://stock.xueqiu.com/v5/stock/batch/quote.json?symbol=SH000001"
 
 # --------------- cookie-aware HTTP helpers --------------- #
 
 _cookie_jar = http.cookiejar.CookieJar()
-_opener = urllib.request.build_opener(
+# Cookie-aware, over the shared keep-alive pool
+_opener = build_opener(
     urllib.request.HTTPCookieProcessor(_cookie_jar),
 )
 _cookies_initialized = False
 
+# Seconds each endpoint's responses are reused (and then served stale while refreshed)
+CACHE_RULES = [
+    CacheRule(r"/v5/stock/batch/quote\.json", ttl=5, stale=25, disk=False),
+    CacheRule(r"/v5/stock/hot_stock/list\.json", ttl=300, stale=600),
+    CacheRule(r"/v4/statuses/public_timeline_by_category\.json", ttl=120, stale=300),
+    CacheRule(r"/stock/search\.json", ttl=3600, stale=24 * 3600),
+]
+_cache = for_rules(CACHE_RULES, "xueqiu")
+
 
 def _inject_cookie_string(cookie_str: str) -> None:
     """Parse a 'name=value; name2=value2' string and inject into the cookie jar."""
@@ -121,12 +143,21 @@ def _ensure_cookies() -> None:
     # This is not sufficient for authenticated APIs but avoids hard failures
     # on public endpoints that only need the session cookie.
     req = urllib.request.Request(_XUEQIU_HOME, headers={"User-Agent": _UA})
-    _opener.open(req, timeout=_TIMEOUT)
+    # Read to the end so the connection goes back to the keep-alive pool
+    with _opener.open(req, timeout=_TIMEOUT) as resp:
+        resp.read()
     _cookies_initialized = True
 
 
 def _get_json(url: str) -> Any:
-    """Fetch *url* with Xueqiu session cookies and return parsed JSON."""
+    """Fetch *url* with Xueqiu session cookies and return parsed JSON.
+
+    Served from the response cache when a CACHE_RULES entry allows it.
+    """
+    return _cache.get(url, lambda: _fetch_json(url))
+
+
+def _fetch_json(url: str) -> Any:
     _ensure_cookies()
     req = urllib.request.Request(
         url, headers={"User-Agent": _UA, "Referer": _REFERER}
@@ -148,33 +179,49 @@ class XueqiuChannel(Channel):
     description = "雪球股票行情与社区动态"
     backends = ["Xueqiu API (需要登录 Cookie)"]
     tier = 1
-
-    # ------------------------------------------------------------------ #
-    # URL routing
-    # ------------------------------------------------------------------ #
-
-    def can_handle(self, url: str) -> bool:
-        d = urllib.parse.urlparse(url).netloc.lower()
-        return "xueqiu.com" in d
+    hosts = HOSTS["xueqiu"]
+    config_keys = ["xueqiu_cookie"]
 
     # ------------------------------------------------------------------ #
     # Health check
     # ------------------------------------------------------------------ #
 
-    def check(self, config=None):
+    def check(self, config=None, probe=None):
+        probe = probe or ProbeContext()
+        if not probe.allows("config"):
+            return "ok", "公开 API（未检测连通性）"
+        if not probe.allows("live"):
+            return self._check_cookie_source(config)
         try:
-            data = _get_json(
-                "https://stock.xueqiu.com/v5/stock/batch/quote.json?symbol=SH000001"
+            _ensure_cookies()
+            result = probe.fetch(
+                _QUOTE_PROBE_URL,
+                headers={"User-Agent": _UA, "Referer": _REFERER},
+                opener=_opener,
             )
-            items = (data.get("data") or {}).get("items") or []
-            if items:
-                return "ok", "公开 API 可用（行情、搜索、热帖、热股）"
-            return "warn", "API 响应异常（返回数据为空）"
+            if not result.ok:
+                raise OSError(result.error)
+            data = result.json()
         except Exception as e:
             return "warn", (
                 f"Xueqiu API 连接失败：{e}。"
                 "请先登录雪球后运行：agent-reach configure --from-browser chrome"
             )
+        items = (data.get("data") or {}).get("items") or []
+        if items:
+            return "ok", "公开 API 可用（行情、搜索、热帖、热股）"
+        return "warn", "API 响应异常（返回数据为空）"
+
+    def _check_cookie_source(self, config):
+        """Check where _ensure_cookies() would get cookies from, without fetching."""
+        if config is not None and config.get("xueqiu_cookie"):
+            return "ok", "已配置雪球 Cookie（未在线验证）"
+        if any(importlib.util.find_spec(m) for m in ("rookiepy", "browser_cookie3")):
+            return "ok", "未配置雪球 Cookie，将尝试读取浏览器 Cookie（未在线验证）"
+        return "warn", (
+            "未配置雪球 Cookie。"
+            "请先登录雪球后运行：agent-reach configure --from-browser chrome"
+        )
 
     # ------------------------------------------------------------------ #
     # Data-fetching methods
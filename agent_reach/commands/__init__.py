@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""CLI subcommands, one module per command.
+
+Each module exposes ``run(args)``. ``agent_reach.cli`` only builds the
+argument parser and imports the module for the command being run, so a
+short command like ``agent-reach version`` never pays for the imports of
+the installer, the doctor or the update checker.
+"""
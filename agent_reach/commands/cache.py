@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""`agent-reach cache` — web cache size and hit/miss counters."""
+
+import json
+
+
+def run(args):
+    """Print the web cache's footprint and counters, or clear it."""
+    from agent_reach.config import Config
+    from agent_reach.web_cache import WebCache
+
+    cache = WebCache.for_config(Config())
+    if args.clear:
+        count = len(cache.entries)
+        cache.clear()
+        cache.save()
+        print(f"已清空网页缓存（{count} 条）")
+        return
+    stats = cache.stats()
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+        return
+    total = stats["total"]
+    lookups = total["hits"] + total["misses"] + total["revalidated"]
+    hit_rate = (total["hits"] + total["revalidated"]) / lookups if lookups else 0.0
+    print(f"网页缓存：{stats['entries']} 条，"
+          f"{stats['bytes'] / 1e6:.1f} MB / {stats['max_bytes'] / 1e6:.0f} MB")
+    print(f"命中 {total['hits']}，重新验证 {total['revalidated']}，"
+          f"未命中 {total['misses']}，淘汰 {total['evictions']}（命中率 {hit_rate:.0%}）")
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""`agent-reach configure` — set config values and import cookies."""
+
+import os
+
+
+def run(args):
+    """Set a config value and test it, or auto-extract from browser."""
+    import shutil
+    from agent_reach.config import Config
+
+    config = Config()
+
+    # ── Auto-extract from browser ──
+    if args.from_browser:
+        from agent_reach.cookie_extract import configure_from_browser
+
+        browser = args.from_browser
+        print(f"Extracting cookies from {browser}...")
+        print()
+
+        results = configure_from_browser(browser, config)
+
+        found_any = False
+        for platform, success, message in results:
+            if success:
+                print(f"  ✅ {platform}: {message}")
+                found_any = True
+            else:
+                print(f"  -- {platform}: {message}")
+
+        print()
+        if found_any:
+            print("✅ Cookies configured! Run `agent-reach doctor` to see updated status.")
+        else:
+            print(f"No cookies found. Make sure you're logged into the platforms in {browser}.")
+        return
+
+    # ── Manual configure ──
+    if not args.key:
+        print("Usage: agent-reach configure <key> <value>")
+        print("   or: agent-reach configure --from-browser chrome")
+        return
+
+    value = " ".join(args.value) if args.value else ""
+    if not value:
+        print(f"Missing value for {args.key}")
+        return
+
+    if args.key == "proxy":
+        config.set("bilibili_proxy", value)
+        print(f"✅ Proxy configured for Bilibili!")
+        print("  Note: Reddit 已改为通过 rdt-cli 访问，无需代理。")
+
+    elif args.key == "twitter-cookies":
+        # Accept two formats:
+        # 1. auth_token ct0 (two separate values)
+        # 2. Full cookie header string: "auth_token=xxx; ct0=yyy; ..."
+        auth_token, ct0 = _parse_twitter_cookie_input(value)
+
+        if auth_token and ct0:
+            config.set("twitter_auth_token", auth_token)
+            config.set("twitter_ct0", ct0)
+
+            # Sync credentials to twitter-cli env
+            print("✅ Twitter cookies configured!")
+
+            print("Testing Twitter access...", end=" ")
+            try:
+                import subprocess
+                twitter_bin = shutil.which("twitter")
+                if not twitter_bin:
+                    print("[!] twitter-cli not installed. Run: pipx install twitter-cli")
+                else:
+                    import os
+                    env = os.environ.copy()
+                    env["TWITTER_AUTH_TOKEN"] = auth_token
+                    env["TWITTER_CT0"] = ct0
+                    result = subprocess.run(
+                        [twitter_bin, "status"],
+                        capture_output=True, encoding="utf-8", errors="replace", timeout=15,
+                        env=env,
+                    )
+                    output = (result.stdout or "") + (result.stderr or "")
+                    if "ok: true" in output:
+                        print("✅ Twitter access works!")
+                    else:
+                        print("[!] Auth check failed (cookies might be wrong)")
+            except Exception as e:
+                print(f"[X] Failed: {e}")
+        else:
+            print("[X] Could not find auth_token and ct0 in your input.")
+            print("   Accepted formats:")
+            print("   1. agent-reach configure twitter-cookies AUTH_TOKEN CT0")
+            print('   2. agent-reach configure twitter-cookies "auth_token=xxx; ct0=yyy; ..."')
+
+    elif args.key == "youtube-cookies":
+        config.set("youtube_cookies_from", value)
+        print(f"✅ YouTube cookie source configured: {value}")
+        print("   yt-dlp will use cookies from this browser for age-restricted/member videos.")
+
+    elif args.key == "xhs-cookies":
+        _configure_xhs_cookies(value)
+
+    elif args.key == "github-token":
+        config.set("github_token", value)
+        print(f"✅ GitHub token configured!")
+
+    elif args.key == "groq-key":
+        config.set("groq_api_key", value)
+        print(f"✅ Groq key configured!")
+
+    elif args.key == "v2ex-token":
+        config.set("v2ex_token", value)
+        print("✅ V2EX token configured!")
+        print("   主题和节点列表将优先使用 v2 API，额度用完时自动切换到公开 API。")
+
+
+def _parse_twitter_cookie_input(value: str):
+    """Parse Twitter cookie input from either separate values or a cookie header."""
+    auth_token = None
+    ct0 = None
+
+    if "auth_token=" in value and "ct0=" in value:
+        # Full cookie string — parse it.
+        for part in value.replace(";", " ").split():
+            if part.startswith("auth_token="):
+                auth_token = part.split("=", 1)[1]
+            elif part.startswith("ct0="):
+                ct0 = part.split("=", 1)[1]
+    elif len(value.split()) == 2 and "=" not in value:
+        # Two separate values: AUTH_TOKEN CT0.
+        parts = value.split()
+        auth_token = parts[0]
+        ct0 = parts[1]
+
+    return auth_token, ct0
+
+
+def _configure_xhs_cookies(value):
+    """Import cookies into xiaohongshu-mcp Docker container.
+
+    Accepts two formats:
+    1. Cookie-Editor JSON export (array of cookie objects)
+    2. Header String: "name1=value1; name2=value2; ..."
+
+    The xiaohongshu-mcp container stores cookies at $COOKIES_PATH
+    (default: /app/data/cookies.json or cookies.json in workdir).
+    Format: JSON array of {name, value, domain, path, expires, httpOnly, secure, sameSite}.
+    """
+    import json
+    import shutil
+    import subprocess
+
+    value = value.strip()
+    if not value:
+        print("[X] Missing cookie value.")
+        print("   Usage: agent-reach configure xhs-cookies '<cookie JSON or header string>'")
+        return
+
+    # Detect format and parse
+    cookies_json = None
+
+    # Try JSON format first (Cookie-Editor JSON export)
+    if value.startswith("["):
+        try:
+            parsed = json.loads(value)
+            if isinstance(parsed, list) and parsed:
+                # Validate it looks like cookie objects
+                first = parsed[0]
+                if isinstance(first, dict) and "name" in first and "value" in first:
+                    cookies_json = json.dumps(parsed)
+                    print(f"  Parsed {len(parsed)} cookies from JSON format")
+                else:
+                    print("[X] JSON array doesn't contain cookie objects (need name/value fields)")
+                    return
+            else:
+                print("[X] Empty or invalid JSON array")
+                return
+        except json.JSONDecodeError as e:
+            print(f"[X] Invalid JSON: {e}")
+            return
+
+    # Header String format: "key1=val1; key2=val2; ..."
+    if cookies_json is None and "=" in value:
+        cookies = []
+        for part in value.split(";"):
+            part = part.strip()
+            if "=" not in part:
+                continue
+            name, val = part.split("=", 1)
+            name = name.strip()
+            val = val.strip()
+            if name:
+                cookies.append({
+                    "name": name,
+                    "value": val,
+                    "domain": ".xiaohongshu.com",
+                    "path": "/",
+                    "expires": -1,
+                    "size": len(name) + len(val),
+                    "httpOnly": False,
+                    "secure": False,
+                    "session": True,
+                    "sameSite": "Lax",
+                })
+        if cookies:
+            cookies_json = json.dumps(cookies)
+            print(f"  Parsed {len(cookies)} cookies from Header String format")
+        else:
+            print("[X] Could not parse any cookies from input")
+            return
+
+    if not cookies_json:
+        print("[X] Could not parse cookies. Accepted formats:")
+        print('   1. JSON array: \'[{"name":"x","value":"y","domain":".xiaohongshu.com",...}]\'')
+        print('   2. Header String: "key1=val1; key2=val2; ..."')
+        return
+
+    # Find the container
+    docker = shutil.which("docker")
+    if not docker:
+        # No Docker - write to a local file for manual import
+        cookie_path = os.path.expanduser("~/.agent-reach/xhs-cookies.json")
+        with open(cookie_path, "w") as f:
+            f.write(cookies_json)
+        os.chmod(cookie_path, 0o600)
+        print(f"  Cookies saved to {cookie_path}")
+        print("  Docker not found. Copy manually:")
+        print(f"  docker cp {cookie_path} xiaohongshu-mcp:/app/data/cookies.json")
+        return
+
+    # Check if xiaohongshu-mcp container is running
+    try:
+        result = subprocess.run(
+            [docker, "ps", "--filter", "name=xiaohongshu-mcp", "--format", "{{.Names}}"],
+            capture_output=True, encoding="utf-8", timeout=5,
+        )
+        container_name = result.stdout.strip()
+        if not container_name:
+            print("[X] xiaohongshu-mcp container is not running.")
+            print("   Start it first:")
+            print("   docker run -d --name xiaohongshu-mcp -p 18060:18060 xpzouying/xiaohongshu-mcp")
+            return
+    except Exception as e:
+        print(f"[X] Could not check Docker: {e}")
+        return
+
+    # Find the cookies path inside the container
+    try:
+        result = subprocess.run(
+            [docker, "exec", container_name, "printenv", "COOKIES_PATH"],
+            capture_output=True, encoding="utf-8", timeout=5,
+        )
+        cookie_path_in_container = result.stdout.strip()
+        if not cookie_path_in_container:
+            cookie_path_in_container = "/app/cookies.json"  # fallback: absolute path in workdir
+    except Exception:
+        cookie_path_in_container = "/app/cookies.json"
+
+    # Write cookies into the container
+    try:
+        # Write to temp file then docker cp
+        import tempfile
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            f.write(cookies_json)
+            tmp_path = f.name
+
+        result = subprocess.run(
+            [docker, "cp", tmp_path, f"{container_name}:{cookie_path_in_container}"],
+            capture_output=True, encoding="utf-8", timeout=10,
+        )
+        os.unlink(tmp_path)
+
+        if result.returncode != 0:
+            print(f"[X] Failed to copy cookies: {result.stderr}")
+            return
+
+        print(f"✅ Cookies written to {container_name}:{cookie_path_in_container}")
+        # Restart container so it reloads cookies from disk
+        print("  Restarting container to reload cookies...", end=" ", flush=True)
+        try:
+            subprocess.run(
+                [docker, "restart", container_name],
+                capture_output=True, encoding="utf-8", timeout=30,
+            )
+            print("done")
+        except Exception as e:
+            print(f"\n  [!] Could not restart container: {e}")
+            print(f"  Restart manually: docker restart {container_name}")
+    except Exception as e:
+        print(f"[X] Failed to write cookies: {e}")
+        return
+
+    # Verify login status via mcporter
+    mcporter = shutil.which("mcporter")
+    if mcporter:
+        print("  Verifying login status...", end=" ")
+        try:
+            result = subprocess.run(
+                [mcporter, "call", "xiaohongshu.check_login_status()"],
+                capture_output=True, encoding="utf-8", errors="replace", timeout=15,
+            )
+            if "已登录" in result.stdout or "logged" in result.stdout.lower():
+                print("✅ Login verified!")
+            else:
+                print("[!] Login check returned unexpected result:")
+                print(f"  {result.stdout.strip()[:200]}")
+                print("  Cookies were written but login might not be valid. Try fresh cookies.")
+        except Exception as e:
+            print(f"[!] Could not verify: {e}")
+    else:
+        print("  (mcporter not found, skipping verification)")
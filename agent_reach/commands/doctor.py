@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""`agent-reach doctor` — check platform availability."""
+
+import json
+import sys
+import time
+from typing import Callable
+
+from agent_reach.commands.skill import _install_skill
+
+
+def run(args=None):
+    """Check every channel and print a report (or JSON / NDJSON)."""
+    import contextlib
+
+    from agent_reach.config import Config
+    from agent_reach.doctor import (
+        DEFAULT_CHANNEL_TIMEOUT,
+        check_all,
+        format_profile,
+        format_report,
+    )
+    from agent_reach.doctor_cache import DEFAULT_MAX_AGE
+    timeout = getattr(args, "timeout", None)
+    if timeout is None:
+        timeout = DEFAULT_CHANNEL_TIMEOUT
+    budget = getattr(args, "budget", None)
+    max_age = getattr(args, "max_age", None)
+    if max_age is None and getattr(args, "cached", False):
+        max_age = DEFAULT_MAX_AGE
+    profile = getattr(args, "profile", False)
+    level = getattr(args, "level", None) or "live"
+    as_json = getattr(args, "json", False) or getattr(args, "stream", False)
+    config = Config()
+    if getattr(args, "stream", False):
+        _stream_doctor(config, timeout, budget, max_age, profile, level)
+        with contextlib.redirect_stdout(sys.stderr):
+            _install_skill()
+        return
+    results = None
+    if max_age is not None and not profile:
+        # The daemon probes at live depth, which satisfies any --level
+        from agent_reach.daemon import fresh_status
+        results = fresh_status(config, max_age)
+    if results is None:
+        results = check_all(
+            config, timeout=timeout, budget=budget, max_age=max_age, profile=profile,
+            level=level,
+        )
+    if as_json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        rprint: Callable[..., None]
+        try:
+            from rich import print as rich_print
+            rprint = rich_print
+        except ImportError:
+            rprint = print
+        rprint(format_report(results))
+        if profile:
+            rprint(format_profile(results))
+
+    # Auto-install skill if not already present (fixes #154).
+    # Keep stdout machine-readable in --json mode.
+    with contextlib.redirect_stdout(sys.stderr if as_json else sys.stdout):
+        _install_skill()
+
+
+def _stream_doctor(config, timeout, budget, max_age, profile, level="live"):
+    """Print NDJSON: one line per channel in completion order, then a summary."""
+    from agent_reach.doctor import iter_results
+
+    start = time.perf_counter()
+    ok = total = 0
+    for name, entry in iter_results(
+        config, timeout=timeout, budget=budget, max_age=max_age, profile=profile,
+        level=level,
+    ):
+        total += 1
+        ok += entry["status"] == "ok"
+        print(json.dumps({"type": "channel", "channel": name, **entry}, ensure_ascii=False),
+              flush=True)
+    print(json.dumps({
+        "type": "summary",
+        "ok": ok,
+        "total": total,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }), flush=True)
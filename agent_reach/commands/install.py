@@ -0,0 +1,710 @@
+# -*- coding: utf-8 -*-
+"""`agent-reach install` — one-shot installer for upstream tools."""
+
+import os
+import sys
+
+from agent_reach.commands.skill import _install_skill
+
+
+def run(args):
+    """One-shot deterministic installer."""
+    import os
+    from agent_reach.config import Config
+    from agent_reach.doctor import check_all, format_report
+
+    safe_mode = args.safe
+    dry_run = args.dry_run
+
+    config = Config()
+    print()
+    print("Agent Reach Installer")
+    print("=" * 40)
+
+    # Ensure tools directory exists (for upstream tool repos)
+    tools_dir = os.path.expanduser("~/.agent-reach/tools")
+    os.makedirs(tools_dir, exist_ok=True)
+
+    if dry_run:
+        print("DRY RUN — showing what would be done (no changes)")
+        print()
+    if safe_mode:
+        print("SAFE MODE — skipping automatic system changes")
+        print()
+
+    # ── Parse --channels ──
+    CHANNEL_INSTALLERS = {
+        "twitter":     _install_twitter_deps,
+        "weibo":       _install_weibo_deps,
+        "wechat":      _install_wechat_deps,
+        "xiaoyuzhou":  _install_xiaoyuzhou_deps,
+        "xiaohongshu": _install_xhs_deps,
+        "reddit":      _install_reddit_deps,
+        "bilibili":    _install_bili_deps,
+        # xueqiu: cookie-only, no install step
+        # douyin/linkedin: manual setup, no auto-install
+    }
+    COOKIE_CHANNELS = {"twitter", "xueqiu", "bilibili"}
+
+    requested_channels = set()
+    if args.channels:
+        raw = [c.strip().lower() for c in args.channels.split(",") if c.strip()]
+        if "all" in raw:
+            requested_channels = set(CHANNEL_INSTALLERS.keys()) | {"xueqiu", "douyin", "linkedin"}
+        else:
+            requested_channels = set(raw)
+
+    # Auto-detect environment
+    env = args.env
+    if env == "auto":
+        env = _detect_environment()
+
+    if env == "server":
+        print(f"Environment: Server/VPS (auto-detected)")
+    else:
+        print(f"Environment: Local computer (auto-detected)")
+
+    # Apply explicit flags
+    if args.proxy:
+        if dry_run:
+            print(f"[dry-run] Would configure proxy for Bilibili")
+        else:
+            config.set("bilibili_proxy", args.proxy)
+            print(f"✅ Proxy configured for Bilibili")
+
+    # ── Install core system dependencies (lightweight, always) ──
+    print()
+    if dry_run:
+        _install_system_deps_dryrun()
+    elif safe_mode:
+        _install_system_deps_safe()
+    else:
+        _install_system_deps()
+
+    # ── mcporter (for Exa search) ──
+    print()
+    if dry_run:
+        print("[dry-run] Would install mcporter and configure Exa search")
+    elif safe_mode:
+        _install_mcporter_safe()
+    else:
+        _install_mcporter()
+
+    # ── Install optional channels (only if --channels specified) ──
+    if requested_channels and not dry_run and not safe_mode:
+        print()
+        print("Installing optional channels...")
+        for ch_name in sorted(requested_channels):
+            installer = CHANNEL_INSTALLERS.get(ch_name)
+            if installer:
+                installer()
+
+    if requested_channels and dry_run:
+        print()
+        print(f"[dry-run] Would install optional channels: {', '.join(sorted(requested_channels))}")
+
+    # ── Auto-import cookies (only if cookie-needing channels are requested) ──
+    needs_cookies = bool(requested_channels & COOKIE_CHANNELS)
+    if env == "local" and needs_cookies and not safe_mode and not dry_run:
+        print()
+        print("Importing cookies from browser...")
+        print("  (macOS may ask for your login password to access the Keychain — this is normal,")
+        print("   it only happens once during install. Enter your password or click 'Allow'.)")
+        try:
+            from agent_reach.cookie_extract import configure_from_browser
+            results = configure_from_browser("chrome", config)
+            found = False
+            for platform, success, message in results:
+                if success:
+                    print(f"  ✅ {platform}: {message}")
+                    found = True
+            if not found:
+                results = configure_from_browser("firefox", config)
+                for platform, success, message in results:
+                    if success:
+                        print(f"  ✅ {platform}: {message}")
+                        found = True
+            if not found:
+                print("  -- No cookies found (normal if you haven't logged into these sites)")
+        except Exception:
+            print("  -- Could not read browser cookies (browser might be open or password was denied)")
+    elif env == "local" and needs_cookies and dry_run:
+        print()
+        print("[dry-run] Would try to import cookies from Chrome/Firefox")
+
+    # Environment-specific advice
+    if env == "server":
+        print()
+        print("Tip: Bilibili may block server IPs.")
+        print("   Reddit: rdt-cli works without proxy (pipx install rdt-cli).")
+        print("   For Bilibili full access: agent-reach configure proxy http://user:pass@ip:port")
+        print("   Cheap option: https://www.webshare.io ($1/month)")
+
+    # Test channels
+    if not dry_run:
+        print()
+        print("Testing channels...")
+        results = check_all(config)
+        ok = sum(1 for r in results.values() if r["status"] == "ok")
+        total = len(results)
+
+        # Final status
+        print()
+        print(format_report(results))
+        print()
+
+        # ── Install agent skill ──
+        _install_skill()
+
+        print(f"✅ Installation complete! {ok}/{total} channels active.")
+
+        if not requested_channels:
+            # First install — hint about optional channels
+            print()
+            print("More channels available! Use --channels to install:")
+            print("   agent-reach install --channels=twitter,weibo,xiaohongshu,...")
+            print("   agent-reach install --channels=all  (install everything)")
+
+        # Star reminder
+        print()
+        print("如果 Agent Reach 帮到了你，给个 Star 让更多人发现它吧：")
+        print("   https://github.com/Panniantong/Agent-Reach")
+        print("   只需一秒，对独立开发者意义很大。谢谢！")
+    else:
+        print()
+        print("Dry run complete. No changes were made.")
+
+
+def _install_system_deps():
+    """Install system-level dependencies: gh CLI, Node.js (for mcporter)."""
+    import shutil
+    import subprocess
+    import platform
+    import tempfile
+
+    print("Checking system dependencies...")
+
+    # ── gh CLI ──
+    if shutil.which("gh"):
+        print("  ✅ gh CLI already installed")
+    else:
+        print("  Installing gh CLI...")
+        os_type = platform.system().lower()
+        if os_type == "linux":
+            try:
+                # Official GitHub apt source setup without invoking a shell.
+                keyring_path = "/usr/share/keyrings/githubcli-archive-keyring.gpg"
+                list_path = "/etc/apt/sources.list.d/github-cli.list"
+                arch = subprocess.run(
+                    ["dpkg", "--print-architecture"],
+                    capture_output=True, encoding="utf-8", errors="replace", timeout=10,
+                ).stdout.strip() or "amd64"
+                subprocess.run(
+                    ["curl", "-fsSL", "https://cli.github.com/packages/githubcli-archive-keyring.gpg", "-o", keyring_path],
+                    capture_output=True, timeout=60,
+                )
+                repo_line = (
+                    f"deb [arch={arch} signed-by={keyring_path}] "
+                    "https://cli.github.com/packages stable main\n"
+                )
+                with open(list_path, "w", encoding="utf-8") as f:
+                    f.write(repo_line)
+                subprocess.run(["apt-get", "update", "-qq"], capture_output=True, timeout=60)
+                subprocess.run(["apt-get", "install", "-y", "-qq", "gh"], capture_output=True, timeout=60)
+                if shutil.which("gh"):
+                    print("  ✅ gh CLI installed")
+                else:
+                    print("  [!]  gh CLI install failed. You can try: snap install gh, or download from https://github.com/cli/cli/releases")
+            except Exception:
+                print("  [!]  gh CLI install failed. You can try: snap install gh, or download from https://github.com/cli/cli/releases")
+        elif os_type == "darwin":
+            if shutil.which("brew"):
+                try:
+                    subprocess.run(["brew", "install", "gh"], capture_output=True, timeout=120)
+                    if shutil.which("gh"):
+                        print("  ✅ gh CLI installed")
+                    else:
+                        print("  [!]  gh CLI install failed. Try: brew install gh")
+                except Exception:
+                    print("  [!]  gh CLI install failed. Try: brew install gh")
+            else:
+                print("  [!]  gh CLI not found. Install: https://cli.github.com")
+        else:
+            print("  [!]  gh CLI not found. Install: https://cli.github.com")
+
+    # ── Node.js (needed for mcporter) ──
+    if shutil.which("node") and shutil.which("npm"):
+        print("  ✅ Node.js already installed")
+    else:
+        print("  Installing Node.js...")
+        try:
+            # Use NodeSource setup script without invoking a shell pipeline.
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".sh") as tf:
+                script_path = tf.name
+            subprocess.run(
+                ["curl", "-fsSL", "https://deb.nodesource.com/setup_22.x", "-o", script_path],
+                capture_output=True, timeout=60,
+            )
+            subprocess.run(
+                ["bash", script_path],
+                capture_output=True, timeout=120,
+            )
+            try:
+                os.unlink(script_path)
+            except Exception:
+                pass
+            subprocess.run(
+                ["apt-get", "install", "-y", "-qq", "nodejs"],
+                capture_output=True, timeout=120,
+            )
+            if shutil.which("node"):
+                print("  ✅ Node.js installed")
+            else:
+                print("  [!]  Node.js install failed. Try: apt install nodejs npm, or nvm install 22, or download from https://nodejs.org")
+        except Exception:
+            print("  [!]  Node.js install failed. Try: apt install nodejs npm, or nvm install 22, or download from https://nodejs.org")
+
+    # ── undici (proxy support for Node.js fetch) ──
+    npm_cmd = shutil.which("npm")
+    if npm_cmd:
+        npm_root = subprocess.run([npm_cmd, "root", "-g"], capture_output=True, encoding="utf-8", errors="replace", timeout=5).stdout.strip()
+        undici_path = os.path.join(npm_root, "undici", "index.js") if npm_root else ""
+        if os.path.exists(undici_path):
+            print("  ✅ undici already installed (Node.js proxy support)")
+        else:
+            try:
+                subprocess.run([npm_cmd, "install", "-g", "undici"], capture_output=True, encoding="utf-8", errors="replace", timeout=60)
+                print("  ✅ undici installed (Node.js proxy support)")
+            except Exception:
+                print("  -- undici install failed (optional — may not work behind proxies)")
+
+    # ── yt-dlp JS runtime config (YouTube requires external JS runtime) ──
+    if shutil.which("node"):
+        ytdlp_config_dir = os.path.expanduser("~/.config/yt-dlp")
+        ytdlp_config = os.path.join(ytdlp_config_dir, "config")
+        needs_config = True
+        if os.path.exists(ytdlp_config):
+            with open(ytdlp_config, "r") as f:
+                if "--js-runtimes" in f.read():
+                    needs_config = False
+                    print("  ✅ yt-dlp JS runtime already configured")
+        if needs_config:
+            try:
+                os.makedirs(ytdlp_config_dir, exist_ok=True)
+                with open(ytdlp_config, "a") as f:
+                    f.write("--js-runtimes node\n")
+                print("  ✅ yt-dlp configured to use Node.js as JS runtime (YouTube)")
+            except Exception:
+                print("  -- Could not configure yt-dlp JS runtime (YouTube may not work)")
+
+    # NOTE: twitter-cli, weibo, xiaoyuzhou, wechat, xhs-cli etc. are optional.
+    # They are installed via --channels flag, not here.
+    # See CHANNEL_INSTALLERS in run().
+
+
+def _install_xiaoyuzhou_deps():
+    """Install Xiaoyuzhou podcast transcription script."""
+    import shutil
+    from agent_reach.config import Config
+
+    config = Config()
+    print("Setting up Xiaoyuzhou podcast transcription...")
+
+    tools_dir = os.path.expanduser("~/.agent-reach/tools/xiaoyuzhou")
+    script_dst = os.path.join(tools_dir, "transcribe.sh")
+
+    if os.path.isfile(script_dst):
+        print("  ✅ Xiaoyuzhou transcription script already installed")
+    else:
+        # Copy script from package
+        script_src = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "scripts", "transcribe_xiaoyuzhou.sh"
+        )
+        if os.path.isfile(script_src):
+            try:
+                os.makedirs(tools_dir, exist_ok=True)
+                import shutil as _shutil
+                _shutil.copy2(script_src, script_dst)
+                os.chmod(script_dst, 0o755)
+                print("  ✅ Xiaoyuzhou transcription script installed")
+            except Exception as e:
+                print(f"  [!]  Failed to install script: {e}")
+        else:
+            print("  [!]  Script source not found in package")
+
+    # Check ffmpeg
+    if shutil.which("ffmpeg"):
+        print("  ✅ ffmpeg available")
+    else:
+        print("  -- ffmpeg not found. Install: apt install -y ffmpeg (or brew install ffmpeg)")
+
+    # Check GROQ_API_KEY
+    has_key = bool(os.environ.get("GROQ_API_KEY")) or bool(config.get("groq_api_key"))
+    if has_key:
+        print("  ✅ Groq API key configured")
+    else:
+        print("  -- Groq API key not set. Get free key at https://console.groq.com")
+        print("     Then run: agent-reach configure groq-key gsk_xxxxx")
+
+
+def _install_twitter_deps():
+    """Install twitter-cli for Twitter search + timeline."""
+    import shutil
+    import subprocess
+
+    print("Setting up Twitter (twitter-cli)...")
+    if shutil.which("twitter"):
+        print("  ✅ twitter-cli already installed")
+        return
+    for tool, cmd in [("pipx", ["pipx", "install", "twitter-cli"]),
+                      ("uv", ["uv", "tool", "install", "twitter-cli"])]:
+        if shutil.which(tool):
+            try:
+                subprocess.run(cmd, capture_output=True, encoding="utf-8",
+                               errors="replace", timeout=120)
+                if shutil.which("twitter"):
+                    print("  ✅ twitter-cli installed")
+                    return
+            except Exception:
+                pass
+    print("  [!]  twitter-cli install failed. Run: pipx install twitter-cli")
+
+
+def _install_xhs_deps():
+    """Install xhs-cli (xiaohongshu-cli) for XiaoHongShu."""
+    import shutil
+    import subprocess
+
+    print("Setting up XiaoHongShu (xhs-cli)...")
+    if shutil.which("xhs"):
+        print("  ✅ xhs-cli already installed")
+        return
+    for tool, cmd in [("pipx", ["pipx", "install", "xiaohongshu-cli"]),
+                      ("uv", ["uv", "tool", "install", "xiaohongshu-cli"])]:
+        if shutil.which(tool):
+            try:
+                subprocess.run(cmd, capture_output=True, encoding="utf-8",
+                               errors="replace", timeout=120)
+                if shutil.which("xhs"):
+                    print("  ✅ xhs-cli installed (run `xhs login` to authenticate)")
+                    return
+            except Exception:
+                pass
+    print("  [!]  xhs-cli install failed. Run: pipx install xiaohongshu-cli")
+
+
+def _install_reddit_deps():
+    """Install rdt-cli for Reddit search + reading."""
+    import shutil
+    import subprocess
+
+    print("Setting up Reddit (rdt-cli)...")
+    if shutil.which("rdt"):
+        print("  ✅ rdt-cli already installed")
+        return
+    for tool, cmd in [("pipx", ["pipx", "install", "rdt-cli"]),
+                      ("uv", ["uv", "tool", "install", "rdt-cli"])]:
+        if shutil.which(tool):
+            try:
+                subprocess.run(cmd, capture_output=True, encoding="utf-8",
+                               errors="replace", timeout=120)
+                if shutil.which("rdt"):
+                    print("  ✅ rdt-cli installed")
+                    return
+            except Exception:
+                pass
+    print("  [!]  rdt-cli install failed. Run: pipx install rdt-cli")
+
+
+def _install_bili_deps():
+    """Install bili-cli for Bilibili hot/rank/search."""
+    import shutil
+    import subprocess
+
+    print("Setting up Bilibili (bili-cli)...")
+    if shutil.which("bili"):
+        print("  ✅ bili-cli already installed")
+        return
+    for tool, cmd in [("pipx", ["pipx", "install", "bilibili-cli"]),
+                      ("uv", ["uv", "tool", "install", "bilibili-cli"])]:
+        if shutil.which(tool):
+            try:
+                subprocess.run(cmd, capture_output=True, encoding="utf-8",
+                               errors="replace", timeout=120)
+                if shutil.which("bili"):
+                    print("  ✅ bili-cli installed")
+                    return
+            except Exception:
+                pass
+    print("  [!]  bili-cli install failed. Run: pipx install bilibili-cli")
+
+
+def _install_weibo_deps():
+    """Install Weibo MCP server (Panniantong fork with visitor passport auth)."""
+    import shutil
+    import subprocess
+
+    print("Setting up Weibo MCP server...")
+
+    # Check if already installed and working
+    mcporter = shutil.which("mcporter")
+    if mcporter:
+        try:
+            r = subprocess.run(
+                [mcporter, "config", "list"], capture_output=True,
+                encoding="utf-8", errors="replace", timeout=5
+            )
+            if "weibo" in r.stdout:
+                print("  ✅ Weibo MCP already configured")
+                return
+        except Exception:
+            pass
+
+    # Install from our fork (has visitor passport auth fix)
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "pip", "install", "-q",
+             "git+https://github.com/Panniantong/mcp-server-weibo.git"],
+            check=True, timeout=120
+        )
+        print("  ✅ mcp-server-weibo installed (Panniantong fork)")
+    except Exception as e:
+        print(f"  [!]  mcp-server-weibo install failed: {e}")
+        return
+
+    # Register with mcporter
+    if mcporter:
+        try:
+            subprocess.run(
+                [mcporter, "config", "add", "weibo", "--command", "mcp-server-weibo"],
+                check=True, capture_output=True, timeout=10
+            )
+            print("  ✅ Weibo MCP registered with mcporter")
+        except Exception:
+            print("  [!]  mcporter config add failed. Run manually: mcporter config add weibo --command 'mcp-server-weibo'")
+    else:
+        print("  -- mcporter not found, skipping MCP registration. Install mcporter first, then run: mcporter config add weibo --command 'mcp-server-weibo'")
+
+
+def _install_wechat_deps():
+    """Install WeChat article reading and search dependencies."""
+    import subprocess
+
+    print("Setting up WeChat article tools...")
+
+    # Check if already installed
+    has_camoufox = False
+    has_miku = False
+    try:
+        import camoufox  # noqa: F401
+        has_camoufox = True
+    except ImportError:
+        pass
+    try:
+        import miku_ai  # noqa: F401
+        has_miku = True
+    except ImportError:
+        pass
+
+    # Install Python packages
+    if has_camoufox and has_miku:
+        print("  ✅ WeChat Python packages already installed")
+    else:
+        pkgs = []
+        if not has_camoufox:
+            pkgs.extend(["camoufox[geoip]", "markdownify", "beautifulsoup4", "httpx"])
+        if not has_miku:
+            pkgs.append("miku_ai")
+        try:
+            cmd = [sys.executable, "-m", "pip", "install", "--break-system-packages", "-q"] + pkgs
+            subprocess.run(cmd, capture_output=True, encoding="utf-8", errors="replace", timeout=120)
+            # Verify
+            ok = True
+            try:
+                import importlib
+                if not has_camoufox:
+                    importlib.import_module("camoufox")
+                if not has_miku:
+                    importlib.import_module("miku_ai")
+            except ImportError:
+                ok = False
+            if ok:
+                print(f"  ✅ WeChat Python packages installed ({', '.join(pkgs)})")
+            else:
+                print(f"  [!]  Some WeChat packages failed to install. Try: pip install {' '.join(pkgs)}")
+        except Exception:
+            print(f"  [!]  WeChat packages install failed. Try: pip install {' '.join(pkgs)}")
+
+    # Clone wechat-article-for-ai tool
+    tools_dir = os.path.expanduser("~/.agent-reach/tools")
+    wechat_dir = os.path.join(tools_dir, "wechat-article-for-ai")
+    if os.path.isfile(os.path.join(wechat_dir, "main.py")):
+        print("  ✅ wechat-article-for-ai tool already installed")
+    else:
+        try:
+            os.makedirs(tools_dir, exist_ok=True)
+            subprocess.run(
+                ["git", "clone", "--depth", "1",
+                 "https://github.com/Panniantong/wechat-article-for-ai.git", wechat_dir],
+                capture_output=True, encoding="utf-8", errors="replace", timeout=60,
+            )
+            if os.path.isfile(os.path.join(wechat_dir, "main.py")):
+                print("  ✅ wechat-article-for-ai tool installed")
+            else:
+                print("  [!]  wechat-article-for-ai clone failed. Try: git clone https://github.com/Panniantong/wechat-article-for-ai.git " + wechat_dir)
+        except Exception:
+            print("  [!]  wechat-article-for-ai clone failed. Try: git clone https://github.com/Panniantong/wechat-article-for-ai.git " + wechat_dir)
+
+
+def _install_system_deps_safe():
+    """Safe mode: check what's installed, print instructions for what's missing."""
+    import shutil
+
+    print("Checking system dependencies (safe mode — no auto-install)...")
+
+    deps = [
+        ("gh", ["gh"], "GitHub CLI", "https://cli.github.com — or: apt install gh / brew install gh"),
+        ("node", ["node", "npm"], "Node.js", "https://nodejs.org — or: apt install nodejs npm"),
+    ]
+
+    missing = []
+    for name, binaries, label, install_hint in deps:
+        found = any(shutil.which(b) for b in binaries)
+        if found:
+            print(f"  ✅ {label} already installed")
+        else:
+            print(f"  -- {label} not found")
+            missing.append((label, install_hint))
+
+    if missing:
+        print()
+        print("  To install missing dependencies manually:")
+        for label, hint in missing:
+            print(f"    {label}: {hint}")
+    else:
+        print("  All system dependencies are installed!")
+
+
+def _install_system_deps_dryrun():
+    """Dry-run: just show what would be checked/installed."""
+    import shutil
+
+    print("[dry-run] System dependency check:")
+
+    checks = [
+        ("gh CLI", ["gh"], "apt install gh / brew install gh"),
+        ("Node.js", ["node"], "curl NodeSource setup | bash + apt install nodejs"),
+    ]
+
+    for label, binaries, method in checks:
+        found = any(shutil.which(b) for b in binaries)
+        if found:
+            print(f"  ✅ {label}: already installed, skip")
+        else:
+            print(f"  {label}: would install via: {method}")
+
+
+
+def _install_mcporter():
+    """Install mcporter and configure Exa search."""
+    import shutil
+    import subprocess
+
+    print("Setting up mcporter (search backend)...")
+
+    if shutil.which("mcporter"):
+        print("  ✅ mcporter already installed")
+    else:
+        # Check for npm/npx
+        if not shutil.which("npm") and not shutil.which("npx"):
+            print("  [!]  mcporter requires Node.js. Install Node.js first:")
+            print("     https://nodejs.org/ or: curl -fsSL https://fnm.vercel.app/install | bash")
+            return
+        try:
+            subprocess.run(
+                ["npm", "install", "-g", "mcporter"],
+                capture_output=True, encoding="utf-8", errors="replace", timeout=120,
+            )
+            if shutil.which("mcporter"):
+                print("  ✅ mcporter installed")
+            else:
+                print("  [X] mcporter install failed. Retry: npm install -g mcporter (check network/timeout), or try: npx mcporter@latest list")
+                return
+        except Exception as e:
+            print(f"  [X] mcporter install failed: {e}")
+            return
+
+    # Configure Exa MCP (free, no key needed)
+    try:
+        r = subprocess.run(
+            ["mcporter", "config", "list"], capture_output=True, encoding="utf-8", errors="replace", timeout=5
+        )
+        if "exa" not in r.stdout:
+            subprocess.run(
+                ["mcporter", "config", "add", "exa", "https://mcp.exa.ai/mcp"],
+                capture_output=True, encoding="utf-8", errors="replace", timeout=10,
+            )
+            print("  ✅ Exa search configured (free, no API key needed)")
+        else:
+            print("  ✅ Exa search already configured")
+    except Exception:
+        print("  [!]  Could not configure Exa. Run manually: mcporter config add exa https://mcp.exa.ai/mcp")
+
+    # NOTE: xhs-cli is now optional, installed via --channels=xiaohongshu
+
+
+def _install_mcporter_safe():
+    """Safe mode: check mcporter status, print instructions."""
+    import shutil
+
+    print("Checking mcporter (safe mode)...")
+
+    if shutil.which("mcporter"):
+        print("  ✅ mcporter already installed")
+        print("  To configure Exa search: mcporter config add exa https://mcp.exa.ai/mcp")
+    else:
+        print("  -- mcporter not installed")
+        print("  To install: npm install -g mcporter")
+        print("  Then configure Exa: mcporter config add exa https://mcp.exa.ai/mcp")
+
+
+def _detect_environment():
+    """Auto-detect if running on local computer or server."""
+    import os
+
+    # Check common server indicators
+    indicators = 0
+
+    # SSH session
+    if os.environ.get("SSH_CONNECTION") or os.environ.get("SSH_CLIENT"):
+        indicators += 2
+
+    # Docker / container
+    if os.path.exists("/.dockerenv") or os.path.exists("/run/.containerenv"):
+        indicators += 2
+
+    # No display (headless)
+    if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        indicators += 1
+
+    # Cloud VM identifiers
+    for cloud_file in ["/sys/hypervisor/uuid", "/sys/class/dmi/id/product_name"]:
+        if os.path.exists(cloud_file):
+            try:
+                with open(cloud_file) as f:
+                    content = f.read().lower()
+                if any(x in content for x in ["amazon", "google", "microsoft", "digitalocean", "linode", "vultr", "hetzner"]):
+                    indicators += 2
+            except Exception:
+                pass
+
+    # systemd-detect-virt
+    try:
+        import subprocess
+        result = subprocess.run(["systemd-detect-virt"], capture_output=True, encoding="utf-8", errors="replace", timeout=3)
+        if result.returncode == 0 and result.stdout.strip() != "none":
+            indicators += 1
+    except Exception:
+        pass
+
+    return "server" if indicators >= 2 else "local"
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""`agent-reach read` — read web pages as Markdown via Jina Reader."""
+
+import json
+import os
+import sys
+import time
+
+
+def _batch_urls(path: str):
+    """URLs from *path* (``-`` for stdin): one per line, blank lines and # comments skipped."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _reader_options(args):
+    """ReaderOptions from the CLI flags (unset flags defer to the site profile)."""
+    from agent_reach.channels.web import ReaderOptions
+
+    return ReaderOptions(
+        target_selector=args.target,
+        remove_selector=args.remove,
+        wait_for_selector=args.wait_for,
+        return_format=args.format,
+        images=False if args.no_images else None,
+        links=False if args.no_links else None,
+    )
+
+
+def run(args):
+    """Print the page's Markdown, or NDJSON results for --batch."""
+    import urllib.error
+
+    from agent_reach.channels.web import WebChannel
+
+    if bool(args.url) == bool(args.batch):
+        print("[X] 请给出一个 URL，或用 --batch FILE 批量读取", file=sys.stderr)
+        sys.exit(2)
+
+    cache = None
+    if not args.no_cache:
+        from agent_reach.config import Config
+        from agent_reach.web_cache import DEFAULT_MAX_AGE, WebCache
+
+        max_age = args.max_age if args.max_age is not None else DEFAULT_MAX_AGE
+        cache = WebCache.for_config(Config(), max_age=max_age)
+    try:
+        if args.batch:
+            try:
+                urls = _batch_urls(args.batch)
+            except OSError as e:
+                print(f"[X] 无法读取 URL 列表：{e}", file=sys.stderr)
+                sys.exit(1)
+            _read_batch(WebChannel(), urls, cache, args)
+            return
+        streaming = args.output or args.max_bytes is not None or args.max_chars is not None
+        if streaming and args.backend != "jina":
+            print("[X] --output / --max-bytes / --max-chars 仅支持 --backend jina", file=sys.stderr)
+            sys.exit(2)
+        try:
+            if streaming:
+                _read_stream(WebChannel(), args, cache)
+                return
+            page = WebChannel().read_page(
+                args.url, cache=cache, options=_reader_options(args),
+                profile=not args.no_profile, backend=args.backend,
+            )
+        except (urllib.error.URLError, OSError, UnicodeDecodeError, ValueError) as e:
+            print(f"[X] 读取失败：{e}", file=sys.stderr)
+            sys.exit(1)
+    finally:
+        if cache is not None:
+            cache.save()
+    text = page.text
+    sys.stdout.write(text if text.endswith("\n") else text + "\n")
+    if args.backend != "jina":
+        print(f"（由 {page.backend} 读取）", file=sys.stderr)
+
+
+def _read_stream(channel, args, cache):
+    """Write the page chunk by chunk to --output (atomically) or stdout."""
+    chunks = channel.read_stream(
+        args.url, max_bytes=args.max_bytes, max_chars=args.max_chars, cache=cache,
+        options=_reader_options(args), profile=not args.no_profile,
+    )
+    if not args.output:
+        last = ""
+        for last in chunks:
+            sys.stdout.write(last)
+            sys.stdout.flush()
+        if not last.endswith("\n"):
+            sys.stdout.write("\n")
+        return
+    tmp = f"{args.output}.{os.getpid()}.tmp"
+    chars = 0
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                chars += len(chunk)
+        os.replace(tmp, args.output)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    print(f"已写入 {args.output}（{chars} 字符）", file=sys.stderr)
+
+
+def _read_batch(channel, urls, cache, args):
+    """Print NDJSON: one line per page in completion order, then a summary."""
+    from agent_reach.channels.web import _TIMEOUT, BATCH_PER_HOST, BATCH_WORKERS
+
+    start = time.perf_counter()
+    ok = 0
+    for result in channel.read_many(
+        urls,
+        cache=cache,
+        workers=args.workers or BATCH_WORKERS,
+        per_host=args.per_host or BATCH_PER_HOST,
+        timeout=args.timeout or _TIMEOUT,
+        options=_reader_options(args),
+        profile=not args.no_profile,
+        backend=args.backend,
+    ):
+        ok += result.ok
+        line = {"type": "page", "index": result.position, "url": result.url, "ok": result.ok}
+        if result.ok:
+            line["backend"] = result.backend
+            line["text"] = result.text
+        else:
+            line["error"] = result.error
+        line["elapsed_ms"] = result.elapsed_ms
+        print(json.dumps(line, ensure_ascii=False), flush=True)
+    print(json.dumps({
+        "type": "summary",
+        "ok": ok,
+        "total": len(urls),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }), flush=True)
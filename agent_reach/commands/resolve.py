@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""`agent-reach resolve` — expand share short links."""
+
+
+def run(args):
+    """Print the canonical URL for each argument, one per line."""
+    from agent_reach.config import Config
+    from agent_reach.shortlinks import ShortLinkResolver
+
+    resolver = ShortLinkResolver.for_config(Config())
+    try:
+        for url in resolver.resolve_many(args.urls):
+            print(url)
+    finally:
+        resolver.save()
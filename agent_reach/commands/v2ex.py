@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""`agent-reach v2ex` — sync and inspect the local V2EX mirror."""
+
+import json
+import sys
+
+
+def run(args):
+    """Sync nodes into ~/.agent-reach/v2ex.db, or show what it holds."""
+    import urllib.error
+
+    from agent_reach.config import Config
+    from agent_reach.v2ex_mirror import V2EXMirror
+
+    mirror = V2EXMirror.for_config(Config())
+    try:
+        if args.v2ex_command == "status":
+            stats = mirror.stats()
+            print(f"V2EX 镜像：{stats['nodes']} 个节点，{stats['topics']} 个主题，"
+                  f"{stats['replies']} 条回复，{stats['pending']} 个主题待同步")
+            return
+
+        nodes = [n.strip() for n in args.nodes.split(",") if n.strip()]
+        progress = None if args.json else (lambda msg: print(f"  {msg}", file=sys.stderr))
+        try:
+            report = mirror.sync(nodes, pages=args.pages, progress=progress)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"[X] 同步中断：{e}（已同步的内容已保存，再次运行会继续）", file=sys.stderr)
+            sys.exit(1)
+    finally:
+        mirror.close()
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    for node, c in report.items():
+        line = (f"{node}：新增 {c['new']}，更新 {c['updated']}，未变 {c['unchanged']}，"
+                f"回复 +{c['replies']}")
+        if c["failed"]:
+            line += f"，{c['failed']} 个主题回复获取失败（下次继续）"
+        print(line)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""`agent-reach watch` — quick health + update check, or the status daemon."""
+
+import sys
+
+from agent_reach.commands.update import _github_get_with_retry
+
+
+def run(args=None):
+    """Quick health check + update check, designed for scheduled tasks.
+
+    Only outputs problems. If everything is fine, outputs a single line.
+    With --daemon, runs the warm-status daemon instead.
+    """
+    if getattr(args, "daemon", False):
+        _run_daemon(args)
+        return
+
+    from agent_reach.config import Config
+    from agent_reach.doctor import check_all
+    from agent_reach import __version__
+
+    config = Config()
+    issues = []
+
+    # Check channels
+    results = check_all(config, max_age=getattr(args, "max_age", None))
+    ok = sum(1 for r in results.values() if r["status"] == "ok")
+    total = len(results)
+
+    # Find broken channels (were working, now broken)
+    for key, r in results.items():
+        if r["status"] in ("off", "error"):
+            issues.append(f"[X] {r['name']}：{r['message']}")
+        elif r["status"] in ("warn", "timeout"):
+            issues.append(f"[!] {r['name']}：{r['message']}")
+
+    # Check for updates
+    update_available = False
+    new_version = ""
+    release_body = ""
+    resp, err, _attempts = _github_get_with_retry(
+        "https://api.github.com/repos/Panniantong/Agent-Reach/releases/latest",
+        timeout=10,
+        retries=2,
+    )
+    if not err and resp and resp.status_code == 200:
+        data = resp.json()
+        latest = data.get("tag_name", "").lstrip("v")
+        if latest and latest != __version__:
+            update_available = True
+            new_version = latest
+            release_body = data.get("body", "")
+
+    # Output
+    if not issues and not update_available:
+        print(f"Agent Reach: 全部正常 ({ok}/{total} 渠道可用，v{__version__} 已是最新)")
+        return
+
+    print(f"Agent Reach 监控报告")
+    print(f"=" * 40)
+    print(f"版本: v{__version__}  |  渠道: {ok}/{total}")
+
+    if issues:
+        print()
+        for issue in issues:
+            print(f"  {issue}")
+
+    if update_available:
+        print()
+        print(f"新版本可用: v{new_version}")
+        if release_body:
+            for line in release_body.strip().split("\n")[:10]:
+                print(f"    {line}")
+        print(f"  更新: pip install --upgrade https://github.com/Panniantong/agent-reach/archive/main.zip")
+
+
+def _run_daemon(args):
+    """Run the warm-status daemon until interrupted."""
+    from agent_reach.config import Config
+    from agent_reach.daemon import DEFAULT_INTERVAL, StatusDaemon, log_change
+
+    config = Config()
+    daemon = StatusDaemon(
+        config,
+        socket_path=args.socket,
+        interval=args.interval or DEFAULT_INTERVAL,
+        on_change=log_change,
+    )
+    print(f"Agent Reach 状态守护进程已启动：{daemon.socket_path}", flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"[X] 守护进程启动失败：{e}", file=sys.stderr)
+        sys.exit(1)
@@ -31,12 +31,22 @@ class AgentReach:
     def __init__(self, config: Optional[Config] = None):
         self.config = config or Config()
 
-    def doctor(self) -> Dict[str, dict]:
-        """Check all channel availability."""
-        from agent_reach.doctor import check_all
-        return check_all(self.config)
+    def doctor(self, max_age: Optional[float] = None) -> Dict[str, dict]:
+        """Check all channel availability.
 
-    def doctor_report(self) -> str:
+        Pass *max_age* (seconds) to accept results up to that age: from the
+        `watch --daemon` status socket if one is running, otherwise from the
+        doctor cache for unchanged channels.
+        """
+        from agent_reach.doctor import check_all
+        if max_age is not None:
+            from agent_reach.daemon import fresh_status
+            results = fresh_status(self.config, max_age)
+            if results is not None:
+                return results
+        return check_all(self.config, max_age=max_age)
+
+    def doctor_report(self, max_age: Optional[float] = None) -> str:
         """Get formatted health report."""
-        from agent_reach.doctor import check_all, format_report
-        return format_report(check_all(self.config))
+        from agent_reach.doctor import format_report
+        return format_report(self.doctor(max_age=max_age))
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""Warm-status daemon for `agent-reach watch --daemon`.
+
+Keeps channel status in memory and serves it over a local Unix socket
+(~/.agent-reach/doctor.sock), so agents and the MCP server can read the
+current status without spawning any probe.
+
+The daemon re-probes every channel on a jittered schedule, and in between
+polls the inputs each channel declares (config.yaml, binaries on PATH,
+watched files). When one changes, only the affected channels are
+re-probed — the doctor cache fingerprints take care of the rest.
+
+Protocol: connect, read one JSON document until EOF:
+    {"updated_at": <unix time>, "pid": <int>, "results": {<check_all dict>}}
+"""
+
+import json
+import os
+import random
+import socket
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import yaml
+
+from agent_reach import doctor
+from agent_reach.config import Config
+from agent_reach.doctor_cache import channel_fingerprint
+
+SOCKET_NAME = "doctor.sock"
+DEFAULT_INTERVAL = 300.0   # seconds between full re-probes
+DEFAULT_JITTER = 0.1       # ± fraction of the interval
+POLL_INTERVAL = 2.0        # seconds between input-change polls
+
+
+def default_socket_path(config: Config) -> Path:
+    return config.config_dir / SOCKET_NAME
+
+
+def query_status(path: Path, timeout: float = 0.5) -> Optional[dict]:
+    """Return the daemon's status document, or None if no daemon answers."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        return json.loads(b"".join(chunks).decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def fresh_status(config: Config, max_age: float) -> Optional[Dict[str, dict]]:
+    """Return the running daemon's results if they are at most *max_age* old."""
+    payload = query_status(default_socket_path(config))
+    if not payload or time.time() - payload.get("updated_at", 0) > max_age:
+        return None
+    return payload.get("results")
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.request.sendall(self.server.status_bytes())  # type: ignore[attr-defined]
+
+
+class StatusDaemon:
+    """Keeps check_all results warm and serves them over a Unix socket."""
+
+    def __init__(
+        self,
+        config: Config,
+        socket_path: Optional[Path] = None,
+        interval: float = DEFAULT_INTERVAL,
+        jitter: float = DEFAULT_JITTER,
+        poll: float = POLL_INTERVAL,
+        on_change: Optional[Callable[[str, Optional[str], str], None]] = None,
+    ):
+        self.config = config
+        self.socket_path = Path(socket_path or default_socket_path(config))
+        self.interval = interval
+        self.jitter = jitter
+        self.poll = poll
+        self.on_change = on_change
+        self.results: Dict[str, dict] = {}
+        self.updated_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server: Optional[socketserver.BaseServer] = None
+        self._config_mtime: Optional[float] = None
+
+    # ------------------------------------------------------------------ #
+    # Status
+    # ------------------------------------------------------------------ #
+
+    def status_bytes(self) -> bytes:
+        with self._lock:
+            payload = {"updated_at": self.updated_at, "pid": os.getpid(), "results": self.results}
+            return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    def refresh(self, max_age: Optional[float] = None):
+        """Re-probe channels (only changed/expired ones when *max_age* is set)."""
+        results = doctor.check_all(self.config, max_age=max_age)
+        with self._lock:
+            previous, self.results = self.results, results
+            self.updated_at = time.time()
+        if self.on_change:
+            for name, r in results.items():
+                before = previous.get(name, {}).get("status")
+                if before != r["status"]:
+                    self.on_change(name, before, r["status"])
+
+    def _reload_config_if_changed(self) -> bool:
+        try:
+            mtime: Optional[float] = os.stat(self.config.config_path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._config_mtime:
+            return False
+        self._config_mtime = mtime
+        try:
+            self.config.load()
+        except (OSError, yaml.YAMLError) as e:
+            # Caught mid-write or invalid: keep the last good config and try
+            # again when the file changes next
+            stamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{stamp}] config.yaml 读取失败，继续使用上次的配置：{e}", file=sys.stderr, flush=True)
+            return False
+        return True
+
+    def _fingerprints(self) -> tuple:
+        """Inputs of every channel — binaries, files, config keys, env vars."""
+        return tuple(channel_fingerprint(ch, self.config) for ch in doctor.get_all_channels())
+
+    def _next_full_probe(self) -> float:
+        spread = self.interval * self.jitter
+        return time.monotonic() + self.interval + random.uniform(-spread, spread)
+
+    # ------------------------------------------------------------------ #
+    # Serving
+    # ------------------------------------------------------------------ #
+
+    def start_server(self):
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise OSError("Unix sockets are not supported on this platform")
+        if self.socket_path.exists():
+            if query_status(self.socket_path) is not None:
+                raise OSError(f"another daemon is already serving {self.socket_path}")
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), _Handler)
+        server.daemon_threads = True
+        server.status_bytes = self.status_bytes  # type: ignore[attr-defined]
+        os.chmod(self.socket_path, 0o600)
+        self._server = server
+        threading.Thread(target=server.serve_forever, name="status-server", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def serve_forever(self):
+        """Serve, probe, and keep the status warm until stop() is called."""
+        self.start_server()
+        try:
+            self._reload_config_if_changed()
+            self.refresh()
+            fingerprints = self._fingerprints()
+            next_full = self._next_full_probe()
+            while not self._stop.wait(self.poll):
+                config_changed = self._reload_config_if_changed()
+                if time.monotonic() >= next_full:
+                    self.refresh()
+                    fingerprints = self._fingerprints()
+                    next_full = self._next_full_probe()
+                    continue
+                current = self._fingerprints()
+                if config_changed or current != fingerprints:
+                    fingerprints = current
+                    # Unchanged channels are served from the doctor cache
+                    self.refresh(max_age=self.interval)
+        finally:
+            if self._server is not None:
+                self._server.shutdown()
+                self._server.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+
+def log_change(name: str, before: Optional[str], after: str):
+    """Default on_change hook: one log line per status transition."""
+    stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{stamp}] {name}: {before or '-'} → {after}", flush=True)
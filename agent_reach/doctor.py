@@ -1,36 +1,264 @@
 # -*- coding: utf-8 -*-
 """Environment health checker — powered by channels.
 
-Each channel knows how to check itself. Doctor just collects the results.
+Each channel knows how to check itself. Doctor runs the checks concurrently
+and collects the results.
 """
 
-from typing import Dict
-from agent_reach.config import Config
+import inspect
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
 from agent_reach.channels import get_all_channels
+from agent_reach.channels.base import Channel
+from agent_reach.config import Config
+from agent_reach.doctor_cache import DoctorCache, channel_fingerprint
+from agent_reach.probe import DEFAULT_LEVEL, HttpProbe, ProbeContext
+from agent_reach.probe_latency import LatencyHistory
+
+# Seconds a single channel check may run before it is reported as "timeout".
+DEFAULT_CHANNEL_TIMEOUT = 30.0
+
+# Shared across check_all calls so long-lived processes (MCP server, watch)
+# reuse HTTP probe results for HTTP_PROBE_WINDOW seconds.
+_http_probe = HttpProbe()
+
+
+def _accepts_probe(ch: Channel) -> bool:
+    """Channels written before ProbeContext existed only take ``config``."""
+    try:
+        params = inspect.signature(ch.check).parameters
+    except (TypeError, ValueError):
+        return False
+    return "probe" in params or any(
+        p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()
+    )
+
+
+class _RunningCheck:
+    """One channel check running in a daemon thread.
+
+    Daemon threads (rather than a ThreadPoolExecutor) keep a hung upstream
+    CLI from blocking interpreter exit once its deadline has passed.
+    """
 
+    def __init__(self, ch: Channel, config: Config, probe: ProbeContext):
+        self.channel = ch
+        self.probe = probe.scoped()
+        self.future: Future = Future()
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        threading.Thread(
+            target=self._run, args=(config,), name=f"doctor-{ch.name}", daemon=True,
+        ).start()
 
-def check_all(config: Config) -> Dict[str, dict]:
-    """Check all channels and return status dict."""
-    results = {}
-    for ch in get_all_channels():
-        status, message = ch.check(config)
-        results[ch.name] = {
-            "status": status,
-            "name": ch.description,
-            "message": message,
-            "tier": ch.tier,
-            "backends": ch.backends,
+    def _run(self, config: Config):
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            if _accepts_probe(self.channel):
+                result = self.channel.check(config, probe=self.probe)
+            else:
+                result = self.channel.check(config)
+        except BaseException as e:
+            self.finished = time.perf_counter()
+            self.future.set_exception(e)
+        else:
+            self.finished = time.perf_counter()
+            self.future.set_result(result)
+
+    def outcome(self) -> Tuple[str, str]:
+        try:
+            status, message = self.future.result()
+        except Exception as e:
+            return "error", f"检查出错：{e}"
+        return status, message
+
+    def profile(self) -> dict:
+        """Wall time and probe steps so far (a timed-out check is still running)."""
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return {
+            "elapsed_ms": round((end - self.started) * 1000, 1),
+            "steps": list(self.probe.steps),
         }
-    return results
 
 
-def format_report(results: Dict[str, dict]) -> str:
-    """Format results as a readable text report (with Rich markup)."""
+def iter_checks(
+    config: Config,
+    channels: Optional[Iterable[Channel]] = None,
+    timeout: Optional[float] = DEFAULT_CHANNEL_TIMEOUT,
+    budget: Optional[float] = None,
+    probe: Optional[ProbeContext] = None,
+    level: str = DEFAULT_LEVEL,
+) -> Iterator[Tuple[Channel, str, str, dict]]:
+    """Run channel checks concurrently, yielding ``(channel, status, message, profile)``.
+
+    Results are yielded in completion order. A check still running after
+    *timeout* seconds, or when the overall *budget* runs out, is yielded with
+    status ``"timeout"`` and left to finish in the background.
+
+    All checks share one ProbeContext, so a PATH lookup or subprocess probe
+    needed by several channels runs only once. *profile* holds the check's
+    wall time and a timed log of its probe steps. Without an explicit
+    *probe*, a fresh context is created at check depth *level*.
+    """
+    channels = list(get_all_channels() if channels is None else channels)
+    probe = probe or ProbeContext(level=level)
+    start = time.monotonic()
+    budget_deadline = start + budget if budget is not None else None
+    channel_deadline = start + timeout if timeout is not None else None
+    deadline = min(
+        (d for d in (budget_deadline, channel_deadline) if d is not None),
+        default=None,
+    )
+
+    running = [_RunningCheck(ch, config, probe) for ch in channels]
+    by_future = {run.future: run for run in running}
+    pending = set(by_future)
+    while pending:
+        wait_for = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        for future in done:
+            run = by_future[future]
+            status, message = run.outcome()
+            yield run.channel, status, message, run.profile()
+        if pending and deadline is not None and time.monotonic() >= deadline:
+            if deadline == channel_deadline:
+                message = f"检查超时（超过 {timeout:g} 秒未返回）"
+            else:
+                message = f"doctor 总时间预算（{budget:g} 秒）已用完，检查未完成"
+            for run in running:
+                if run.future in pending:
+                    run.future.cancel()
+                    yield run.channel, "timeout", message, run.profile()
+            return
+
+
+def _entry(ch: Channel, status: str, message: str, prof: Optional[dict]) -> dict:
+    entry = {
+        "status": status,
+        "name": ch.description,
+        "message": message,
+        "tier": ch.tier,
+        "backends": ch.backends,
+    }
+    if prof is not None:
+        entry["profile"] = prof
+    return entry
+
+
+def iter_results(
+    config: Config,
+    channels: Optional[Iterable[Channel]] = None,
+    timeout: Optional[float] = DEFAULT_CHANNEL_TIMEOUT,
+    budget: Optional[float] = None,
+    max_age: Optional[float] = None,
+    profile: bool = False,
+    level: str = DEFAULT_LEVEL,
+) -> Iterator[Tuple[str, dict]]:
+    """Yield ``(channel name, result entry)`` as each check resolves.
+
+    Cached results (see check_all's *max_age*) come first, then live checks
+    in completion order. Subprocess and HTTP probe timeouts are learned from
+    the latency history of earlier runs (see probe_latency). The doctor cache
+    and the latency history are saved even if the caller stops iterating
+    early.
+    """
+    channels = list(get_all_channels() if channels is None else channels)
+    latency = LatencyHistory.for_config(config)
+    probe = ProbeContext(http=_http_probe, level=level, latency=latency)
+    cache = DoctorCache.for_config(config)
+    fingerprints = {ch.name: channel_fingerprint(ch, config, probe) for ch in channels}
+
+    stale = []
+    for ch in channels:
+        hit = None
+        if max_age is not None:
+            hit = cache.lookup(ch.name, fingerprints[ch.name], max_age, level=level)
+        if hit is None:
+            stale.append(ch)
+            continue
+        prof = {"elapsed_ms": 0.0, "cached": True, "steps": []} if profile else None
+        yield ch.name, _entry(ch, *hit, prof)
+
+    if not stale:
+        return
+    try:
+        for ch, status, message, prof in iter_checks(config, stale, timeout, budget, probe):
+            cache.store(ch.name, fingerprints[ch.name], status, message, level=level)
+            yield ch.name, _entry(ch, status, message, dict(prof, cached=False) if profile else None)
+    finally:
+        cache.save()
+        latency.save()
+
+
+def check_all(
+    config: Config,
+    timeout: Optional[float] = DEFAULT_CHANNEL_TIMEOUT,
+    budget: Optional[float] = None,
+    max_age: Optional[float] = None,
+    profile: bool = False,
+    level: str = DEFAULT_LEVEL,
+) -> Dict[str, dict]:
+    """Check all channels concurrently and return status dict.
+
+    Checks run in parallel, but the returned dict keeps the registry order
+    so reports stay stable from run to run.
+
+    With *max_age* (seconds), results from the doctor cache are reused for
+    channels whose inputs are unchanged; only the rest are re-probed. Every
+    run refreshes the cache.
+
+    With *profile*, each entry also carries a ``"profile"`` dict: the check's
+    wall time (``elapsed_ms``), whether it came from the cache, and a timed
+    log of its probe steps (PATH lookups, subprocesses, HTTP requests).
+
+    *level* bounds how deep each check goes: ``"presence"`` only looks for
+    binaries, ``"config"`` also reads config and credential files, and
+    ``"live"`` (the default) also runs upstream CLIs and calls APIs. Cached
+    results from a deeper run satisfy a shallower one, not the other way round.
+    """
+    channels = get_all_channels()
+    resolved = dict(iter_results(config, channels, timeout, budget, max_age, profile, level))
+    return {ch.name: resolved[ch.name] for ch in channels}
+
+
+def _escape(text: str) -> str:
+    """Escape Rich markup in *text*; a no-op when rich is not installed."""
     try:
         from rich.markup import escape
     except ImportError:
-        escape = lambda x: x
+        return text
+    return escape(text)
+
 
+def format_profile(results: Dict[str, dict]) -> str:
+    """Format per-channel timings from ``check_all(..., profile=True)``, slowest first."""
+    rows = sorted(
+        ((key, r["profile"]) for key, r in results.items() if "profile" in r),
+        key=lambda item: item[1]["elapsed_ms"],
+        reverse=True,
+    )
+    lines = ["", "[bold]耗时分布（毫秒）：[/bold]"]
+    for key, prof in rows:
+        suffix = "（缓存）" if prof.get("cached") else ""
+        lines.append(f"  {prof['elapsed_ms']:>8.1f}  {key}{suffix}")
+        for step in prof["steps"]:
+            if step.get("cached"):
+                continue
+            detail = f"{step['step']} {step['target']}"
+            if step.get("first_byte_ms") is not None:
+                detail += f"（首字节 {step['first_byte_ms']:.1f}）"
+            if step.get("error"):
+                detail += f"：{step['error']}"
+            lines.append(f"  {step['ms']:>8.1f}    · {_escape(detail)}")
+    return "\n".join(lines)
+
+
+def format_report(results: Dict[str, dict]) -> str:
+    """Format results as a readable text report (with Rich markup)."""
     lines = []
     lines.append("[bold cyan]Agent Reach 状态[/bold cyan]")
     lines.append("[cyan]" + "=" * 40 + "[/cyan]")
@@ -43,10 +271,10 @@ def format_report(results: Dict[str, dict]) -> str:
     lines.append("[bold]✅ 装好即用：[/bold]")
     for key, r in results.items():
         if r["tier"] == 0:
-            name_msg = f"[bold]{escape(r['name'])}[/bold] — {escape(r['message'])}"
+            name_msg = f"[bold]{_escape(r['name'])}[/bold] — {_escape(r['message'])}"
             if r["status"] == "ok":
                 lines.append(f"  [green]✅[/green] {name_msg}")
-            elif r["status"] == "warn":
+            elif r["status"] in ("warn", "timeout"):
                 lines.append(f"  [yellow][!][/yellow]  {name_msg}")
             elif r["status"] in ("off", "error"):
                 lines.append(f"  [red][X][/red]  {name_msg}")
@@ -59,7 +287,7 @@ def format_report(results: Dict[str, dict]) -> str:
         lines.append("")
         lines.append("[bold]可选渠道（已安装）：[/bold]")
         for key, r in tier1_active.items():
-            name_msg = f"[bold]{escape(r['name'])}[/bold] — {escape(r['message'])}"
+            name_msg = f"[bold]{_escape(r['name'])}[/bold] — {_escape(r['message'])}"
             lines.append(f"  [green]✅[/green] {name_msg}")
 
     # Tier 2 — optional complex setup
@@ -71,7 +299,7 @@ def format_report(results: Dict[str, dict]) -> str:
             lines.append("")
             lines.append("[bold]可选渠道（已安装）：[/bold]")
         for key, r in tier2_active.items():
-            name_msg = f"[bold]{escape(r['name'])}[/bold] — {escape(r['message'])}"
+            name_msg = f"[bold]{_escape(r['name'])}[/bold] — {_escape(r['message'])}"
             lines.append(f"  [green]✅[/green] {name_msg}")
 
     lines.append("")
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Persistent cache for doctor results.
+
+Stores each channel's ``(status, message)`` in ~/.agent-reach/doctor-cache.json
+together with a fingerprint of everything the check depends on: resolved
+binary paths and mtimes, watched files, config keys and env vars. A cached
+result is reused only while its fingerprint still matches and it is younger
+than the allowed age. Non-ok results expire sooner so that a fix (e.g.
+logging in) shows up quickly. Each entry also records the check depth it
+was produced at, and only satisfies requests of the same or a shallower
+depth.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from agent_reach.config import Config
+from agent_reach.probe import DEFAULT_LEVEL, LEVELS, ProbeContext
+
+CACHE_FILENAME = "doctor-cache.json"
+CACHE_VERSION = 1
+
+# Default max age (seconds) for `doctor --cached`
+DEFAULT_MAX_AGE = 600.0
+# Upper bound on the age of a cached non-ok result, whatever max_age says
+NEGATIVE_TTL = 120.0
+# Statuses that describe the probe itself rather than the channel — never cached
+UNCACHEABLE_STATUSES = {"timeout"}
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(repr(value).encode("utf-8")).hexdigest()[:16]
+
+
+def channel_fingerprint(ch, config: Config, probe: Optional[ProbeContext] = None) -> str:
+    """Hash the inputs *ch* declares so a change to any of them is detected.
+
+    Config and env values are hashed individually so no secret ends up in the
+    cache file.
+    """
+    probe = probe or ProbeContext()
+    binaries = {}
+    for name in getattr(ch, "probe_binaries", []):
+        path = probe.which(name)
+        binaries[name] = [path, _mtime(path) if path else None]
+    files = {
+        path: _mtime(os.path.expanduser(path))
+        for path in getattr(ch, "probe_files", [])
+    }
+    config_values = {key: _digest(config.get(key)) for key in getattr(ch, "config_keys", [])}
+    env_values = {var: _digest(os.environ.get(var)) for var in getattr(ch, "env_vars", [])}
+    payload = json.dumps(
+        {
+            "binaries": binaries,
+            "files": files,
+            "config": config_values,
+            "env": env_values,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DoctorCache:
+    """Channel check results keyed by channel name, persisted as JSON."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, dict] = {}
+        self.load()
+
+    @classmethod
+    def for_config(cls, config: Config) -> "DoctorCache":
+        return cls(config.config_dir / CACHE_FILENAME)
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") != CACHE_VERSION:
+            data = {}
+        self.entries = data.get("channels") or {}
+
+    def save(self):
+        """Write the cache atomically. Failures are ignored — it is only a cache."""
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": CACHE_VERSION, "channels": self.entries},
+                    f, ensure_ascii=False, indent=2,
+                )
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def lookup(
+        self, name: str, fingerprint: str, max_age: float, now: Optional[float] = None,
+        level: str = DEFAULT_LEVEL,
+    ) -> Optional[Tuple[str, str]]:
+        """Return the cached ``(status, message)`` if still valid, else None."""
+        entry = self.entries.get(name)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        if LEVELS.index(entry.get("level", DEFAULT_LEVEL)) < LEVELS.index(level):
+            return None
+        ttl = max_age if entry.get("status") == "ok" else min(max_age, NEGATIVE_TTL)
+        age = (time.time() if now is None else now) - entry.get("checked_at", 0)
+        if not 0 <= age <= ttl:
+            return None
+        return entry["status"], entry["message"]
+
+    def store(
+        self, name: str, fingerprint: str, status: str, message: str,
+        now: Optional[float] = None, level: str = DEFAULT_LEVEL,
+    ):
+        if status in UNCACHEABLE_STATUSES:
+            self.entries.pop(name, None)
+            return
+        self.entries[name] = {
+            "status": status,
+            "message": message,
+            "fingerprint": fingerprint,
+            "level": level,
+            "checked_at": time.time() if now is None else now,
+        }
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""Local HTML → Markdown extraction — a readability-style fallback to Jina Reader.
+
+The page is parsed with ``html.parser`` into a small element tree. Scripts,
+styles and forms are dropped while parsing. Navigation, headers, footers,
+sidebars and anything whose class/id says "comments", "share", "related"…
+is pruned. The element holding the main content is then picked:
+
+  1. the largest ``<article>`` / ``<main>`` / ``role="main"`` with enough text;
+  2. otherwise the parent collecting the most paragraph score (text length
+     and commas, as in Readability), discounted by its link density;
+  3. otherwise ``<body>``.
+
+It is rendered as Markdown under the same ``Title: / URL Source: /
+Markdown Content:`` preamble Jina Reader uses, so callers can treat both
+alike. No JavaScript runs: pages that build their content client-side come
+out nearly empty, and ``Extracted.ok`` is False so the caller can go to
+Jina instead.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, NamedTuple, Optional, Union
+from urllib.parse import urljoin
+
+# Below this many characters of content text the extraction is not trusted
+MIN_CONTENT_CHARS = 250
+# Above this share of text inside links the "content" is a link list
+MAX_LINK_DENSITY = 0.5
+
+_VOID = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+# Dropped with everything inside them while parsing
+_SKIP = {
+    "script", "style", "noscript", "template", "svg", "math", "iframe", "canvas",
+    "form", "button", "select", "textarea", "object", "dialog",
+}
+# Page chrome, pruned before the content is picked
+_CHROME = {"nav", "header", "footer", "aside", "menu"}
+_NEGATIVE = {
+    "ad", "ads", "advert", "banner", "breadcrumb", "breadcrumbs", "comment", "comments",
+    "cookie", "footer", "masthead", "menu", "nav", "navbar", "newsletter", "popup",
+    "promo", "related", "share", "sidebar", "social", "sponsor", "subscribe", "toc",
+}
+_POSITIVE = {"article", "body", "content", "entry", "main", "post", "story", "text"}
+_CONTAINERS = {"article", "main", "section", "div", "td", "body"}
+_INLINE = {
+    "a", "abbr", "b", "bdi", "bdo", "cite", "code", "data", "del", "dfn", "em", "i",
+    "img", "ins", "kbd", "label", "mark", "q", "s", "samp", "small", "span", "strong",
+    "sub", "sup", "time", "u", "var", "wbr", "br", "font",
+}
+# Start tags that implicitly close an open element of the same kind
+_AUTOCLOSE = {"p": {"p"}, "li": {"li"}, "dt": {"dt", "dd"}, "dd": {"dt", "dd"},
+              "tr": {"tr"}, "td": {"td", "th"}, "th": {"td", "th"}, "option": {"option"}}
+_BLOCK_OPENERS = {
+    "address", "article", "aside", "blockquote", "div", "dl", "figure", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "nav", "ol", "p", "pre",
+    "section", "table", "ul",
+}
+
+_WS = re.compile(r"\s+")
+_TOKENS = re.compile(r"[\s_\-]+")
+
+
+class Extracted(NamedTuple):
+    """Result of extract(): the Markdown document and how much content it found."""
+
+    title: str
+    markdown: str
+    content_chars: int
+    link_density: float
+
+    @property
+    def ok(self) -> bool:
+        """Enough non-link text to trust this over Jina Reader."""
+        return self.content_chars >= MIN_CONTENT_CHARS and self.link_density <= MAX_LINK_DENSITY
+
+
+class _Node:
+    __slots__ = ("tag", "attrs", "children", "parent", "_text")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["_Node"]):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List[Union["_Node", str]] = []
+        self.parent = parent
+        self._text: Optional[str] = None
+
+    def text(self) -> str:
+        # Walked with an explicit stack, here and below: unclosed tags can
+        # nest a page deeper than Python's recursion limit
+        stack = [(self, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if node._text is not None:
+                continue
+            if children_done:
+                node._text = "".join(c if isinstance(c, str) else c._text or "" for c in node.children)
+            else:
+                stack.append((node, True))
+                stack.extend((c, False) for c in node.children if isinstance(c, _Node))
+        return self._text or ""
+
+    def text_len(self) -> int:
+        return len(_WS.sub(" ", self.text()).strip())
+
+    def iter(self):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(c for c in reversed(node.children) if isinstance(c, _Node))
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#root", {}, None)
+        self.cur = self.root
+        self.skip_depth = 0
+        self.title = ""
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth:
+            if tag in _SKIP:
+                self.skip_depth += 1
+            return
+        if tag in _SKIP:
+            self.skip_depth = 1
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        closes = _AUTOCLOSE.get(tag)
+        if tag in _BLOCK_OPENERS:
+            # A block start ends an open paragraph
+            closes = (closes or set()) | {"p"}
+        if closes:
+            # Walk up through inline ancestors; the root ("#root") stops the walk
+            ancestor: Optional[_Node] = self.cur
+            while ancestor is not None and ancestor.tag not in closes and ancestor.tag in _INLINE | {"p"}:
+                ancestor = ancestor.parent
+            if ancestor is not None and ancestor.tag in closes and ancestor.parent is not None:
+                self.cur = ancestor.parent
+        node = _Node(tag, {k: v or "" for k, v in attrs}, self.cur)
+        self.cur.children.append(node)
+        if tag not in _VOID:
+            self.cur = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        parent = self.cur.parent
+        if tag not in _VOID and not self.skip_depth and self.cur.tag == tag and parent is not None:
+            self.cur = parent
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            if tag in _SKIP:
+                self.skip_depth -= 1
+            return
+        if tag == "title":
+            self._in_title = False
+            return
+        node: Optional[_Node] = self.cur
+        while node is not None and node.tag != tag:
+            node = node.parent
+        # An end tag with no open element walks past the root and is ignored
+        if node is not None and node.parent is not None:
+            self.cur = node.parent
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self._in_title:
+            self.title += data
+            return
+        self.cur.children.append(data)
+
+
+def _is_chrome(node: _Node, in_article: bool) -> bool:
+    if node.tag in _CHROME:
+        # An article's own <header> holds its title and byline
+        return not (in_article and node.tag == "header")
+    if node.attrs.get("role") in ("navigation", "banner", "contentinfo", "complementary"):
+        return True
+    if node.attrs.get("aria-hidden") == "true" or "hidden" in node.attrs:
+        return True
+    tokens = set(_TOKENS.split(f"{node.attrs.get('class', '')} {node.attrs.get('id', '')}".lower()))
+    if not tokens & _NEGATIVE or tokens & _POSITIVE:
+        return False
+    # Layout wrappers get names like "wy-nav-content"; keep anything that
+    # holds the page's heading or main landmark
+    return not any(
+        n.tag in ("h1", "article", "main") or n.attrs.get("role") == "main" for n in node.iter()
+    )
+
+
+def _prune(root: _Node, in_article: bool = False):
+    stack = [(root, in_article)]
+    while stack:
+        node, in_article = stack.pop()
+        in_article = in_article or node.tag in ("article", "main")
+        node.children = [
+            c for c in node.children if isinstance(c, str) or not _is_chrome(c, in_article)
+        ]
+        stack.extend((c, in_article) for c in node.children if isinstance(c, _Node))
+
+
+def _link_density(node: _Node) -> float:
+    total = node.text_len()
+    if not total:
+        return 1.0
+    linked = sum(a.text_len() for a in node.iter() if a.tag == "a")
+    return linked / total
+
+
+def _pick_content(root: _Node) -> _Node:
+    landmarks = [
+        n for n in root.iter()
+        if n.tag in ("article", "main") or n.attrs.get("role") == "main"
+    ]
+    landmarks = [n for n in landmarks if n.text_len() >= MIN_CONTENT_CHARS]
+    if landmarks:
+        return max(landmarks, key=_Node.text_len)
+
+    scores: Dict[int, float] = {}
+    nodes: Dict[int, _Node] = {}
+    for p in root.iter():
+        if p.tag not in ("p", "pre", "td", "blockquote"):
+            continue
+        length = p.text_len()
+        if length < 25:
+            continue
+        score = 1 + p.text().count(",") + p.text().count("，") + min(length // 100, 3)
+        parent = p.parent
+        for share in (1.0, 0.5):
+            if parent is None or parent is root:
+                break
+            if parent.tag in _CONTAINERS:
+                scores[id(parent)] = scores.get(id(parent), 0) + score * share
+                nodes[id(parent)] = parent
+            parent = parent.parent
+    if scores:
+        best = max(scores, key=lambda k: scores[k] * (1 - _link_density(nodes[k])))
+        return nodes[best]
+    body = next((n for n in root.iter() if n.tag == "body"), None)
+    return body or root
+
+
+class _Markdown:
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def _url(self, href: str) -> str:
+        return urljoin(self.base_url, href.strip()) if self.base_url else href.strip()
+
+    def inline(self, node: _Node) -> str:
+        parts = []
+        for c in node.children:
+            if isinstance(c, str):
+                parts.append(_WS.sub(" ", c))
+                continue
+            tag = c.tag
+            if tag == "br":
+                parts.append("\n")
+            elif tag == "img":
+                src = c.attrs.get("src") or c.attrs.get("data-src")
+                if src and not src.startswith("data:"):
+                    parts.append(f"![{c.attrs.get('alt', '').strip()}]({self._url(src)})")
+            elif tag == "a":
+                text = self.inline(c).strip()
+                href = c.attrs.get("href", "")
+                if text and href and not href.startswith(("#", "javascript:")):
+                    parts.append(f"[{text}]({self._url(href)})")
+                else:
+                    parts.append(text)
+            elif tag in ("strong", "b"):
+                text = self.inline(c).strip()
+                parts.append(f"**{text}**" if text else "")
+            elif tag in ("em", "i"):
+                text = self.inline(c).strip()
+                parts.append(f"*{text}*" if text else "")
+            elif tag in ("code", "kbd", "samp"):
+                text = _WS.sub(" ", c.text()).strip()
+                parts.append(f"`{text}`" if text else "")
+            else:
+                parts.append(self.inline(c))
+        return "".join(parts)
+
+    def _paragraph(self, text: str) -> str:
+        return "\n".join(line.strip() for line in text.split("\n")).strip()
+
+    def block(self, node: _Node, tight: bool = False) -> str:
+        """Render *node*'s children; *tight* joins blocks with single newlines (list items)."""
+        blocks: List[str] = []
+        run = _Node("#run", {}, None)
+
+        def flush():
+            if run.children:
+                text = self._paragraph(self.inline(run))
+                if text:
+                    blocks.append(text)
+                run.children = []
+
+        for c in node.children:
+            if isinstance(c, str) or c.tag in _INLINE:
+                run.children.append(c)
+                continue
+            flush()
+            text = self.element(c)
+            if text:
+                blocks.append(text)
+        flush()
+        return ("\n" if tight else "\n\n").join(blocks)
+
+    def element(self, node: _Node) -> str:
+        tag = node.tag
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            text = _WS.sub(" ", self.inline(node)).strip()
+            return f"{'#' * int(tag[1])} {text}" if text else ""
+        if tag == "p":
+            return self._paragraph(self.inline(node))
+        if tag == "pre":
+            code = node.text().strip("\n")
+            return f"```\n{code}\n```" if code.strip() else ""
+        if tag == "hr":
+            return "---"
+        if tag in ("ul", "ol"):
+            return self._list(node, ordered=tag == "ol")
+        if tag == "blockquote":
+            inner = self.block(node)
+            return "\n".join(f"> {line}" if line else ">" for line in inner.split("\n"))
+        if tag == "table":
+            return self._table(node)
+        if tag == "dt":
+            text = self.inline(node).strip()
+            return f"**{text}**" if text else ""
+        return self.block(node)
+
+    def _list(self, node: _Node, ordered: bool) -> str:
+        lines = []
+        n = 0
+        for li in node.children:
+            if not isinstance(li, _Node) or li.tag != "li":
+                continue
+            n += 1
+            marker = f"{n}. " if ordered else "- "
+            body = self.block(li, tight=True)
+            if not body:
+                continue
+            first, *rest = body.split("\n")
+            lines.append(marker + first)
+            lines.extend((" " * len(marker) + line) if line else "" for line in rest)
+        return "\n".join(lines)
+
+    def _table(self, node: _Node) -> str:
+        rows = []
+        for tr in node.iter():
+            if tr.tag != "tr":
+                continue
+            cells = [
+                _WS.sub(" ", self.inline(c)).strip().replace("|", "\\|")
+                for c in tr.children if isinstance(c, _Node) and c.tag in ("td", "th")
+            ]
+            if cells:
+                rows.append(cells)
+        if not rows:
+            return ""
+        width = max(len(r) for r in rows)
+        rows = [r + [""] * (width - len(r)) for r in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + " --- |" * width]
+        lines.extend("| " + " | ".join(r) + " |" for r in rows[1:])
+        return "\n".join(lines)
+
+
+def extract(html: str, url: str = "") -> Extracted:
+    """Extract the main content of *html* as Markdown; links resolve against *url*."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    root = builder.root
+    title = _WS.sub(" ", builder.title).strip()
+    _prune(root)
+    content = _pick_content(root)
+    density = _link_density(content)
+
+    body = _Markdown(url).block(content)
+    body = re.sub(r"\n{3,}", "\n\n", body).strip()
+    if not title:
+        h1 = next((n for n in root.iter() if n.tag == "h1"), None)
+        title = _WS.sub(" ", h1.text()).strip() if h1 else ""
+    markdown = f"Title: {title}\n\nURL Source: {url}\n\nMarkdown Content:\n{body}\n"
+    return Extracted(title, markdown, content.text_len(), round(density, 3))
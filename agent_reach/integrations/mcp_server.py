@@ -14,6 +14,7 @@ import sys
 
 from agent_reach.config import Config
 from agent_reach.core import AgentReach
+from agent_reach.doctor_cache import DEFAULT_MAX_AGE
 
 try:
     from mcp.server import Server
@@ -45,7 +46,7 @@ def create_server():
     async def call_tool(name: str, arguments: dict):
         try:
             if name == "get_status":
-                result = eyes.doctor_report()
+                result = eyes.doctor_report(max_age=DEFAULT_MAX_AGE)
             else:
                 result = f"Unknown tool: {name}"
 
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""Probe context — shared state for one doctor run.
+
+Several channels probe the same things: five of them run
+`mcporter config list`, and YouTube and Bilibili both look up yt-dlp.
+A ProbeContext memoizes PATH lookups and subprocess output for the
+lifetime of one check_all run, with single-flight semantics so that
+concurrent checks asking for the same probe share one call. HTTP
+reachability probes go through an HttpProbe, which can outlive a run.
+
+Every probe is timed. A context scoped to one channel keeps a step log
+(PATH lookup, subprocess runtime, HTTP first-byte/total) that
+`doctor --profile` reports.
+
+The context also carries the check depth (``level``) so each channel can
+stop after the cheapest probes that answer the question, and optionally a
+LatencyHistory from which subprocess and HTTP timeouts are derived.
+"""
+
+import copy
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    import urllib.request
+
+    from agent_reach.probe_latency import LatencyHistory
+
+T = TypeVar("T")
+
+# Check depth, cheapest first:
+#   presence — binaries on PATH / importable modules only
+#   config   — also read config and credential files (no spawning, no network)
+#   live     — also run upstream CLIs and call APIs
+LEVELS = ("presence", "config", "live")
+DEFAULT_LEVEL = "live"
+
+# Seconds an HTTP probe may take; reachability checks should fail fast
+HTTP_PROBE_TIMEOUT = 5
+# Seconds an HTTP probe result is remembered by a shared HttpProbe
+HTTP_PROBE_WINDOW = 30.0
+
+
+class _SingleFlight:
+    """Run a function once per key; concurrent callers share its outcome.
+
+    Completed outcomes are remembered for *ttl* seconds, or for the
+    lifetime of the object when *ttl* is None.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (expires_at or None, future)
+        self._entries: Dict[Hashable, Tuple[Optional[float], Future]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        return self.call(key, fn)[0]
+
+    def call(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Like do(), but also report whether this call ran *fn* itself."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                future, owner = entry[1], False
+            else:
+                future, owner = Future(), True
+                self._entries[key] = (None, future)
+        if owner:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            if self.ttl is not None:
+                with self._lock:
+                    self._entries[key] = (time.monotonic() + self.ttl, future)
+        return future.result(), owner
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class HttpProbeResult(NamedTuple):
+    """Outcome of one HTTP probe. *error* is None when the request succeeded."""
+
+    status: Optional[int]
+    body: bytes
+    error: Optional[str]
+    first_byte_ms: Optional[float] = None  # until response headers arrived
+    total_ms: float = 0.0                  # including reading the body
+    cached: bool = False                   # served from the HttpProbe window
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8"))
+
+
+class HttpProbe:
+    """Single-flight HTTP probes for API-backed channels.
+
+    Concurrent probes of the same URL share one request, and results are
+    remembered for *window* seconds so repeated checks (doctor, watch, MCP
+    get_status) skip redundant round-trips. Probes never raise: failures
+    come back as an HttpProbeResult with *error* set.
+    """
+
+    def __init__(self, window: float = HTTP_PROBE_WINDOW, timeout: float = HTTP_PROBE_TIMEOUT):
+        self.timeout = timeout
+        self._flights = _SingleFlight(ttl=window)
+
+    def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        opener: Optional["urllib.request.OpenerDirector"] = None,
+        timeout: Optional[float] = None,
+    ) -> HttpProbeResult:
+        """GET *url* (via *opener* if given) and return the probe result.
+
+        *timeout* overrides the probe's default for this request.
+        """
+        result, ran = self._flights.call(
+            url, lambda: self._fetch(url, headers or {}, opener, timeout or self.timeout),
+        )
+        return result if ran else result._replace(cached=True)
+
+    def _fetch(self, url, headers, opener, timeout) -> HttpProbeResult:
+        # Imported here: urllib.request pulls in http.client/email/ssl, which
+        # commands that never probe over HTTP shouldn't pay for
+        import urllib.request
+
+        req = urllib.request.Request(url, headers=headers)
+        open_url = opener.open if opener is not None else urllib.request.urlopen
+        start = time.perf_counter()
+        first_byte = None
+        try:
+            with open_url(req, timeout=timeout) as resp:
+                first_byte = _ms(time.perf_counter() - start)
+                body = resp.read()
+                return HttpProbeResult(
+                    getattr(resp, "status", None), body, None,
+                    first_byte, _ms(time.perf_counter() - start),
+                )
+        except Exception as e:
+            return HttpProbeResult(
+                getattr(e, "code", None), b"", str(e) or type(e).__name__,
+                first_byte, _ms(time.perf_counter() - start),
+            )
+
+
+class ProbeContext:
+    """Memoized, thread-safe PATH lookups, subprocess and HTTP probes.
+
+    *http* may be a long-lived HttpProbe so HTTP results outlive one run.
+    *level* is the check depth (see LEVELS); checks call ``allows()`` before
+    doing anything more expensive than a PATH lookup.
+    With a *latency* history, the timeouts call sites pass to ``run()`` and
+    the HttpProbe default become cold-start defaults, tightened from the
+    observed latencies; every probe is recorded back into the history.
+    ``steps`` logs every probe made through this context, with timings.
+    """
+
+    def __init__(
+        self,
+        http: Optional[HttpProbe] = None,
+        level: str = DEFAULT_LEVEL,
+        latency: Optional["LatencyHistory"] = None,
+    ):
+        if level not in LEVELS:
+            raise ValueError(f"unknown check level {level!r}, expected one of {LEVELS}")
+        self._flights = _SingleFlight()
+        self.http = http or HttpProbe()
+        self.level = level
+        self.latency = latency
+        self.steps: List[dict] = []
+
+    def allows(self, level: str) -> bool:
+        """True if this run's depth includes probes of *level*."""
+        return LEVELS.index(self.level) >= LEVELS.index(level)
+
+    def scoped(self) -> "ProbeContext":
+        """Return a view sharing this context's memo but with its own step log."""
+        view = copy.copy(self)
+        view.steps = []
+        return view
+
+    def _once(self, key: Hashable, fn: Callable[[], T], step: dict) -> T:
+        """Run *fn* once per *key*; concurrent callers wait for the first one.
+
+        Exceptions are memoized too, so every caller sees the same failure.
+        The call is appended to ``steps`` as *step* plus its timing.
+        """
+        start = time.perf_counter()
+        try:
+            value, ran = self._flights.call(key, fn)
+        except BaseException as e:
+            step["error"] = type(e).__name__
+            raise
+        finally:
+            step["ms"] = _ms(time.perf_counter() - start)
+            self.steps.append(step)
+        step["cached"] = not ran
+        return value
+
+    def which(self, name: str) -> Optional[str]:
+        """Memoized ``shutil.which``."""
+        return self._once(
+            ("which", name), lambda: shutil.which(name),
+            {"step": "which", "target": name},
+        )
+
+    def read_text(self, path: str) -> Optional[str]:
+        """Memoized read of a small text file (``~`` expanded); None if unreadable."""
+        full = os.path.expanduser(path)
+
+        def read() -> Optional[str]:
+            try:
+                with open(full, "r", encoding="utf-8", errors="replace") as f:
+                    return f.read()
+            except OSError:
+                return None
+
+        return self._once(("read", full), read, {"step": "read", "target": path})
+
+    def run(self, args: Sequence[str], timeout: float) -> subprocess.CompletedProcess:
+        """Memoized ``subprocess.run`` capturing text output.
+
+        Identical commands within one run are spawned only once. A
+        ``subprocess.TimeoutExpired`` (or any other error) is re-raised to
+        every caller. *timeout* is the cold-start default when a latency
+        history is attached.
+        """
+        args = list(args)
+        target = " ".join([os.path.basename(args[0])] + args[1:]) if args else ""
+        limit = self.latency.timeout(target, timeout) if self.latency else timeout
+
+        def spawn() -> subprocess.CompletedProcess:
+            start = time.perf_counter()
+            try:
+                result = subprocess.run(
+                    args, capture_output=True,
+                    encoding="utf-8", errors="replace", timeout=limit,
+                )
+            except subprocess.TimeoutExpired:
+                self._observe(target, limit)
+                raise
+            self._observe(target, time.perf_counter() - start)
+            return result
+
+        return self._once(
+            ("run", tuple(args)), spawn,
+            {"step": "run", "target": target, "timeout": limit},
+        )
+
+    def _observe(self, key: str, seconds: float):
+        if self.latency is not None:
+            self.latency.record(key, seconds)
+
+    def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        opener: Optional["urllib.request.OpenerDirector"] = None,
+    ) -> HttpProbeResult:
+        """Probe *url* through the shared HttpProbe and log the timing."""
+        limit = self.latency.timeout(url, self.http.timeout) if self.latency else None
+        result = self.http.fetch(url, headers=headers, opener=opener, timeout=limit)
+        if not result.cached:
+            self._observe(url, result.total_ms / 1000)
+        step = {
+            "step": "http",
+            "target": url,
+            "ms": 0.0 if result.cached else result.total_ms,
+            "cached": result.cached,
+            "first_byte_ms": result.first_byte_ms,
+            "total_ms": result.total_ms,
+            "status": result.status,
+            "timeout": limit or self.http.timeout,
+        }
+        if result.error is not None:
+            step["error"] = result.error
+        self.steps.append(step)
+        return result
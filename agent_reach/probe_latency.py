@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Rolling latency history for doctor probes.
+
+Call sites pass a cold-start default timeout (5 s for `gh auth status`,
+15 s for `mcporter list`, ...). Once a probe has MIN_SAMPLES observations,
+its timeout becomes the observed p99 times SAFETY_FACTOR, clamped to
+[MIN_TIMEOUT, default]: a healthy host stops waiting 10 s for a tool that
+always answers in 200 ms, and a slow host never waits less than it used to
+allow before the probe is given up.
+
+History is kept per probe (e.g. "gh auth status", or a probe URL) in
+~/.agent-reach/probe-latency.json. A probe that times out is recorded at
+its timeout, so a tool that got slower pushes its own timeout back up.
+"""
+
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from agent_reach.config import Config
+
+HISTORY_FILENAME = "probe-latency.json"
+HISTORY_VERSION = 1
+
+# Samples kept per probe (oldest dropped first)
+HISTORY_SIZE = 50
+# Samples needed before the learned timeout replaces the default
+MIN_SAMPLES = 5
+# Learned timeout = p99 × SAFETY_FACTOR …
+SAFETY_FACTOR = 3.0
+# … but never below this many seconds
+MIN_TIMEOUT = 2.0
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyHistory:
+    """Per-probe latency samples, persisted as JSON (in memory if *path* is None)."""
+
+    def __init__(self, path: Optional[Path] = None, size: int = HISTORY_SIZE):
+        self.path = Path(path) if path is not None else None
+        self.size = size
+        self.samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def for_config(cls, config: Config) -> "LatencyHistory":
+        return cls(config.config_dir / HISTORY_FILENAME)
+
+    def load(self):
+        data: dict = {}
+        if self.path is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        if data.get("version") != HISTORY_VERSION:
+            data = {}
+        self.samples = {
+            key: [float(s) for s in values][-self.size:]
+            for key, values in (data.get("probes") or {}).items()
+            if isinstance(values, list)
+        }
+
+    def save(self):
+        """Write the history atomically if it changed. Failures are ignored."""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            payload = {"version": HISTORY_VERSION, "probes": dict(self.samples)}
+            self._dirty = False
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def record(self, key: str, seconds: float):
+        with self._lock:
+            samples = self.samples.setdefault(key, [])
+            samples.append(round(seconds, 3))
+            del samples[:-self.size]
+            self._dirty = True
+
+    def p99(self, key: str) -> Optional[float]:
+        """Observed p99 latency of *key* in seconds, or None before MIN_SAMPLES."""
+        with self._lock:
+            samples = list(self.samples.get(key, []))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return _percentile(samples, 0.99)
+
+    def timeout(self, key: str, default: float) -> float:
+        """Timeout for the next *key* probe; *default* until there is history."""
+        p99 = self.p99(key)
+        if p99 is None:
+            return default
+        return min(default, max(MIN_TIMEOUT, p99 * SAFETY_FACTOR))
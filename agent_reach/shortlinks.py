@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""Short-link canonicalization for share links.
+
+Share links (b23.tv, xhslink.com, v.douyin.com, t.co) are expanded by
+following their redirects with HEAD requests — the target page itself is
+never downloaded — and share/tracking parameters are stripped from the
+result, so every downstream tool and cache sees the same canonical URL.
+
+Resolved ``short -> canonical`` mappings are kept in
+~/.agent-reach/shortlinks.json with a TTL, so a share link that is passed
+around repeatedly costs one network round-trip in total.
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from agent_reach.channels.router import host_matches, split_url
+from agent_reach.config import Config
+from agent_reach.transport import build_opener
+
+CACHE_FILENAME = "shortlinks.json"
+CACHE_VERSION = 1
+
+# Hosts whose URLs are only redirects to the real page
+SHORT_HOSTS = ["b23.tv", "xhslink.com", "v.douyin.com", "t.co"]
+
+# Seconds a resolved mapping is reused
+DEFAULT_TTL = 7 * 24 * 3600.0
+# XiaoHongShu targets carry an xsec_token that expires
+_HOST_TTL = {"xhslink.com": 24 * 3600.0}
+# Entries kept on disk (oldest dropped first)
+MAX_ENTRIES = 5000
+
+MAX_REDIRECTS = 5
+_TIMEOUT = 10
+_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+# Query parameters that mark a link as shared on any site, never the content
+TRACKING_PARAMS = {
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+    "fbclid", "gclid",
+}
+# Per-host additions, matched like router hosts (subdomains included).
+# Names such as ``mid`` or ``timestamp`` only mean "share metadata" on the
+# hosts listed here; elsewhere they may select the content and are kept.
+_HOST_TRACKING_PARAMS = {
+    "bilibili.com": {
+        "spm_id_from", "from_spmid", "vd_source", "share_source", "share_medium",
+        "share_plat", "share_session_id", "share_tag", "share_from", "unique_k",
+        "bbid", "buvid", "mid", "up_id", "plat_id", "timestamp",
+    },
+    # xsec_token is required to open the note and is kept
+    "xiaohongshu.com": {
+        "xsec_source", "apptime", "appuid", "author_share", "share_id",
+        "shareRedId", "share_from_user_hidden", "exSource", "app_platform",
+        "app_version", "wechatWid", "wechatOrigin",
+    },
+    "x.com": {"s", "t", "ref_src", "ref_url"},
+    "twitter.com": {"s", "t", "ref_src", "ref_url"},
+}
+# Hosts whose query string is entirely share metadata
+_DROP_QUERY_HOSTS = ["douyin.com", "iesdouyin.com"]
+
+
+def is_short_link(url: str) -> bool:
+    return host_matches(split_url(url)[0], SHORT_HOSTS)
+
+
+def strip_tracking(url: str) -> str:
+    """Drop share/tracking query parameters, keeping everything else as is."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host_matches(host, _DROP_QUERY_HOSTS):
+        query = ""
+    else:
+        drop = set(TRACKING_PARAMS)
+        for suffix, extra in _HOST_TRACKING_PARAMS.items():
+            if host_matches(host, [suffix]):
+                drop |= extra
+        pairs = parse_qsl(parts.query, keep_blank_values=True)
+        kept = [(k, v) for k, v in pairs if k not in drop]
+        query = parts.query if len(kept) == len(pairs) else urlencode(kept)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, parts.fragment))
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Surface redirects as responses instead of following them."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_opener = build_opener(_NoRedirect)
+
+
+def _next_hop(url: str, timeout: float) -> Optional[str]:
+    """Return the redirect target of *url* without downloading the target."""
+    for method in ("HEAD", "GET"):
+        req = urllib.request.Request(url, method=method, headers={"User-Agent": _UA})
+        try:
+            with _opener.open(req, timeout=timeout):
+                return None  # not a redirect
+        except urllib.error.HTTPError as e:
+            location = e.headers.get("Location") if e.headers else None
+            if 300 <= e.code < 400 and location:
+                return urljoin(url, location)
+            if method == "HEAD" and e.code in (403, 404, 405, 501):
+                continue  # some shorteners refuse HEAD; retry with GET
+            return None
+    return None
+
+
+def expand(url: str, timeout: float = _TIMEOUT) -> str:
+    """Follow redirects until leaving the short-link hosts. Raises on network errors."""
+    current = url
+    for _ in range(MAX_REDIRECTS):
+        if not is_short_link(current):
+            break
+        target = _next_hop(current, timeout)
+        if target is None:
+            break
+        current = target
+    return current
+
+
+class ShortLinkResolver:
+    """Expand short links, with a persistent ``short -> canonical`` cache."""
+
+    def __init__(self, path: Optional[Path] = None, ttl: float = DEFAULT_TTL):
+        self.path = Path(path) if path is not None else None
+        self.ttl = ttl
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def for_config(cls, config: Config) -> "ShortLinkResolver":
+        return cls(config.config_dir / CACHE_FILENAME)
+
+    def load(self):
+        data: dict = {}
+        if self.path is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        if data.get("version") != CACHE_VERSION:
+            data = {}
+        self.entries = data.get("links") or {}
+
+    def save(self):
+        """Write the cache atomically. Failures are ignored — it is only a cache."""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            self._dirty = False
+            newest = sorted(self.entries.items(), key=lambda kv: kv[1].get("resolved_at", 0))
+            self.entries = dict(newest[-MAX_ENTRIES:])
+            payload = {"version": CACHE_VERSION, "links": dict(self.entries)}
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def _ttl_for(self, url: str) -> float:
+        host = split_url(url)[0]
+        for suffix, ttl in _HOST_TTL.items():
+            if host_matches(host, [suffix]):
+                return min(ttl, self.ttl)
+        return self.ttl
+
+    def cached(self, url: str, now: Optional[float] = None) -> Optional[str]:
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        age = (time.time() if now is None else now) - entry.get("resolved_at", 0)
+        return entry["url"] if 0 <= age <= self._ttl_for(url) else None
+
+    def resolve(self, url: str, timeout: float = _TIMEOUT) -> str:
+        """Return the canonical form of *url*.
+
+        Short links are expanded (or served from the cache); every URL has
+        its tracking parameters stripped. If a short link cannot be
+        expanded, the cleaned original is returned and nothing is cached.
+        """
+        if not is_short_link(url):
+            return strip_tracking(url)
+        if "://" not in url:
+            url = "https://" + url.lstrip("/")
+        hit = self.cached(url)
+        if hit is not None:
+            return hit
+        try:
+            target = expand(url, timeout=timeout)
+        except (urllib.error.URLError, OSError, ValueError):
+            return strip_tracking(url)
+        canonical = strip_tracking(target)
+        if canonical != url:
+            with self._lock:
+                self.entries[url] = {"url": canonical, "resolved_at": time.time()}
+                self._dirty = True
+        return canonical
+
+    def resolve_many(self, urls: Iterable[str], timeout: float = _TIMEOUT) -> List[str]:
+        """Resolve a batch (aligned with *urls*); each distinct link is expanded once."""
+        seen: Dict[str, str] = {}
+        out = []
+        for url in urls:
+            if url not in seen:
+                seen[url] = self.resolve(url, timeout=timeout)
+            out.append(seen[url])
+        return out
+
+
+def resolve(url: str, config: Optional[Config] = None) -> str:
+    """Canonicalize *url* using the on-disk short-link cache."""
+    resolver = ShortLinkResolver.for_config(config or Config())
+    try:
+        return resolver.resolve(url)
+    finally:
+        resolver.save()
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""Shared HTTP transport — per-host keep-alive connection pools for urllib.
+
+urllib opens a fresh TCP (and TLS) connection for every request and sends
+``Connection: close``. The handlers here replace urllib's HTTP/HTTPS
+handlers with ones that keep connections open and hand them back to a
+per-host pool, so a V2EX topic plus its replies, or a run of Xueqiu quotes,
+goes over one connection. New TLS connections to a host resume that host's
+last TLS session. Responses are requested compressed (gzip/deflate, plus
+brotli when the ``brotli`` package is installed) and decoded transparently.
+
+Channels build their openers with ``build_opener()``, which returns an
+ordinary ``urllib.request.OpenerDirector``: extra handlers (cookies,
+redirect policy) compose as usual, and tests patch ``_opener.open`` as
+before. Every opener shares one Transport unless given its own.
+
+The number of idle connections kept per host defaults to
+DEFAULT_POOL_SIZE and can be set with ``AGENT_REACH_HTTP_POOL_SIZE``.
+"""
+
+import http.client
+import io
+import os
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Protocol, Tuple
+
+POOL_SIZE_ENV = "AGENT_REACH_HTTP_POOL_SIZE"
+# Idle connections kept per host
+DEFAULT_POOL_SIZE = 4
+# Seconds an idle connection is reused; servers drop idle keep-alive after
+# roughly this long, and a dead connection costs a failed request + retry
+IDLE_TIMEOUT = 30.0
+
+_CHUNK = 64 * 1024
+# A reused connection the server already closed fails before any response;
+# these are retried once on a fresh connection
+_IDEMPOTENT = {"GET", "HEAD", "OPTIONS"}
+
+_PoolKey = Tuple[str, str, Optional[str]]
+
+
+def _brotli():
+    for name in ("brotli", "brotlicffi"):
+        try:
+            return __import__(name)
+        except ImportError:
+            continue
+    return None
+
+
+_brotli_module = _brotli()
+ACCEPT_ENCODING = "gzip, deflate, br" if _brotli_module else "gzip, deflate"
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._d = _brotli_module.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._d.process(data)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _decoder_for(encoding: str):
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        # 32 + MAX_WBITS accepts both gzip and zlib framing
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    if encoding == "br" and _brotli_module is not None:
+        return _BrotliDecoder()
+    return None
+
+
+class PooledResponse(io.BufferedIOBase):
+    """urllib-style response over a pooled connection.
+
+    The body is decoded according to Content-Encoding. The connection goes
+    back to the pool once the body has been read to the end (or the
+    response is closed after that); a response closed early takes its
+    connection down with it.
+    """
+
+    def __init__(self, resp: http.client.HTTPResponse, url: str,
+                 release: Callable[[http.client.HTTPResponse], None]):
+        super().__init__()
+        self._resp = resp
+        self._release = release
+        self._released = False
+        self._buffer = b""
+        self.url = url
+        self.status = self.code = resp.status
+        self.reason = self.msg = resp.reason
+        self.headers = resp.msg
+        encoding = (resp.getheader("Content-Encoding") or "").strip().lower()
+        self._decoder = _decoder_for(encoding)
+
+    def info(self):
+        return self.headers
+
+    def geturl(self) -> str:
+        return self.url
+
+    def getcode(self) -> int:
+        return self.status
+
+    def getheader(self, name: str, default=None):
+        return self._resp.getheader(name, default)
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if self._decoder is None:
+            data = self._resp.read(None if size is None or size < 0 else size)
+            if not data or self._resp.isclosed():
+                self._done()
+            return data
+        while (size is None or size < 0 or len(self._buffer) < size) and not self._released:
+            chunk = self._resp.read(_CHUNK)
+            if chunk:
+                self._buffer += self._decoder.decompress(chunk)
+            if not chunk or self._resp.isclosed():
+                self._buffer += self._decoder.flush()
+                self._done()
+        if size is None or size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _done(self):
+        if not self._released:
+            self._released = True
+            self._release(self._resp)
+
+    def close(self):
+        self._done()
+        super().close()
+
+
+class _PooledHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection that resumes the host's last TLS session."""
+
+    tls_sessions: Dict[str, ssl.SSLSession]  # set by Transport, shared per pool
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        server_hostname = _server_hostname(self)
+        session = self.tls_sessions.get(server_hostname)
+        # Set by HTTPSConnection.__init__ from the context= argument
+        context: ssl.SSLContext = getattr(self, "_context")
+        try:
+            self.sock = context.wrap_socket(
+                self.sock, server_hostname=server_hostname, session=session,
+            )
+        except ValueError:
+            # Session from another context or not resumable — full handshake
+            self.sock = context.wrap_socket(self.sock, server_hostname=server_hostname)
+
+
+def _server_hostname(conn: http.client.HTTPConnection) -> str:
+    """The host TLS is negotiated with: the tunnel target behind a proxy, else the host."""
+    return getattr(conn, "_tunnel_host", None) or conn.host
+
+
+class Transport:
+    """Per-host pools of idle keep-alive connections, shared by many openers."""
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = IDLE_TIMEOUT,
+        context: Optional[ssl.SSLContext] = None,
+    ):
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._context = context
+        self._idle: Dict[_PoolKey, List[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._tls_sessions: Dict[str, ssl.SSLSession] = {}
+        self._lock = threading.Lock()
+        # Connections opened / requests served on a reused connection
+        self.opened = 0
+        self.reused = 0
+
+    @property
+    def context(self) -> ssl.SSLContext:
+        if self._context is None:
+            self._context = ssl.create_default_context()
+        return self._context
+
+    def _acquire(self, key: _PoolKey, timeout, tunnel_headers) -> Tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key) or []
+            while idle:
+                conn, since = idle.pop()
+                if conn.sock is not None and now - since < self.idle_timeout:
+                    self.reused += 1
+                    if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:  # type: ignore[attr-defined]
+                        conn.timeout = timeout
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+            self.opened += 1
+        scheme, host, tunnel = key
+        if scheme == "https":
+            conn = _PooledHTTPSConnection(host, timeout=timeout, context=self.context)
+            conn.tls_sessions = self._tls_sessions
+        else:
+            conn = http.client.HTTPConnection(host, timeout=timeout)
+        if tunnel:
+            conn.set_tunnel(tunnel, headers=tunnel_headers)
+        return conn, False
+
+    def _release(self, key: _PoolKey, conn: http.client.HTTPConnection,
+                 resp: http.client.HTTPResponse):
+        sock = conn.sock
+        if sock is None or resp.will_close or not resp.isclosed():
+            conn.close()
+            return
+        if isinstance(sock, ssl.SSLSocket) and sock.session is not None:
+            self._tls_sessions[_server_hostname(conn)] = sock.session
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def _releaser(self, key: _PoolKey, conn: http.client.HTTPConnection
+                  ) -> Callable[[http.client.HTTPResponse], None]:
+        """The callback that hands *conn* back to *key*'s pool once a response is done."""
+
+        def release(resp: http.client.HTTPResponse) -> None:
+            self._release(key, conn, resp)
+
+        return release
+
+    def open(self, req: urllib.request.Request, scheme: str) -> PooledResponse:
+        """Send *req* over a pooled connection (urllib handler entry point)."""
+        host = req.host
+        if not host:
+            raise urllib.error.URLError("no host given")
+        tunnel = getattr(req, "_tunnel_host", None)
+        key: _PoolKey = (scheme, host, tunnel)
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers["Connection"] = "keep-alive"
+        headers = {name.title(): value for name, value in headers.items()}
+        headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
+        tunnel_headers = {}
+        if tunnel and "Proxy-Authorization" in headers:
+            tunnel_headers["Proxy-Authorization"] = headers.pop("Proxy-Authorization")
+
+        method = req.get_method()
+        for attempt in (0, 1):
+            conn, reused = self._acquire(key, req.timeout, tunnel_headers)
+            try:
+                conn.request(
+                    method, req.selector, req.data, headers,
+                    encode_chunked=req.has_header("Transfer-encoding"),
+                )
+                resp = conn.getresponse()
+            except (ConnectionResetError, BrokenPipeError, http.client.BadStatusLine) as err:
+                conn.close()
+                if reused and attempt == 0 and method in _IDEMPOTENT:
+                    continue  # stale keep-alive connection
+                raise urllib.error.URLError(err)
+            except OSError as err:
+                conn.close()
+                raise urllib.error.URLError(err)
+            return PooledResponse(resp, req.get_full_url(), self._releaser(key, conn))
+        raise AssertionError("unreachable")
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+
+class KeepAliveHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, transport: Transport):
+        super().__init__()
+        self.transport = transport
+
+    def http_open(self, req):
+        return self.transport.open(req, "http")
+
+
+class KeepAliveHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, transport: Transport):
+        # Skip HTTPSHandler.__init__, which may build an SSL context eagerly;
+        # the transport creates its context on the first HTTPS request
+        urllib.request.AbstractHTTPHandler.__init__(self)
+        self.transport = transport
+
+    def https_open(self, req):
+        return self.transport.open(req, "https")
+
+
+_default: Optional[Transport] = None
+_default_lock = threading.Lock()
+
+
+def default_transport() -> Transport:
+    """The process-wide Transport shared by every channel opener."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                try:
+                    size = int(os.environ.get(POOL_SIZE_ENV) or DEFAULT_POOL_SIZE)
+                except ValueError:
+                    size = DEFAULT_POOL_SIZE
+                _default = Transport(pool_size=max(size, 0))
+    return _default
+
+
+def build_opener(*handlers, transport: Optional[Transport] = None) -> urllib.request.OpenerDirector:
+    """``urllib.request.build_opener`` with pooled keep-alive HTTP(S) handlers."""
+    transport = transport or default_transport()
+    return urllib.request.build_opener(
+        KeepAliveHTTPHandler(transport), KeepAliveHTTPSHandler(transport), *handlers,
+    )
+
+
+class Limiter(Protocol):
+    """What fetchers need from a limiter: HostLimiter, or a wrapper around one."""
+
+    def hold(self, *hosts: str) -> ContextManager[None]:
+        """Block until a slot is free for every host in *hosts*; release it on exit."""
+        ...
+
+
+class HostLimiter:
+    """Per-host concurrency caps for batch fetchers.
+
+    ``hold(*hosts)`` blocks until a slot is free for every host given
+    (*default* slots each, or ``limits[host]``), so a batch can cap both the
+    sites it reads from and a shared upstream such as a reader service.
+    """
+
+    def __init__(self, default: int, limits: Optional[Dict[str, int]] = None):
+        self.default = default
+        self.limits = dict(limits or {})
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(
+                    max(1, self.limits.get(host, self.default))
+                )
+            return slot
+
+    @contextmanager
+    def hold(self, *hosts: str) -> Iterator[None]:
+        # Acquire in a fixed order so two holders can't deadlock each other
+        slots = [self._slot(h) for h in sorted(set(hosts))]
+        acquired = []
+        try:
+            for slot in slots:
+                slot.acquire()
+                acquired.append(slot)
+            yield
+        finally:
+            for slot in reversed(acquired):
+                slot.release()
@@ -0,0 +1,40 @@
+"""Read mcporter's config files without spawning Node.js."""
+
+from __future__ import annotations
+
+import json
+from typing import Set
+
+# Where `mcporter config add` writes: user-wide, and per-project (relative to cwd)
+MCPORTER_CONFIG_FILES = ["~/.mcporter/mcporter.json", "config/mcporter.json"]
+
+
+def configured_servers(probe) -> Set[str]:
+    """Return the lower-cased MCP server names found in mcporter config files.
+
+    Servers that mcporter pulls in through ``imports`` (editor configs) are
+    not visible here; only a live ``mcporter config list`` sees those.
+    """
+    names: Set[str] = set()
+    for path in MCPORTER_CONFIG_FILES:
+        text = probe.read_text(path)
+        if not text:
+            continue
+        try:
+            servers = json.loads(text).get("mcpServers") or {}
+        except (ValueError, AttributeError):
+            continue
+        names.update(str(name).lower() for name in servers)
+    return names
+
+
+def has_server(probe, mcporter: str, server: str) -> bool:
+    """Whether *server* appears in mcporter's configuration.
+
+    At live depth this asks ``mcporter config list``, which also sees
+    imported servers; below that only the config files are read. Errors
+    from the subprocess propagate to the caller.
+    """
+    if probe.allows("live"):
+        return server in probe.run([mcporter, "config", "list"], timeout=5).stdout.lower()
+    return any(server in name for name in configured_servers(probe))
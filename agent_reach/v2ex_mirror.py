@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""Local SQLite mirror of V2EX nodes — incremental, resumable sync.
+
+``agent-reach v2ex sync --nodes python,jobs`` lists each node's latest
+topics and stores them with their replies in ~/.agent-reach/v2ex.db (WAL
+mode, so readers never wait for a sync). A topic whose ``last_touched`` and
+``replies`` match the stored row is skipped. A topic that gained replies
+only fetches the reply pages from the last one it has, and one that lost
+replies (deletions shift the floors) is re-read from the start.
+
+Progress is checkpointed as it goes. Topics needing replies are queued in
+the ``pending`` table before any reply is fetched, and each reply page is
+committed together with the topic's ``replies_synced`` count. An
+interrupted sync therefore resumes where it stopped: the next run drains
+the queue first and continues each thread from its last stored page.
+
+V2EXChannel answers ``get_node_topics`` / ``get_topic`` from a mirror it is
+given when the node was synced within ``max_age`` seconds.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from agent_reach.config import Config
+
+if TYPE_CHECKING:
+    from agent_reach.channels.v2ex import V2EXChannel
+
+DB_FILENAME = "v2ex.db"
+SCHEMA_VERSION = 1
+
+# Seconds a synced node is answered from the mirror
+DEFAULT_MAX_AGE = 600.0
+# Topic-list pages read per node (V2EX returns the latest topics first)
+DEFAULT_PAGES = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    name TEXT PRIMARY KEY,
+    title TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS topics (
+    id INTEGER PRIMARY KEY,
+    node_name TEXT NOT NULL,
+    node_title TEXT,
+    title TEXT,
+    url TEXT,
+    content TEXT,
+    author TEXT,
+    replies INTEGER NOT NULL DEFAULT 0,
+    created INTEGER,
+    last_modified INTEGER,
+    last_touched INTEGER,
+    fetched_at REAL,
+    replies_synced INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS topics_by_node ON topics (node_name, last_touched DESC);
+CREATE TABLE IF NOT EXISTS replies (
+    topic_id INTEGER NOT NULL,
+    floor INTEGER NOT NULL,
+    author TEXT,
+    content TEXT,
+    created INTEGER,
+    PRIMARY KEY (topic_id, floor)
+);
+CREATE TABLE IF NOT EXISTS pending (
+    topic_id INTEGER PRIMARY KEY,
+    node_name TEXT,
+    queued_at REAL
+);
+"""
+
+
+class V2EXMirror:
+    """SQLite store of V2EX topics and replies, filled by sync()."""
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        max_age: float = DEFAULT_MAX_AGE,
+        channel: Optional["V2EXChannel"] = None,
+    ):
+        self.path = str(path)
+        self.max_age = max_age
+        self._channel = channel
+        self._lock = threading.RLock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute("PRAGMA busy_timeout = 5000")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            for table in ("nodes", "topics", "replies", "pending"):
+                self._db.execute(f"DROP TABLE IF EXISTS {table}")
+        self._db.executescript(_SCHEMA)
+        self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @classmethod
+    def for_config(cls, config: Config, **kwargs) -> "V2EXMirror":
+        return cls(config.config_dir / DB_FILENAME, **kwargs)
+
+    @property
+    def channel(self) -> "V2EXChannel":
+        if self._channel is None:
+            from agent_reach.channels.v2ex import V2EXChannel
+
+            self._channel = V2EXChannel()
+        return self._channel
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # -- sync --------------------------------------------------------------
+
+    def sync(
+        self,
+        nodes: Iterable[str],
+        pages: int = DEFAULT_PAGES,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, dict]:
+        """Bring *nodes* up to date; return per-node counts.
+
+        Counts: ``new`` / ``updated`` topics, ``unchanged`` topics skipped,
+        ``replies`` fetched, and topics whose replies ``failed`` to load
+        (they stay queued for the next run). Topics left queued by an
+        interrupted run are finished first and counted under ``"(resumed)"``.
+        Errors listing a node propagate; everything stored so far is kept.
+        """
+        report: Dict[str, dict] = {}
+        leftover = self._pending()
+        if leftover:
+            counts = dict.fromkeys(("new", "updated", "unchanged", "replies", "failed"), 0)
+            counts["replies"], counts["failed"] = self._drain(leftover, progress)
+            report["(resumed)"] = counts
+
+        for node in nodes:
+            counts = dict.fromkeys(("new", "updated", "unchanged", "replies", "failed"), 0)
+            node_title = None
+            for page in range(1, max(1, pages) + 1):
+                items = self.channel._node_page(node, page)
+                if not items:
+                    break
+                node_title = node_title or (items[0].get("node") or {}).get("title")
+                with self._transaction():
+                    for item in items:
+                        counts[self._store_topic(node, item)] += 1
+            counts["replies"], counts["failed"] = self._drain(self._pending(node), progress)
+            with self._transaction():
+                self._db.execute(
+                    "INSERT INTO nodes (name, title, synced_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET title = COALESCE(excluded.title, title), "
+                    "synced_at = excluded.synced_at",
+                    (node, node_title, time.time()),
+                )
+            report[node] = counts
+        return report
+
+    def _transaction(self):
+        return _Transaction(self._db, self._lock)
+
+    def _store_topic(self, node: str, item: dict) -> str:
+        """Upsert one listed topic; queue it when its replies changed."""
+        topic_id = item.get("id")
+        row = self._db.execute(
+            "SELECT last_touched, replies, replies_synced FROM topics WHERE id = ?", (topic_id,)
+        ).fetchone()
+        replies = item.get("replies", 0) or 0
+        touched = item.get("last_touched") or item.get("last_modified") or item.get("created")
+        if row is not None and row["last_touched"] == touched and row["replies"] == replies \
+                and row["replies_synced"] >= replies:
+            return "unchanged"
+        node_info = item.get("node") or {}
+        self._db.execute(
+            "INSERT INTO topics (id, node_name, node_title, title, url, content, author, replies, "
+            "created, last_modified, last_touched, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET node_name = excluded.node_name, "
+            "node_title = excluded.node_title, title = excluded.title, url = excluded.url, "
+            "content = excluded.content, author = excluded.author, replies = excluded.replies, "
+            "last_modified = excluded.last_modified, last_touched = excluded.last_touched, "
+            "fetched_at = excluded.fetched_at",
+            (
+                topic_id, node_info.get("name", node), node_info.get("title", ""),
+                item.get("title", ""), item.get("url", f"https://www.v2ex.com/t/{topic_id}"),
+                item.get("content", "") or "", (item.get("member") or {}).get("username", ""),
+                replies, item.get("created", 0), item.get("last_modified"), touched, time.time(),
+            ),
+        )
+        if row is None or replies != row["replies_synced"]:
+            self._db.execute(
+                "INSERT OR IGNORE INTO pending (topic_id, node_name, queued_at) VALUES (?, ?, ?)",
+                (topic_id, node, time.time()),
+            )
+        return "new" if row is None else "updated"
+
+    def _pending(self, node: Optional[str] = None) -> List[int]:
+        with self._lock:
+            if node is None:
+                rows = self._db.execute("SELECT topic_id FROM pending ORDER BY queued_at")
+            else:
+                rows = self._db.execute(
+                    "SELECT topic_id FROM pending WHERE node_name = ? ORDER BY queued_at", (node,)
+                )
+            return [r[0] for r in rows.fetchall()]
+
+    def _drain(self, topic_ids: List[int], progress: Optional[Callable[[str], None]]) -> Tuple[int, int]:
+        """Fetch the missing replies of each queued topic; return (replies stored, topics failed)."""
+        stored = failed = 0
+        for topic_id in topic_ids:
+            try:
+                stored += self._sync_replies(topic_id, progress)
+            except Exception as e:
+                # Left in pending; the next sync continues from the last stored page
+                failed += 1
+                if progress is not None:
+                    progress(f"{topic_id}：回复获取失败（{e}）")
+        return stored, failed
+
+    def _sync_replies(self, topic_id: int, progress: Optional[Callable[[str], None]]) -> int:
+        """Store the replies *topic_id* is missing, page by page; return how many."""
+        from agent_reach.channels.v2ex import REPLIES_PER_PAGE
+
+        stored = 0
+        with self._lock:
+            row = self._db.execute(
+                "SELECT replies, replies_synced FROM topics WHERE id = ?", (topic_id,)
+            ).fetchone()
+        if row is None:
+            with self._transaction():
+                self._db.execute("DELETE FROM pending WHERE topic_id = ?", (topic_id,))
+            return 0
+        total, synced = row["replies"], row["replies_synced"]
+        if total < synced:
+            # Replies were deleted and the floors moved — start over
+            with self._transaction():
+                self._db.execute("DELETE FROM replies WHERE topic_id = ?", (topic_id,))
+                self._db.execute("UPDATE topics SET replies_synced = 0 WHERE id = ?", (topic_id,))
+            synced = 0
+        start_page = synced // REPLIES_PER_PAGE + 1
+        if progress is not None:
+            progress(f"{topic_id}：回复 {synced} → {total}")
+        if total > synced:
+            for page in self.channel.iter_reply_pages(
+                topic_id, replies_count=total, start_page=start_page,
+            ):
+                with self._transaction():
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO replies "
+                        "(topic_id, floor, author, content, created) VALUES (?, ?, ?, ?, ?)",
+                        [(topic_id, r["floor"], r["author"], r["content"], r["created"]) for r in page],
+                    )
+                    if page:
+                        self._db.execute(
+                            "UPDATE topics SET replies_synced = MAX(replies_synced, ?) WHERE id = ?",
+                            (page[-1]["floor"], topic_id),
+                        )
+                stored += len(page)
+        with self._transaction():
+            # Whatever the API returned is now the full thread
+            self._db.execute(
+                "UPDATE topics SET replies_synced = replies WHERE id = ?", (topic_id,)
+            )
+            self._db.execute("DELETE FROM pending WHERE topic_id = ?", (topic_id,))
+        return stored
+
+    # -- lookups -----------------------------------------------------------
+
+    def _fresh(self, node: str, max_age: Optional[float] = None) -> bool:
+        row = self._db.execute("SELECT synced_at FROM nodes WHERE name = ?", (node,)).fetchone()
+        if row is None or row["synced_at"] is None:
+            return False
+        age = time.time() - row["synced_at"]
+        return 0 <= age <= (self.max_age if max_age is None else max_age)
+
+    def node_topics(self, node: str, limit: int = 20, max_age: Optional[float] = None) -> Optional[list]:
+        """The node's latest topics in get_node_topics() form, or None if not fresh."""
+        with self._lock:
+            if not self._fresh(node, max_age):
+                return None
+            rows = self._db.execute(
+                "SELECT * FROM topics WHERE node_name = ? ORDER BY last_touched DESC LIMIT ?",
+                (node, limit),
+            ).fetchall()
+        return [
+            {
+                "id": r["id"],
+                "title": r["title"],
+                "url": r["url"],
+                "replies": r["replies"],
+                "node_name": r["node_name"],
+                "node_title": r["node_title"],
+                "content": (r["content"] or "")[:200],
+                "created": r["created"],
+            }
+            for r in rows
+        ]
+
+    def topic(
+        self,
+        topic_id: int,
+        all_replies: bool = False,
+        max_pages: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ) -> Optional[dict]:
+        """The topic in get_topic() form, or None unless fully synced and fresh."""
+        from agent_reach.channels.v2ex import REPLIES_PER_PAGE
+
+        with self._lock:
+            row = self._db.execute("SELECT * FROM topics WHERE id = ?", (topic_id,)).fetchone()
+            if row is None or row["replies_synced"] < row["replies"] or not self._fresh(row["node_name"], max_age):
+                return None
+            if self._db.execute("SELECT 1 FROM pending WHERE topic_id = ?", (topic_id,)).fetchone():
+                return None
+            if not all_replies:
+                floors = REPLIES_PER_PAGE
+            else:
+                floors = REPLIES_PER_PAGE * max_pages if max_pages else -1
+            replies = self._db.execute(
+                "SELECT floor, author, content, created FROM replies WHERE topic_id = ? "
+                "ORDER BY floor LIMIT ?",
+                (topic_id, floors),
+            ).fetchall()
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "url": row["url"],
+            "content": row["content"],
+            "replies_count": row["replies"],
+            "node_name": row["node_name"],
+            "node_title": row["node_title"],
+            "author": row["author"],
+            "created": row["created"],
+            "replies": [dict(r) for r in replies],
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("nodes", "topics", "replies", "pending")
+            }
+
+
+class _Transaction:
+    """``with``: BEGIN IMMEDIATE … COMMIT under the mirror's lock (ROLLBACK on error)."""
+
+    def __init__(self, db: sqlite3.Connection, lock):
+        self._db = db
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._db.execute("BEGIN IMMEDIATE")
+        return self._db
+
+    def __exit__(self, exc_type, *_):
+        try:
+            self._db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
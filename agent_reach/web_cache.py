@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache for pages read through WebChannel.
+
+Pages are stored gzip-compressed under ~/.agent-reach/web-cache/, one file
+per key, where the key hashes the canonical URL (short links expanded,
+tracking parameters stripped) together with the reader options. index.json
+holds each entry's ETag / Last-Modified, when it was fetched and last
+validated, and when it was last read.
+
+An entry younger than *max_age* is served without touching the network.
+After that it is revalidated with a conditional request; a 304 renews it
+without transferring the page again. The blobs are capped at *max_bytes*
+in total, evicting the least recently read entries first.
+
+Hit / miss / revalidation / eviction counters are kept per process in
+``session`` and accumulated across runs in the index (``agent-reach cache``).
+
+Several processes may share the directory (a batch read next to the
+daemon, say): save() re-reads the index and merges in entries written by
+others since this one loaded it, so their pages stay indexed and counted
+against *max_bytes*.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from agent_reach.config import Config
+from agent_reach.shortlinks import ShortLinkResolver, is_short_link, strip_tracking
+
+CACHE_DIRNAME = "web-cache"
+INDEX_FILENAME = "index.json"
+CACHE_VERSION = 1
+
+# Seconds a page is served without revalidation
+DEFAULT_MAX_AGE = 3600.0
+# Total size of the compressed pages kept on disk
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+COUNTERS = ("hits", "misses", "revalidated", "evictions")
+
+
+def cache_key(url: str, options: Optional[dict] = None) -> str:
+    """Hash a canonical URL and the reader options that shaped the page."""
+    payload = json.dumps({"url": url, "options": options or {}}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class WebCache:
+    """Compressed page store with an LRU byte cap, persisted as JSON + blobs.
+
+    With *root* None nothing touches the disk (useful for tests and one-off
+    callers that only want the counters).
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        resolver: Optional[ShortLinkResolver] = None,
+    ):
+        self.root = Path(root) if root is not None else None
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.resolver = resolver
+        self.entries: Dict[str, dict] = {}
+        self.totals: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.session: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._blobs: Dict[str, bytes] = {}  # used when root is None
+        # Keys this process dropped — not merged back from the disk index
+        self._removed: Set[str] = set()
+        # Session counters already added to the index by save()
+        self._saved: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def for_config(cls, config: Config, **kwargs) -> "WebCache":
+        kwargs.setdefault("resolver", ShortLinkResolver.for_config(config))
+        return cls(config.config_dir / CACHE_DIRNAME, **kwargs)
+
+    # -- persistence -------------------------------------------------------
+
+    @property
+    def index_path(self) -> Optional[Path]:
+        return self.root / INDEX_FILENAME if self.root is not None else None
+
+    def _read_index(self) -> dict:
+        data: dict = {}
+        if self.index_path is not None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            data = {}
+        return data
+
+    def load(self):
+        data = self._read_index()
+        self.entries = data.get("entries") or {}
+        self.totals = {name: int((data.get("stats") or {}).get(name, 0)) for name in COUNTERS}
+
+    def _merge(self, data: dict):
+        """Fold another process's index into ours (caller holds the lock)."""
+        for key, theirs in (data.get("entries") or {}).items():
+            if key in self._removed:
+                continue
+            ours = self.entries.get(key)
+            if ours is None or theirs.get("fetched_at", 0) > ours.get("fetched_at", 0):
+                # Their blob is the newer write; keep the later read time
+                merged = dict(theirs)
+                if ours is not None:
+                    merged["accessed_at"] = max(ours.get("accessed_at", 0), theirs.get("accessed_at", 0))
+                self.entries[key] = merged
+            else:
+                ours["accessed_at"] = max(ours.get("accessed_at", 0), theirs.get("accessed_at", 0))
+
+    def save(self):
+        """Merge with the index on disk and write it atomically.
+
+        Failures are ignored — it is only a cache.
+        """
+        if self.resolver is not None:
+            self.resolver.save()
+        root = self.root
+        if root is None or not self._dirty:
+            return
+        index_path = root / INDEX_FILENAME
+        data = self._read_index()
+        with self._lock:
+            self._merge(data)
+        # Entries merged in may push the total over max_bytes
+        self.evict()
+        stats = data.get("stats") or {}
+        with self._lock:
+            self._dirty = False
+            # The index already holds what earlier saves added; add the rest
+            totals = {
+                name: int(stats.get(name, 0)) + self.session[name] - self._saved[name]
+                for name in COUNTERS
+            }
+            self.totals = {name: totals[name] - self.session[name] for name in COUNTERS}
+            self._saved = dict(self.session)
+            payload = {"version": CACHE_VERSION, "entries": dict(self.entries), "stats": totals}
+        tmp = index_path.with_name(f"{INDEX_FILENAME}.{os.getpid()}.tmp")
+        try:
+            root.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, index_path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def _blob_path(self, key: str) -> Path:
+        assert self.root is not None
+        return self.root / f"{key}.md.gz"
+
+    def _read_blob(self, key: str) -> Optional[bytes]:
+        if self.root is None:
+            return self._blobs.get(key)
+        try:
+            return self._blob_path(key).read_bytes()
+        except OSError:
+            return None
+
+    def _write_blob(self, key: str, blob: bytes) -> bool:
+        if self.root is None:
+            self._blobs[key] = blob
+            return True
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self._blob_path(key).with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(blob)
+            os.replace(tmp, self._blob_path(key))
+            return True
+        except OSError:
+            return False
+
+    def _drop_blob(self, key: str):
+        if self.root is None:
+            self._blobs.pop(key, None)
+            return
+        try:
+            self._blob_path(key).unlink()
+        except OSError:
+            pass
+
+    # -- lookups -----------------------------------------------------------
+
+    def canonical(self, url: str) -> str:
+        """The URL a page is cached under: short links expanded, tracking params stripped.
+
+        Only utm_*-style parameters are dropped everywhere; share parameters
+        such as ``mid`` are dropped only on the hosts that add them (see
+        shortlinks._HOST_TRACKING_PARAMS), so distinct pages elsewhere keep
+        distinct keys.
+        """
+        if self.resolver is not None and is_short_link(url):
+            return self.resolver.resolve(url)
+        return strip_tracking(url)
+
+    def count(self, counter: str):
+        with self._lock:
+            self.session[counter] += 1
+            self._dirty = True
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the entry for *key* (with its ``text``) or None; marks it recently used."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        blob = self._read_blob(key)
+        if blob is None:
+            self._forget(key)
+            return None
+        try:
+            text = gzip.decompress(blob).decode("utf-8")
+        except (OSError, EOFError, UnicodeDecodeError):
+            self._forget(key)
+            return None
+        with self._lock:
+            entry["accessed_at"] = time.time()
+            self._dirty = True
+        return dict(entry, text=text)
+
+    def is_fresh(self, entry: dict, now: Optional[float] = None, max_age: Optional[float] = None) -> bool:
+        age = (time.time() if now is None else now) - entry.get("validated_at", 0)
+        return 0 <= age <= (self.max_age if max_age is None else max_age)
+
+    def conditional_headers(self, entry: dict) -> Dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    # -- updates -----------------------------------------------------------
+
+    def put(
+        self,
+        key: str,
+        url: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        options: Optional[dict] = None,
+        backend: Optional[str] = None,
+    ):
+        blob = gzip.compress(text.encode("utf-8"))
+        if len(blob) > self.max_bytes or not self._write_blob(key, blob):
+            return
+        now = time.time()
+        with self._lock:
+            self._removed.discard(key)
+            self.entries[key] = {
+                "url": url,
+                "options": options or {},
+                "backend": backend,
+                "size": len(blob),
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": now,
+                "validated_at": now,
+                "accessed_at": now,
+            }
+            self._dirty = True
+        self.evict()
+
+    def revalidated(self, key: str):
+        """Record a 304 for *key*: the stored page is current again."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry["validated_at"] = time.time()
+                self._dirty = True
+        self.count("revalidated")
+
+    def _forget(self, key: str):
+        with self._lock:
+            self.entries.pop(key, None)
+            self._removed.add(key)
+            self._dirty = True
+        self._drop_blob(key)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(e.get("size", 0) for e in self.entries.values())
+
+    def evict(self):
+        """Drop least recently read entries until the blobs fit in max_bytes."""
+        with self._lock:
+            total = sum(e.get("size", 0) for e in self.entries.values())
+            victims = []
+            for key, entry in sorted(self.entries.items(), key=lambda kv: kv[1].get("accessed_at", 0)):
+                if total <= self.max_bytes:
+                    break
+                total -= entry.get("size", 0)
+                victims.append(key)
+            for key in victims:
+                del self.entries[key]
+                self._removed.add(key)
+            if victims:
+                self.session["evictions"] += len(victims)
+                self._dirty = True
+        for key in victims:
+            self._drop_blob(key)
+
+    def clear(self):
+        for key in list(self.entries):
+            self._forget(key)
+
+    def stats(self) -> dict:
+        """Counters (this process and all runs) plus the current footprint."""
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "session": dict(self.session),
+            "total": {name: self.totals[name] + self.session[name] for name in COUNTERS},
+        }
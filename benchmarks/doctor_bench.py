@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""Benchmark `check_all` against stub upstream CLIs.
+
+Each scenario runs the doctor in a fresh child process with only the stub
+CLIs (see stub_cli.py) on PATH and a throwaway HOME, so results don't depend
+on what is installed or configured on this machine. HTTP probes are served
+in-process by a stub with the same latency/mode knobs.
+
+Reported per scenario:
+    wall_ms      check_all wall time (median over --repeat runs)
+    spawns       stub processes started by the measured run
+    rss_mb       peak RSS of the doctor process
+    child_rss_mb peak RSS of the largest spawned process
+    statuses     channel status counts
+
+Usage:
+    python benchmarks/doctor_bench.py
+    python benchmarks/doctor_bench.py --scenario hang --timeout 3
+    python benchmarks/doctor_bench.py --set xhs.mode=hang --set '*.latency=0.5'
+    python benchmarks/doctor_bench.py --json > bench.json
+
+Repeats of one scenario share a HOME, so the latency history (and, for the
+"cached" scenario, the doctor cache) carries over between them like it does
+between real runs.
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+sys.path.insert(0, str(HERE))
+
+from stub_cli import HANG_SECONDS, LOG_ENV, SPEC_ENV, install_stubs  # noqa: E402
+
+_HEALTHY = {
+    "*": {"latency": 0.05},
+    "gh": {"latency": 0.3},
+    "twitter": {"latency": 0.4},
+    "xhs": {"latency": 0.4},
+    "rdt": {"latency": 0.3},
+    "mcporter": {"latency": 0.5},
+    "http": {"latency": 0.1},
+}
+
+SCENARIOS = {
+    "healthy": {"spec": _HEALTHY},
+    "unauthenticated": {"spec": {"*": {"latency": 0.05, "mode": "unauth"}, "http": {"latency": 0.1}}},
+    "slow": {"spec": {"*": {"latency": 2.0}, "http": {"latency": 1.0}}},
+    "hang": {"spec": dict(_HEALTHY, xhs={"mode": "hang"}, mcporter={"mode": "hang"})},
+    "failing": {"spec": {"*": {"latency": 0.05, "mode": "fail"}, "http": {"mode": "fail"}}},
+    "cached": {"spec": _HEALTHY, "warm": True, "max_age": 600},
+}
+
+_HTTP_BODIES = {
+    "bilibili.com": {"code": 0, "data": {}},
+    "xueqiu.com": {"data": {"items": [{"quote": {"symbol": "SH600519"}}]}},
+}
+
+
+# ---------------------------------------------------------------------- #
+# Child: run the doctor
+# ---------------------------------------------------------------------- #
+
+class _StubResponse:
+    status = 200
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def read(self, *_):
+        return self._body
+
+
+def _patch_http(spec: dict):
+    """Serve every doctor HTTP probe from memory with the configured behaviour."""
+    import socket
+    import urllib.request
+    from urllib.error import URLError
+
+    from agent_reach.channels import get_all_channels
+
+    latency = float(spec.get("latency", 0))
+    mode = spec.get("mode", "ok")
+    get_all_channels()  # import every channel module so their openers get patched
+
+    def fake_open(req, timeout=None, *_args, **_kwargs):
+        url = getattr(req, "full_url", req)
+        if mode == "hang":
+            time.sleep(timeout or HANG_SECONDS)
+            raise URLError(socket.timeout("timed out"))
+        time.sleep(latency)
+        if mode == "fail":
+            raise URLError("stub: connection refused")
+        body = next((b for host, b in _HTTP_BODIES.items() if host in url), {})
+        return _StubResponse(json.dumps(body).encode("utf-8"))
+
+    urllib.request.urlopen = fake_open
+    for name, module in list(sys.modules.items()):
+        opener = getattr(module, "_opener", None)
+        if name.startswith("agent_reach.") and opener is not None:
+            opener.open = fake_open
+
+
+def _peak_rss_mb(who: int) -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    rss = resource.getrusage(who).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _child(args) -> int:
+    import resource
+
+    from agent_reach.config import Config
+    from agent_reach.doctor import check_all
+
+    scenario = SCENARIOS.get(args.child, {})
+    spec = json.loads(os.environ.get(SPEC_ENV) or "{}")
+    _patch_http(spec.get("http") or {})
+    config = Config()
+    max_age = scenario.get("max_age")
+    if scenario.get("warm"):
+        check_all(config, timeout=args.timeout, level=args.level)
+        open(os.environ[LOG_ENV], "w").close()
+
+    start = time.perf_counter()
+    results = check_all(config, timeout=args.timeout, level=args.level, max_age=max_age)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        "wall_ms": round(wall_ms, 1),
+        "rss_mb": _peak_rss_mb(resource.RUSAGE_SELF),
+        "child_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "statuses": dict(Counter(r["status"] for r in results.values())),
+    }))
+    # Hung stubs may still be running; don't wait for them
+    sys.stdout.flush()
+    os._exit(0)
+
+
+# ---------------------------------------------------------------------- #
+# Parent: set up stubs and run scenarios
+# ---------------------------------------------------------------------- #
+
+def _apply_overrides(spec: dict, overrides) -> dict:
+    spec = {tool: dict(values) for tool, values in spec.items()}
+    for item in overrides:
+        target, _, value = item.partition("=")
+        tool, _, key = target.partition(".")
+        if not (tool and key and value):
+            raise SystemExit(f"--set expects TOOL.KEY=VALUE, got {item!r}")
+        spec.setdefault(tool, {})[key] = float(value) if key == "latency" else value
+    return spec
+
+
+def _kill_leftovers(pgid: int):
+    """Kill stubs still hanging after the doctor gave up on them."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def run_scenario(name: str, args) -> dict:
+    scenario = SCENARIOS[name]
+    spec = _apply_overrides(scenario["spec"], args.set)
+    runs = []
+    with tempfile.TemporaryDirectory(prefix=f"agent-reach-bench-{name}-") as tmp:
+        home = Path(tmp) / "home"
+        home.mkdir()
+        bin_dir = install_stubs(Path(tmp) / "bin")
+        log = Path(tmp) / "spawns.log"
+        env = dict(
+            os.environ,
+            HOME=str(home),
+            PATH=str(bin_dir),
+            PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])),
+            **{SPEC_ENV: json.dumps(spec), LOG_ENV: str(log)},
+        )
+        for _ in range(args.repeat):
+            log.write_text("")
+            cmd = [
+                sys.executable, str(Path(__file__).resolve()), "--child", name,
+                "--timeout", str(args.timeout), "--level", args.level,
+            ]
+            proc = subprocess.Popen(
+                cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                start_new_session=True,
+            )
+            stdout, stderr = proc.communicate()
+            _kill_leftovers(proc.pid)
+            if proc.returncode != 0:
+                raise SystemExit(f"scenario {name} failed:\n{stderr}")
+            run = json.loads(stdout.strip().splitlines()[-1])
+            run["spawns"] = len(log.read_text().splitlines())
+            runs.append(run)
+
+    return {
+        "scenario": name,
+        "runs": len(runs),
+        "wall_ms": round(statistics.median(r["wall_ms"] for r in runs), 1),
+        "spawns": max(r["spawns"] for r in runs),
+        "rss_mb": max(r["rss_mb"] for r in runs),
+        "child_rss_mb": max(r["child_rss_mb"] for r in runs),
+        "statuses": runs[-1]["statuses"],
+    }
+
+
+def _format(rows) -> str:
+    header = f"{'scenario':<16}{'wall ms':>10}{'spawns':>8}{'rss MB':>8}{'child MB':>10}  statuses"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        statuses = " ".join(f"{k}={v}" for k, v in sorted(r["statuses"].items()))
+        lines.append(
+            f"{r['scenario']:<16}{r['wall_ms']:>10.1f}{r['spawns']:>8}"
+            f"{r['rss_mb']:>8.1f}{r['child_rss_mb']:>10.1f}  {statuses}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark agent-reach doctor with stub CLIs")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario (default: 3)")
+    parser.add_argument("--timeout", type=float, default=5.0,
+                        help="Per-channel doctor timeout in seconds (default: 5)")
+    parser.add_argument("--level", choices=["presence", "config", "live"], default="live")
+    parser.add_argument("--set", action="append", default=[], metavar="TOOL.KEY=VALUE",
+                        help="Override stub behaviour, e.g. xhs.mode=hang or '*.latency=0.2'")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return _child(args)
+
+    rows = [run_scenario(name, args) for name in (args.scenario or SCENARIOS)]
+    print(json.dumps(rows, indent=2) if args.json else _format(rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
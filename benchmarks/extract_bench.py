@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Benchmark local HTML → Markdown extraction on a fixture corpus.
+
+Each page in extract_corpus/ is listed in corpus.json with the URL it was
+saved from, whether extraction should succeed (``ok``), snippets the
+Markdown must contain (``must``) and boilerplate it must not (``must_not``).
+
+Reported per page:
+    ms       median extract() time over --repeat runs
+    chars    content characters found
+    ok       Extracted.ok (expected value in brackets when it differs)
+    recall   share of ``must`` snippets present
+    leaks    ``must_not`` snippets present
+
+With --jina the live URL is also read through Jina Reader and scored with
+the same snippets (needs network access; the saved pages and the live ones
+may have drifted apart, so treat those scores as indicative).
+
+Usage:
+    python benchmarks/extract_bench.py
+    python benchmarks/extract_bench.py --repeat 50 --jina
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from agent_reach.extract import extract  # noqa: E402
+
+CORPUS = HERE / "extract_corpus"
+
+
+def _score(markdown: str, spec: dict):
+    must = spec.get("must") or []
+    found = sum(snippet in markdown for snippet in must)
+    leaks = [snippet for snippet in spec.get("must_not") or [] if snippet in markdown]
+    return (found / len(must) if must else 1.0), leaks
+
+
+def _bench_local(html: str, url: str, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract(html, url)
+        times.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(times)
+
+
+def _bench_jina(url: str):
+    from agent_reach.channels.web import WebChannel
+
+    start = time.perf_counter()
+    try:
+        text = WebChannel().read(url)
+    except Exception as e:
+        return None, (time.perf_counter() - start) * 1000, str(e)
+    return text, (time.perf_counter() - start) * 1000, None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark local HTML extraction")
+    parser.add_argument("--repeat", type=int, default=20, help="extract() runs per page")
+    parser.add_argument("--jina", action="store_true", help="also read the live URLs via Jina Reader")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    corpus = json.loads((CORPUS / "corpus.json").read_text(encoding="utf-8"))
+    rows = []
+    for name, spec in corpus.items():
+        html = (CORPUS / name).read_text(encoding="utf-8")
+        result, ms = _bench_local(html, spec["url"], args.repeat)
+        recall, leaks = _score(result.markdown, spec)
+        row = {
+            "page": name,
+            "bytes": len(html.encode("utf-8")),
+            "ms": round(ms, 2),
+            "chars": result.content_chars,
+            "ok": result.ok,
+            "expected_ok": spec.get("ok", True),
+            "recall": round(recall, 2),
+            "leaks": leaks,
+        }
+        if args.jina:
+            text, jina_ms, error = _bench_jina(spec["url"])
+            row["jina_ms"] = round(jina_ms, 1)
+            if text is None:
+                row["jina_error"] = error
+            else:
+                row["jina_recall"], row["jina_leaks"] = _score(text, spec)
+        rows.append(row)
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return 0
+
+    header = f"{'page':<20}{'bytes':>8}{'ms':>8}{'chars':>7}  {'ok':<12}{'recall':>7}  leaks"
+    if args.jina:
+        header += "   jina_ms  jina_recall"
+    print(header)
+    for row in rows:
+        ok = str(row["ok"]) if row["ok"] == row["expected_ok"] else f"{row['ok']} [{row['expected_ok']}]"
+        line = (f"{row['page']:<20}{row['bytes']:>8}{row['ms']:>8.2f}{row['chars']:>7}  "
+                f"{ok:<12}{row['recall']:>7.2f}  {len(row['leaks'])}")
+        if args.jina:
+            jina = row.get("jina_error") or f"{row.get('jina_recall', 0):.2f}"
+            line += f"   {row['jina_ms']:>7.0f}  {jina}"
+        print(line)
+    mismatched = sum(row["ok"] != row["expected_ok"] for row in rows)
+    print(f"\nok mismatches: {mismatched}   pages with leaks: {sum(bool(row['leaks']) for row in rows)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Stub upstream CLIs for doctor benchmarks.
+
+One script stands in for every tool the doctor probes (twitter, xhs, rdt,
+gh, mcporter, yt-dlp, ...). ``install_stubs()`` writes a small launcher per
+tool into a bin directory; the launcher calls ``main(tool)`` here, which
+prints the strings the real tool prints for the doctor's probe commands.
+
+Behaviour is read from the JSON in $AGENT_REACH_STUB_SPEC, per tool with a
+``"*"`` fallback:
+
+    {"*": {"latency": 0.05}, "xhs": {"mode": "hang"}}
+
+    latency  seconds to sleep before answering
+    mode     ok | unauth | fail | hang
+
+Every invocation is appended to $AGENT_REACH_STUB_LOG so the harness can
+count spawned processes.
+"""
+
+import json
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+TOOLS = ("twitter", "xhs", "rdt", "gh", "mcporter", "yt-dlp", "deno", "bili", "ffmpeg")
+
+SPEC_ENV = "AGENT_REACH_STUB_SPEC"
+LOG_ENV = "AGENT_REACH_STUB_LOG"
+
+# How long a "hang" lasts; the doctor's timeouts should fire well before
+HANG_SECONDS = 3600
+
+_MCP_SERVERS = "exa\ndouyin\nweibo\nlinkedin\n"
+
+# (tool, first args) -> {mode: (exit code, stdout, stderr)}
+_RESPONSES: Dict[Tuple[str, ...], Dict[str, Tuple[int, str, str]]] = {
+    ("twitter", "status"): {
+        "ok": (0, "ok: true\nuser: bench\n", ""),
+        "unauth": (1, "ok: false\nerror: not_authenticated\n", ""),
+    },
+    ("xhs", "status"): {
+        "ok": (0, "ok: true\nuser: bench\n", ""),
+        "unauth": (1, "ok: false\nerror: not_authenticated\n", ""),
+    },
+    ("rdt", "status"): {
+        "ok": (0, json.dumps({"ok": True, "data": {"authenticated": True, "username": "bench"}}), ""),
+        "unauth": (0, json.dumps({"ok": True, "data": {"authenticated": False, "username": None}}), ""),
+    },
+    ("gh", "auth"): {
+        "ok": (0, "", "github.com\n  ✓ Logged in to github.com account bench\n"),
+        "unauth": (1, "", "You are not logged into any GitHub hosts. Run gh auth login\n"),
+    },
+    ("mcporter", "config"): {
+        "ok": (0, _MCP_SERVERS, ""),
+        "unauth": (0, "exa\n", ""),
+    },
+    ("mcporter", "list"): {
+        "ok": (0, "search_users\nget_trendings\nparse_douyin_video_info\n", ""),
+        "unauth": (1, "", "server not reachable\n"),
+    },
+    ("yt-dlp", "--version"): {"ok": (0, "2025.01.01\n", "")},
+    ("deno", "--version"): {"ok": (0, "deno 2.0.0\n", "")},
+    ("ffmpeg", "-version"): {"ok": (0, "ffmpeg version 7.0\n", "")},
+}
+
+
+def _spec(tool: str) -> dict:
+    try:
+        spec = json.loads(os.environ.get(SPEC_ENV) or "{}")
+    except ValueError:
+        spec = {}
+    merged = dict(spec.get("*") or {})
+    merged.update(spec.get(tool) or {})
+    return merged
+
+
+def _log(tool: str, args: Iterable[str]):
+    path = os.environ.get(LOG_ENV)
+    if not path:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps([tool, *args]) + "\n")
+
+
+def main(tool: str) -> int:
+    args = sys.argv[1:]
+    _log(tool, args)
+    spec = _spec(tool)
+    mode = spec.get("mode", "ok")
+    time.sleep(float(spec.get("latency", 0)))
+    if mode == "hang":
+        time.sleep(HANG_SECONDS)
+        return 1
+    if mode == "fail":
+        sys.stderr.write(f"{tool}: internal error\n")
+        return 2
+    responses = _RESPONSES.get((tool, *args[:1]), {})
+    code, out, err = responses.get(mode) or responses.get("ok") or (0, "", "")
+    sys.stdout.write(out)
+    sys.stderr.write(err)
+    return code
+
+
+_LAUNCHER = """#!{python}
+import sys
+sys.path.insert(0, {here!r})
+from stub_cli import main
+sys.exit(main({tool!r}))
+"""
+
+
+def install_stubs(bin_dir: Path, tools: Iterable[str] = TOOLS) -> Path:
+    """Write one executable launcher per tool into *bin_dir* and return it."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    here = str(Path(__file__).resolve().parent)
+    for tool in tools:
+        path = bin_dir / tool
+        path.write_text(
+            _LAUNCHER.format(python=sys.executable, here=here, tool=tool), encoding="utf-8",
+        )
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return bin_dir
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Shared test setup."""
+
+import pytest
+
+from agent_reach import api_cache
+from agent_reach.channels import v2ex
+
+
+@pytest.fixture(autouse=True)
+def _no_api_cache(monkeypatch):
+    """Channel tests serve different payloads for the same URLs, so the
+    per-endpoint response cache stays off (tests/test_api_cache.py builds
+    its own caches)."""
+    monkeypatch.setenv(api_cache.MODE_ENV, "off")
+    for cache in list(api_cache._registry):
+        monkeypatch.setattr(cache, "enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def _no_default_v2ex_mirror(monkeypatch):
+    """Keep V2EXChannel() away from a real ~/.agent-reach/v2ex.db."""
+    monkeypatch.setattr(v2ex, "_default_mirror", lambda: None)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""Tests for the per-endpoint JSON API response cache."""
+
+import threading
+
+import pytest
+
+import agent_reach.api_cache as api_cache
+from agent_reach.api_cache import ApiCache, CacheRule
+
+RULES = [
+    CacheRule(r"/quote\.json", ttl=5, stale=25, disk=False),
+    CacheRule(r"/hot\.json", ttl=300, stale=600),
+]
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(api_cache.time, "time", clock)
+    return clock
+
+
+class Fetcher:
+    def __init__(self):
+        self.calls = 0
+        self.done = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.done.set()
+        return {"n": self.calls}
+
+
+class TestApiCache:
+    def test_fresh_response_is_reused(self, clock):
+        cache, fetch = ApiCache(RULES), Fetcher()
+
+        assert cache.get("https://x/hot.json", fetch) == {"n": 1}
+        clock.now += 299
+        assert cache.get("https://x/hot.json", fetch) == {"n": 1}
+        assert fetch.calls == 1
+        assert cache.stats["hits"] == 1
+
+    def test_unmatched_urls_are_not_cached(self, clock):
+        cache, fetch = ApiCache(RULES), Fetcher()
+        cache.get("https://x/members.json", fetch)
+        cache.get("https://x/members.json", fetch)
+
+        assert fetch.calls == 2
+
+    def test_stale_response_is_served_while_refreshing(self, clock):
+        cache, fetch = ApiCache(RULES), Fetcher()
+        cache.get("https://x/quote.json", fetch)
+        fetch.done.clear()
+        clock.now += 10
+
+        assert cache.get("https://x/quote.json", fetch) == {"n": 1}  # stale, returned at once
+        assert fetch.done.wait(2)
+        for _ in range(200):
+            if not cache._refreshing:
+                break
+            threading.Event().wait(0.01)
+        assert cache.get("https://x/quote.json", fetch) == {"n": 2}
+        assert cache.stats["refreshes"] == 1
+
+    def test_expired_response_is_fetched_synchronously(self, clock):
+        cache, fetch = ApiCache(RULES), Fetcher()
+        cache.get("https://x/quote.json", fetch)
+        clock.now += 31
+
+        assert cache.get("https://x/quote.json", fetch) == {"n": 2}
+        assert cache.stats["misses"] == 2
+
+    def test_errors_are_not_cached(self, clock):
+        cache = ApiCache(RULES)
+
+        def fail():
+            raise OSError("down")
+
+        with pytest.raises(OSError):
+            cache.get("https://x/hot.json", fail)
+        assert cache.get("https://x/hot.json", Fetcher()) == {"n": 1}
+
+    def test_callers_get_their_own_copy(self, clock):
+        cache = ApiCache(RULES)
+        cache.get("https://x/hot.json", Fetcher())["n"] = 99
+
+        assert cache.get("https://x/hot.json", Fetcher()) == {"n": 1}
+
+    def test_lru_keeps_most_recently_used(self, clock):
+        cache, fetch = ApiCache(RULES, max_entries=2), Fetcher()
+        for name in ("a", "b", "a", "c"):
+            cache.get(f"https://x/hot.json?{name}", fetch)
+        cache.get("https://x/hot.json?a", fetch)
+        cache.get("https://x/hot.json?b", fetch)
+
+        assert fetch.calls == 4  # a, b, c, then b again
+
+    def test_disk_tier_survives_a_new_process(self, tmp_path, clock):
+        ApiCache(RULES, root=tmp_path).get("https://x/hot.json", Fetcher())
+        ApiCache(RULES, root=tmp_path).get("https://x/quote.json", Fetcher())
+        fetch = Fetcher()
+
+        assert ApiCache(RULES, root=tmp_path).get("https://x/hot.json", fetch) == {"n": 1}
+        assert fetch.calls == 0
+        assert len(list(tmp_path.glob("*.json"))) == 1  # quotes stay in memory
+
+    def test_error_payloads_are_not_cached(self, clock):
+        cache = ApiCache(RULES)
+        for payload in ({"success": False, "message": "Invalid token"},
+                        {"status": "error", "message": "Object Not Found"},
+                        {"message": "Rate limited"},
+                        {"error_code": "400016", "error_description": "重新登录"}):
+            cache.get("https://x/hot.json", lambda: payload)
+            assert cache.get("https://x/hot.json", Fetcher()) == {"n": 1}
+            cache.clear()
+        assert not api_cache.is_error_payload({"success": True, "message": "", "result": []})
+        assert not api_cache.is_error_payload({"data": {}, "error_code": 0, "error_description": ""})
+
+    def test_sweep_prunes_expired_and_oversized_disk_tier(self, tmp_path):
+        import os
+        import time
+
+        cache = ApiCache(RULES, root=tmp_path, max_disk_bytes=1000)
+        for n in range(5):
+            cache.get(f"https://x/hot.json?{n}", lambda: {"pad": "x" * 300})
+        files = sorted(tmp_path.glob("*.json"))
+        # One file is past ttl + stale; the rest are over the byte cap
+        os.utime(files[0], (time.time() - 901, time.time() - 901))
+        cache.sweep()
+
+        left = list(tmp_path.glob("*.json"))
+        assert files[0] not in left
+        assert sum(p.stat().st_size for p in left) <= 1000
+        assert left
+
+    def test_mode_from_environment(self, monkeypatch, tmp_path):
+        from agent_reach.config import Config
+
+        monkeypatch.setattr("agent_reach.config.Config", lambda: Config(config_path=tmp_path / "config.yaml"))
+        monkeypatch.setenv(api_cache.MODE_ENV, "disk")
+        assert api_cache.for_rules(RULES).root == tmp_path / api_cache.CACHE_DIRNAME
+        assert api_cache.for_rules(RULES, "v2ex").root == tmp_path / api_cache.CACHE_DIRNAME / "v2ex"
+        monkeypatch.setenv(api_cache.MODE_ENV, "off")
+        assert not api_cache.for_rules(RULES).enabled
+        monkeypatch.setenv(api_cache.MODE_ENV, "bogus")
+        cache = api_cache.for_rules(RULES)
+        assert cache.enabled and cache.root is None
+
+
+def test_v2ex_responses_are_cached(monkeypatch):
+    import json
+
+    import agent_reach.channels.v2ex as v2ex_mod
+    from agent_reach.channels.v2ex import V2EXChannel
+
+    calls = []
+
+    class FakeResponse:
+        headers = None
+        def __init__(self, payload): self._payload = payload
+        def __enter__(self): return self
+        def __exit__(self, *_): pass
+        def read(self): return json.dumps(self._payload).encode()
+
+    def fake_open(req, timeout=None):
+        calls.append(req.full_url)
+        if "members" in req.full_url:
+            return FakeResponse({"id": 1, "username": "alice"})
+        return FakeResponse([{"id": 1, "title": "t"}])
+
+    monkeypatch.setattr(v2ex_mod._opener, "open", fake_open)
+    monkeypatch.setattr(v2ex_mod, "_cache", ApiCache(v2ex_mod.CACHE_RULES))
+    ch = V2EXChannel(token="")
+    ch.get_hot_topics()
+    ch.get_hot_topics()
+    ch.get_user("alice")
+    ch.get_user("alice")
+
+    assert len(calls) == 2
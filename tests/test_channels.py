@@ -4,9 +4,12 @@
 import json
 import shutil
 import subprocess
+import sys
 from urllib.error import URLError
 
-from agent_reach.channels import get_all_channels, get_channel
+import agent_reach.channels as channels
+from agent_reach.channels import BUILTIN_SPECS, get_all_channels, get_channel
+from agent_reach.channels.base import Channel
 from agent_reach.channels.v2ex import V2EXChannel
 from agent_reach.channels.xiaohongshu import XiaoHongShuChannel
 from agent_reach.channels.xueqiu import XueqiuChannel
@@ -29,6 +32,95 @@ class TestChannelRegistry:
         assert "twitter" in names
         assert "v2ex" in names
 
+    def test_specs_match_channel_classes(self):
+        for spec in BUILTIN_SPECS:
+            ch = spec.load()
+            assert (spec.name, spec.tier) == (ch.name, ch.tier)
+            assert spec.hosts == ch.hosts
+            assert spec.path_markers == ch.path_markers
+            assert spec.catch_all == ch.catch_all
+
+    def test_get_channel_imports_only_that_channel(self):
+        code = (
+            "import sys\n"
+            "from agent_reach.channels import get_channel\n"
+            "get_channel('youtube')\n"
+            "print(sorted(m for m in sys.modules if m.startswith('agent_reach.channels.')))\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        loaded = json.loads(out.stdout.replace("'", '"'))
+        assert loaded == [
+            "agent_reach.channels.base",
+            "agent_reach.channels.hosts",
+            "agent_reach.channels.router",
+            "agent_reach.channels.youtube",
+        ]
+
+    def test_entry_point_plugin(self, monkeypatch):
+        class FakeEntryPoint:
+            def __init__(self, name, value):
+                self.name, self.value = name, value
+
+        class MastodonChannel(Channel):
+            name = "mastodon"
+            description = "Mastodon"
+            backends = []
+            hosts = ["mastodon.social"]
+
+        monkeypatch.setattr(sys.modules[__name__], "MastodonChannel", MastodonChannel, raising=False)
+        target = f"{__name__}:MastodonChannel"
+        monkeypatch.setattr(
+            "importlib.metadata.entry_points",
+            lambda group=None: [FakeEntryPoint("mastodon", target), FakeEntryPoint("github", target)],
+        )
+        monkeypatch.setattr(channels, "_plugin_specs", None)
+        monkeypatch.setattr(channels, "_all_channels", None)
+        monkeypatch.setattr(channels, "_router", None)
+
+        assert isinstance(get_channel("mastodon"), MastodonChannel)
+        # Built-ins win over plugins with the same name
+        assert get_channel("github").name == "github"
+        assert [ch.name for ch in get_all_channels()][-1] == "mastodon"
+        assert channels.route("https://mastodon.social/@someone").name == "mastodon"
+
+
+class TestRouter:
+    def test_routes_by_host_and_subdomain(self):
+        from agent_reach.channels import route
+
+        assert route("https://x.com/user/status/1").name == "twitter"
+        assert route("https://mobile.twitter.com/user").name == "twitter"
+        assert route("https://user@WWW.YouTube.com:443/watch?v=abc").name == "youtube"
+        assert route("https://mp.weixin.qq.com/s/abc").name == "wechat"
+        assert route("github.com/user/repo").name == "github"
+
+    def test_lookalike_hosts_are_not_misrouted(self):
+        from agent_reach.channels import route
+        from agent_reach.channels.twitter import TwitterChannel
+
+        assert route("https://notx.com/a").name == "web"
+        assert route("https://x.com.evil.example/a").name == "web"
+        assert not TwitterChannel().can_handle("https://notx.com/a")
+
+    def test_path_markers_then_catch_all(self):
+        from agent_reach.channels import route
+
+        assert route("https://example.com/feed.xml").name == "rss"
+        assert route("https://example.com/page?next=/feed").name == "web"
+        # A platform host wins over a feed-like path
+        assert route("https://github.com/user/repo/feed").name == "github"
+
+    def test_route_many_is_aligned_with_input(self):
+        from agent_reach.channels import route, route_many
+
+        urls = [
+            "https://www.v2ex.com/t/1",
+            "https://example.com/",
+            "https://www.v2ex.com/t/2",
+            "https://blog.example.com/rss",
+        ]
+        assert [ch.name for ch in route_many(urls)] == [route(u).name for u in urls]
+
 
 class TestV2EXChannel:
     def test_can_handle_v2ex_urls(self):
@@ -39,7 +131,7 @@ class TestV2EXChannel:
         assert not ch.can_handle("https://reddit.com/r/Python")
 
     def test_check_ok_when_api_reachable(self, monkeypatch):
-        import urllib.request
+        import agent_reach.channels.v2ex as v2ex_mod
 
         class FakeResponse:
             status = 200
@@ -53,22 +145,18 @@ class TestV2EXChannel:
             def read(self):
                 return b"[]"
 
-        monkeypatch.setattr(
-            urllib.request,
-            "urlopen",
-            lambda req, timeout=None: FakeResponse(),
-        )
+        monkeypatch.setattr(v2ex_mod._opener, "open", lambda req, timeout=None: FakeResponse())
         status, msg = V2EXChannel().check()
         assert status == "ok"
         assert "公开 API 可用" in msg
 
     def test_check_warn_when_api_unreachable(self, monkeypatch):
-        import urllib.request
+        import agent_reach.channels.v2ex as v2ex_mod
 
         def raise_error(req, timeout=None):
             raise URLError("connection refused")
 
-        monkeypatch.setattr(urllib.request, "urlopen", raise_error)
+        monkeypatch.setattr(v2ex_mod._opener, "open", raise_error)
         status, msg = V2EXChannel().check()
         assert status == "warn"
         assert "失败" in msg
@@ -78,7 +166,7 @@ class TestV2EXChannel:
     # ------------------------------------------------------------------ #
 
     def test_get_hot_topics_returns_list(self, monkeypatch):
-        import urllib.request
+        import agent_reach.channels.v2ex as v2ex_mod
 
         fake_data = [
             {
@@ -113,7 +201,7 @@ class TestV2EXChannel:
             def read(self):
                 return json.dumps(fake_data).encode()
 
-        monkeypatch.setattr(urllib.request, "urlopen", lambda req, timeout=None: FakeResponse())
+        monkeypatch.setattr(v2ex_mod._opener, "open", lambda req, timeout=None: FakeResponse())
         topics = V2EXChannel().get_hot_topics(limit=5)
         assert len(topics) == 2
         assert topics[0]["id"] == 111
@@ -124,7 +212,7 @@ class TestV2EXChannel:
         assert topics[0]["created"] == 1700000000
 
     def test_get_hot_topics_respects_limit(self, monkeypatch):
-        import urllib.request
+        import agent_reach.channels.v2ex as v2ex_mod
 
         fake_data = [
             {"id": i, "title": f"Topic {i}", "url": f"https://v2ex.com/t/{i}", "replies": i,
@@ -137,12 +225,12 @@ class TestV2EXChannel:
             def __exit__(self, *_): pass
             def read(self): return json.dumps(fake_data).encode()
 
-        monkeypatch.setattr(urllib.request, "urlopen", lambda req, timeout=None: FakeResponse())
+        monkeypatch.setattr(v2ex_mod._opener, "open", lambda req, timeout=None: FakeResponse())
         topics = V2EXChannel().get_hot_topics(limit=3)
         assert len(topics) == 3
 
     def test_get_hot_topics_truncates_content(self, monkeypatch):
-        import urllib.request
+        import agent_reach.channels.v2ex as v2ex_mod
 
         long_content = "A" * 300
         fake_data = [
@@ -155,7 +243,7 @@ class TestV2EXChannel:
             def __exit__(self, *_): pass
             def read(self): return json.dumps(fake_data).encode()
 
-        monkeypatch.setattr(urllib.request, "urlopen", lambda req, timeout=None: FakeResponse())
+        monkeypatch.setattr(v2ex_mod._opener, "open", lambda req, timeout=None: FakeResponse())
         topics = V2EXChannel().get_hot_topics(limit=1)
         assert len(topics[0]["content"]) == 200
 
@@ -164,7 +252,7 @@ class TestV2EXChannel:
     # ------------------------------------------------------------------ #
 
     def test_get_node_topics(self, monkeypatch):
-        import urllib.request
+        import agent_reach.channels.v2ex as v2ex_mod
 
         fake_data = [
             {
@@ -183,7 +271,7 @@ class TestV2EXChannel:
             def __exit__(self, *_): pass
             def read(self): return json.dumps(fake_data).encode()
 
-        monkeypatch.setattr(urllib.request, "urlopen", lambda req, timeout=None: FakeResponse())
+        monkeypatch.setattr(v2ex_mod._opener, "open", lambda req, timeout=None: FakeResponse())
         topics = V2EXChannel().get_node_topics("python")
         assert len(topics) == 1
         assert topics[0]["id"] == 333
@@ -196,7 +284,7 @@ class TestV2EXChannel:
     # ------------------------------------------------------------------ #
 
     def test_get_topic_returns_detail_and_replies(self, monkeypatch):
-        import urllib.request
+        import agent_reach.channels.v2ex as v2ex_mod
 
         topic_data = [
             {
@@ -237,7 +325,7 @@ class TestV2EXChannel:
                 return FakeResponse(replies_data)
             return FakeResponse(topic_data)
 
-        monkeypatch.setattr(urllib.request, "urlopen", fake_urlopen)
+        monkeypatch.setattr(v2ex_mod._opener, "open", fake_urlopen)
         result = V2EXChannel().get_topic(999)
 
         assert result["id"] == 999
@@ -249,7 +337,7 @@ class TestV2EXChannel:
         assert result["replies"][1]["content"] == "第二条回复"
 
     def test_get_topic_handles_empty_replies(self, monkeypatch):
-        import urllib.request
+        import agent_reach.channels.v2ex as v2ex_mod
 
         topic_data = [
             {
@@ -275,16 +363,150 @@ class TestV2EXChannel:
                 return FakeResponse([])
             return FakeResponse(topic_data)
 
-        monkeypatch.setattr(urllib.request, "urlopen", fake_urlopen)
+        monkeypatch.setattr(v2ex_mod._opener, "open", fake_urlopen)
         result = V2EXChannel().get_topic(1)
         assert result["replies"] == []
 
+    def _serve_thread(self, monkeypatch, replies_count, delays=None, shift=0):
+        """Serve a topic with *replies_count* replies, 100 per page; returns requested pages."""
+        import threading
+        import time
+
+        import agent_reach.channels.v2ex as v2ex_mod
+
+        replies = [
+            {"id": n, "member": {"username": f"u{n}"}, "content": f"#{n}", "created": n}
+            for n in range(1, replies_count + 1)
+        ]
+        requested = []
+        lock = threading.Lock()
+
+        class FakeResponse:
+            def __init__(self, payload): self._payload = payload
+            def __enter__(self): return self
+            def __exit__(self, *_): pass
+            def read(self): return json.dumps(self._payload).encode()
+
+        def fake_open(req, timeout=None):
+            url = req.full_url
+            if "replies" not in url:
+                return FakeResponse([{"id": 7, "title": "热帖", "replies": replies_count}])
+            page = int(url.rsplit("page=", 1)[1])
+            with lock:
+                requested.append(page)
+            time.sleep((delays or {}).get(page, 0))
+            # *shift* replies were deleted after page 1 was served
+            start = (page - 1) * 100 - (shift if page > 1 else 0)
+            return FakeResponse(replies[start:start + 100])
+
+        monkeypatch.setattr(v2ex_mod._opener, "open", fake_open)
+        return requested
+
+    def test_get_topic_all_replies_merges_pages_in_floor_order(self, monkeypatch):
+        # Page 1 is the slowest, so pages complete out of order
+        self._serve_thread(monkeypatch, 250, delays={1: 0.1})
+        result = V2EXChannel().get_topic(7, all_replies=True)
+
+        assert [r["content"] for r in result["replies"]] == [f"#{n}" for n in range(1, 251)]
+        assert [r["floor"] for r in result["replies"]] == list(range(1, 251))
+
+    def test_get_topic_all_replies_respects_max_pages(self, monkeypatch):
+        requested = self._serve_thread(monkeypatch, 450)
+        result = V2EXChannel().get_topic(7, all_replies=True, max_pages=2)
+
+        assert len(result["replies"]) == 200
+        assert sorted(requested) == [1, 2]
+
+    def test_reply_shifted_across_pages_is_not_repeated(self, monkeypatch):
+        self._serve_thread(monkeypatch, 150, shift=2)
+        floors = [r["content"] for r in V2EXChannel().get_topic(7, all_replies=True)["replies"]]
+
+        assert len(floors) == len(set(floors)) == 150
+
+    def test_iter_reply_pages_yields_page_by_page(self, monkeypatch):
+        requested = self._serve_thread(monkeypatch, 1000)
+        pages = V2EXChannel().iter_reply_pages(7, workers=2)
+
+        first = next(pages)
+        pages.close()
+
+        assert len(first) == 100 and first[0]["floor"] == 1
+        assert max(requested) <= 3
+
+    # ------------------------------------------------------------------ #
+    # get_topics
+    # ------------------------------------------------------------------ #
+
+    def _serve_topics(self, monkeypatch, delays=None, missing=()):
+        """Serve topics by ID (replies: one per topic); returns a peak-concurrency probe."""
+        import threading
+        import time
+        import urllib.error
+        import urllib.parse
+
+        import agent_reach.channels.v2ex as v2ex_mod
+
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+
+        class FakeResponse:
+            def __init__(self, payload): self._payload = payload
+            def __enter__(self): return self
+            def __exit__(self, *_): pass
+            def read(self): return json.dumps(self._payload).encode()
+
+        def fake_open(req, timeout=None):
+            url = req.full_url
+            query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+            topic_id = int((query.get("id") or query["topic_id"])[0])
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            try:
+                time.sleep((delays or {}).get(topic_id, 0.01))
+                if topic_id in missing:
+                    raise urllib.error.HTTPError(url, 404, "Not Found", None, None)
+                if "replies" in url:
+                    return FakeResponse([{"id": topic_id, "member": {"username": "u"}, "content": f"re {topic_id}"}])
+                return FakeResponse([{"id": topic_id, "title": f"T{topic_id}", "replies": 1}])
+            finally:
+                with lock:
+                    state["active"] -= 1
+
+        monkeypatch.setattr(v2ex_mod._opener, "open", fake_open)
+        return state
+
+    def test_get_topics_streams_results_as_they_complete(self, monkeypatch):
+        self._serve_topics(monkeypatch, delays={1: 0.2})
+        results = list(V2EXChannel(token="").get_topics([1, 2, 3]))
+
+        assert [r.topic_id for r in results][-1] == 1  # slowest topic comes last
+        by_id = {r.topic_id: r for r in results}
+        assert by_id[2].ok and by_id[2].topic["title"] == "T2"
+        assert by_id[2].topic["replies"][0]["content"] == "re 2"
+        assert by_id[2].position == 1
+
+    def test_get_topics_caps_concurrency(self, monkeypatch):
+        state = self._serve_topics(monkeypatch)
+        results = list(V2EXChannel(token="").get_topics(range(1, 13), workers=3))
+
+        assert len(results) == 12
+        assert state["peak"] <= 3
+
+    def test_get_topics_reports_errors_per_item(self, monkeypatch):
+        self._serve_topics(monkeypatch, missing={2})
+        results = {r.topic_id: r for r in V2EXChannel(token="").get_topics([1, 2, 3])}
+
+        assert not results[2].ok and results[2].topic is None
+        assert "404" in results[2].error
+        assert results[1].ok and results[3].ok
+
     # ------------------------------------------------------------------ #
     # get_user
     # ------------------------------------------------------------------ #
 
     def test_get_user_returns_profile(self, monkeypatch):
-        import urllib.request
+        import agent_reach.channels.v2ex as v2ex_mod
 
         fake_user = {
             "id": 42,
@@ -306,7 +528,7 @@ class TestV2EXChannel:
             def __exit__(self, *_): pass
             def read(self): return json.dumps(fake_user).encode()
 
-        monkeypatch.setattr(urllib.request, "urlopen", lambda req, timeout=None: FakeResponse())
+        monkeypatch.setattr(v2ex_mod._opener, "open", lambda req, timeout=None: FakeResponse())
         user = V2EXChannel().get_user("alice")
 
         assert user["id"] == 42
@@ -621,6 +843,28 @@ class TestXueqiuChannel:
         cookie_names = {c.name for c in xq_mod._cookie_jar}
         assert "xq_a_token" in cookie_names
 
+    def test_homepage_fallback_releases_its_connection(self, monkeypatch):
+        """The homepage visit must read and close its response so the
+        pooled connection is reused."""
+        import agent_reach.channels.xueqiu as xq_mod
+
+        monkeypatch.setattr(xq_mod, "_cookies_initialized", False)
+        monkeypatch.setattr(xq_mod, "_load_cookies_from_config", lambda: False)
+        monkeypatch.setattr(xq_mod, "_load_cookies_from_browser", lambda: False)
+        events = []
+
+        class FakeResp:
+            def __enter__(self): return self
+            def __exit__(self, *_): events.append("closed")
+            def read(self):
+                events.append("read")
+                return b"<html></html>"
+
+        monkeypatch.setattr(xq_mod._opener, "open", lambda req, timeout=None: FakeResp())
+
+        xq_mod._ensure_cookies()
+        assert events == ["read", "closed"]
+
     def test_get_json_sends_referer_and_browser_ua(self, monkeypatch):
         """_get_json() must send Referer and a browser-like User-Agent."""
         import agent_reach.channels.xueqiu as xueqiu_mod
@@ -703,6 +947,36 @@ class TestRedditChannel:
         status, msg = RedditChannel().check()
         assert status == "warn"
 
+    def test_config_level_reads_credential_file(self, monkeypatch, tmp_path):
+        from agent_reach.channels.reddit import RedditChannel
+        from agent_reach.probe import ProbeContext
+
+        cred = tmp_path / ".config" / "rdt-cli" / "credential.json"
+        cred.parent.mkdir(parents=True)
+        cred.write_text(json.dumps({
+            "cookies": {"reddit_session": "abc"}, "username": "testuser",
+        }), encoding="utf-8")
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setattr(shutil, "which", lambda _: "/usr/local/bin/rdt")
+
+        def fake_run(cmd, **kwargs):
+            raise AssertionError("config level must not spawn rdt")
+
+        monkeypatch.setattr(subprocess, "run", fake_run)
+        status, msg = RedditChannel().check(probe=ProbeContext(level="config"))
+        assert status == "ok"
+        assert "testuser" in msg
+
+    def test_config_level_warns_without_saved_session(self, monkeypatch, tmp_path):
+        from agent_reach.channels.reddit import RedditChannel
+        from agent_reach.probe import ProbeContext
+
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setattr(shutil, "which", lambda _: "/usr/local/bin/rdt")
+        status, msg = RedditChannel().check(probe=ProbeContext(level="config"))
+        assert status == "warn"
+        assert "rdt login" in msg
+
     def test_can_handle_reddit_urls(self):
         from agent_reach.channels.reddit import RedditChannel
         ch = RedditChannel()
@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
 """Tests for Agent Reach CLI."""
 
+import subprocess
+import sys
+from unittest.mock import patch
+
 import pytest
 import requests
-from unittest.mock import patch
-import agent_reach.cli as cli
+
 from agent_reach.cli import main
+from agent_reach.commands import configure, update
 
 
 class TestCLI:
@@ -30,19 +34,70 @@ class TestCLI:
         assert "Agent Reach" in captured.out
         assert "✅" in captured.out
 
+    def test_doctor_rejects_non_positive_timeout(self, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            with patch("sys.argv", ["agent-reach", "doctor", "--timeout", "0"]):
+                main()
+        assert exc_info.value.code == 2
+        assert "--timeout" in capsys.readouterr().err
+
     def test_parse_twitter_cookie_input_separate_values(self):
-        auth_token, ct0 = cli._parse_twitter_cookie_input("token123 ct0abc")
+        auth_token, ct0 = configure._parse_twitter_cookie_input("token123 ct0abc")
         assert auth_token == "token123"
         assert ct0 == "ct0abc"
 
     def test_parse_twitter_cookie_input_cookie_header(self):
-        auth_token, ct0 = cli._parse_twitter_cookie_input(
+        auth_token, ct0 = configure._parse_twitter_cookie_input(
             "auth_token=token123; ct0=ct0abc; other=value"
         )
         assert auth_token == "token123"
         assert ct0 == "ct0abc"
 
 
+# Dependencies that cost ~20-60 ms of import time each; commands that do
+# not need them must not pull them in
+HEAVY_MODULES = {"rich", "loguru", "yaml", "requests"}
+
+
+def _cli_imports(*argv):
+    """Run the CLI under -X importtime.
+
+    Returns (names of every module imported by main(), completed process).
+    """
+    code = (
+        "import sys\n"
+        "sys.stderr.write('--start--\\n'); sys.stderr.flush()\n"
+        f"sys.argv = ['agent-reach', *{list(argv)!r}]\n"
+        "from agent_reach.cli import main\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, stdin=subprocess.DEVNULL, check=True,
+    )
+    names = set()
+    for line in proc.stderr.split("--start--\n", 1)[1].splitlines():
+        if line.startswith("import time:"):
+            names.add(line.split("|")[2].strip())
+    return names, proc
+
+
+class TestStartupBudget:
+    def test_version_imports_only_the_cli(self):
+        names, proc = _cli_imports("version")
+        assert "Agent Reach v" in proc.stdout
+        # No subcommand, channel or config module
+        assert {n for n in names if n.startswith("agent_reach")} <= {"agent_reach", "agent_reach.cli"}
+
+    @pytest.mark.parametrize("argv", [("version",), ("--help",), ("format", "xhs")])
+    def test_light_commands_skip_heavy_dependencies(self, argv):
+        names, _ = _cli_imports(*argv)
+        assert not {n.split(".")[0] for n in names} & HEAVY_MODULES
+
+
 class TestCheckUpdateRetry:
     def test_retry_timeout_classification(self):
         sleeps = []
@@ -51,7 +106,7 @@ class TestCheckUpdateRetry:
             sleeps.append(seconds)
 
         with patch("requests.get", side_effect=requests.exceptions.Timeout("timed out")):
-            resp, err, attempts = cli._github_get_with_retry(
+            resp, err, attempts = update._github_get_with_retry(
                 "https://api.github.com/test",
                 timeout=1,
                 retries=3,
@@ -66,7 +121,7 @@ class TestCheckUpdateRetry:
     def test_retry_dns_classification(self):
         error = requests.exceptions.ConnectionError("getaddrinfo failed for api.github.com")
         with patch("requests.get", side_effect=error):
-            resp, err, attempts = cli._github_get_with_retry(
+            resp, err, attempts = update._github_get_with_retry(
                 "https://api.github.com/test",
                 retries=1,
                 sleeper=lambda _x: None,
@@ -93,7 +148,7 @@ class TestCheckUpdateRetry:
         ]
 
         with patch("requests.get", side_effect=sequence):
-            resp, err, attempts = cli._github_get_with_retry(
+            resp, err, attempts = update._github_get_with_retry(
                 "https://api.github.com/test",
                 retries=3,
                 sleeper=lambda s: sleeps.append(s),
@@ -114,11 +169,11 @@ class TestCheckUpdateRetry:
             def json():
                 return {"message": "API rate limit exceeded"}
 
-        assert cli._classify_github_response_error(R()) == "rate_limit"
+        assert update._classify_github_response_error(R()) == "rate_limit"
 
     def test_check_update_reports_classified_error(self, capsys):
-        with patch("agent_reach.cli._github_get_with_retry", return_value=(None, "timeout", 3)):
-            result = cli._cmd_check_update()
+        with patch("agent_reach.commands.update._github_get_with_retry", return_value=(None, "timeout", 3)):
+            result = update.run()
 
         captured = capsys.readouterr()
         assert result == "error"
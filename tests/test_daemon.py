@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Tests for the warm-status daemon (agent-reach watch --daemon)."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+import agent_reach.doctor as doctor
+from agent_reach.config import Config
+from agent_reach.daemon import StatusDaemon, query_status
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available"
+)
+
+
+class _CountingChannel:
+    description = "Twitter/X 推文"
+    tier = 1
+    backends = ["twitter-cli"]
+    probe_binaries = ["twitter"]
+
+    def __init__(self):
+        self.name = "twitter"
+        self.calls = 0
+
+    def check(self, config=None):
+        self.calls += 1
+        return "ok", "可用"
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def channel(monkeypatch):
+    ch = _CountingChannel()
+    monkeypatch.setattr(doctor, "get_all_channels", lambda: [ch])
+    return ch
+
+
+@pytest.fixture
+def daemon(tmp_path, channel):
+    config = Config(config_path=tmp_path / "config.yaml")
+    d = StatusDaemon(config, socket_path=tmp_path / "doctor.sock", interval=3600, poll=0.05)
+    thread = threading.Thread(target=d.serve_forever, daemon=True)
+    thread.start()
+    yield d
+    d.stop()
+    thread.join(timeout=3)
+
+
+class TestStatusDaemon:
+    def test_serves_status_over_socket(self, daemon, channel):
+        assert _wait_for(lambda: (query_status(daemon.socket_path) or {}).get("results"))
+
+        payload = query_status(daemon.socket_path)
+
+        assert payload["results"]["twitter"]["status"] == "ok"
+        assert payload["updated_at"] > 0
+        assert channel.calls == 1
+
+    def test_reprobes_when_binary_appears(self, daemon, channel, monkeypatch):
+        assert _wait_for(lambda: channel.calls == 1)
+
+        monkeypatch.setattr(
+            "shutil.which", lambda cmd: "/usr/local/bin/twitter" if cmd == "twitter" else None
+        )
+
+        assert _wait_for(lambda: channel.calls == 2)
+
+    def test_removes_socket_on_stop(self, tmp_path, channel):
+        config = Config(config_path=tmp_path / "config.yaml")
+        d = StatusDaemon(config, socket_path=tmp_path / "doctor.sock", poll=0.05)
+        thread = threading.Thread(target=d.serve_forever, daemon=True)
+        thread.start()
+        assert _wait_for(lambda: (tmp_path / "doctor.sock").exists())
+
+        d.stop()
+        thread.join(timeout=3)
+
+        assert not (tmp_path / "doctor.sock").exists()
+        assert query_status(tmp_path / "doctor.sock") is None
+
+    def test_survives_invalid_config_and_recovers(self, tmp_path, daemon, channel, capsys):
+        assert _wait_for(lambda: channel.calls == 1)
+        config_path = tmp_path / "config.yaml"
+
+        config_path.write_text("groq_api_key: [unclosed\n", encoding="utf-8")
+        assert _wait_for(lambda: "config.yaml" in capsys.readouterr().err)
+        assert _wait_for(lambda: (query_status(daemon.socket_path) or {}).get("results"))
+
+        config_path.write_text("groq_api_key: gsk_test\n", encoding="utf-8")
+        assert _wait_for(lambda: daemon.config.get("groq_api_key") == "gsk_test")
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """Tests for doctor module."""
 
+import threading
+import time
+
 import pytest
 
 import agent_reach.doctor as doctor
@@ -20,6 +23,21 @@ class _StubChannel:
         return self._status, self._message
 
 
+class _SlowChannel(_StubChannel):
+    def __init__(self, name, delay, **kwargs):
+        super().__init__(name, name, 0, "ok", f"{name} ok", **kwargs)
+        self._delay = delay
+
+    def check(self, config=None):
+        time.sleep(self._delay)
+        return super().check(config)
+
+
+class _RaisingChannel(_StubChannel):
+    def check(self, config=None):
+        raise RuntimeError("boom")
+
+
 @pytest.fixture
 def tmp_config(tmp_path):
     return Config(config_path=tmp_path / "config.yaml")
@@ -63,6 +81,82 @@ class TestDoctor:
             },
         }
 
+    def test_check_all_runs_checks_concurrently(self, tmp_config, monkeypatch):
+        barrier = threading.Barrier(3, timeout=2)
+
+        class _BarrierChannel(_StubChannel):
+            def check(self, config=None):
+                barrier.wait()  # only passes if all three checks run at once
+                return super().check(config)
+
+        monkeypatch.setattr(
+            doctor,
+            "get_all_channels",
+            lambda: [_BarrierChannel(n, n, 0, "ok", "ok") for n in ("a", "b", "c")],
+        )
+
+        results = doctor.check_all(tmp_config)
+
+        assert [r["status"] for r in results.values()] == ["ok", "ok", "ok"]
+
+    def test_check_all_keeps_registry_order(self, tmp_config, monkeypatch):
+        monkeypatch.setattr(
+            doctor,
+            "get_all_channels",
+            lambda: [_SlowChannel("slow", 0.2), _SlowChannel("fast", 0)],
+        )
+
+        results = doctor.check_all(tmp_config)
+
+        assert list(results) == ["slow", "fast"]
+
+    def test_check_all_reports_timeout_past_channel_deadline(self, tmp_config, monkeypatch):
+        monkeypatch.setattr(
+            doctor,
+            "get_all_channels",
+            lambda: [_SlowChannel("hung", 5), _SlowChannel("fast", 0)],
+        )
+
+        start = time.monotonic()
+        results = doctor.check_all(tmp_config, timeout=0.2)
+
+        assert time.monotonic() - start < 2
+        assert results["hung"]["status"] == "timeout"
+        assert "超时" in results["hung"]["message"]
+        assert results["fast"]["status"] == "ok"
+
+    def test_check_all_budget_times_out_remaining_checks(self, tmp_config, monkeypatch):
+        monkeypatch.setattr(
+            doctor,
+            "get_all_channels",
+            lambda: [_SlowChannel("hung", 5), _SlowChannel("fast", 0)],
+        )
+
+        results = doctor.check_all(tmp_config, timeout=None, budget=0.2)
+
+        assert results["hung"]["status"] == "timeout"
+        assert "预算" in results["hung"]["message"]
+        assert results["fast"]["status"] == "ok"
+
+    def test_check_all_reports_error_when_check_raises(self, tmp_config, monkeypatch):
+        monkeypatch.setattr(
+            doctor,
+            "get_all_channels",
+            lambda: [_RaisingChannel("broken", "坏渠道", 0, "ok", "")],
+        )
+
+        results = doctor.check_all(tmp_config)
+
+        assert results["broken"]["status"] == "error"
+        assert "boom" in results["broken"]["message"]
+
+    def test_iter_checks_yields_in_completion_order(self, tmp_config):
+        channels = [_SlowChannel("slow", 0.2), _SlowChannel("fast", 0)]
+
+        names = [ch.name for ch, *_rest in doctor.iter_checks(tmp_config, channels)]
+
+        assert names == ["fast", "slow"]
+
     def test_format_report(self):
         report = doctor.format_report(
             {
@@ -98,3 +192,251 @@ class TestDoctor:
         assert "1/3 个渠道可用" in plain
         # Inactive optional channels should be summarized in one line
         assert "可选渠道可以解锁" in plain
+
+
+class _CountingChannel(_StubChannel):
+    env_vars = ["AGENT_REACH_TEST_TOKEN"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def check(self, config=None):
+        self.calls += 1
+        return super().check(config)
+
+
+class TestDoctorCache:
+    def test_cached_run_skips_probe(self, tmp_config, monkeypatch):
+        ch = _CountingChannel("twitter", "Twitter", 1, "ok", "可用")
+        monkeypatch.setattr(doctor, "get_all_channels", lambda: [ch])
+
+        doctor.check_all(tmp_config)
+        results = doctor.check_all(tmp_config, max_age=600)
+
+        assert ch.calls == 1
+        assert results["twitter"]["status"] == "ok"
+        assert results["twitter"]["message"] == "可用"
+
+    def test_fingerprint_change_forces_reprobe(self, tmp_config, monkeypatch):
+        ch = _CountingChannel("twitter", "Twitter", 1, "ok", "可用")
+        monkeypatch.setattr(doctor, "get_all_channels", lambda: [ch])
+
+        doctor.check_all(tmp_config)
+        monkeypatch.setenv("AGENT_REACH_TEST_TOKEN", "new-token")
+        doctor.check_all(tmp_config, max_age=600)
+
+        assert ch.calls == 2
+
+    def test_live_run_ignores_cache(self, tmp_config, monkeypatch):
+        ch = _CountingChannel("twitter", "Twitter", 1, "ok", "可用")
+        monkeypatch.setattr(doctor, "get_all_channels", lambda: [ch])
+
+        doctor.check_all(tmp_config)
+        doctor.check_all(tmp_config)
+
+        assert ch.calls == 2
+
+    def test_negative_results_expire_sooner(self, tmp_path):
+        from agent_reach.doctor_cache import NEGATIVE_TTL, DoctorCache
+
+        cache = DoctorCache(tmp_path / "cache.json")
+        cache.store("ok", "fp", "ok", "可用", now=1000)
+        cache.store("bad", "fp", "warn", "未登录", now=1000)
+        cache.save()
+
+        reloaded = DoctorCache(tmp_path / "cache.json")
+        later = 1000 + NEGATIVE_TTL + 1
+        assert reloaded.lookup("ok", "fp", max_age=600, now=later) == ("ok", "可用")
+        assert reloaded.lookup("bad", "fp", max_age=600, now=later) is None
+
+    def test_timeouts_are_not_cached(self, tmp_path):
+        from agent_reach.doctor_cache import DoctorCache
+
+        cache = DoctorCache(tmp_path / "cache.json")
+        cache.store("slow", "fp", "timeout", "检查超时", now=1000)
+
+        assert cache.lookup("slow", "fp", max_age=600, now=1000) is None
+
+
+class _ProbingChannel(_StubChannel):
+    def check(self, config=None, probe=None):
+        probe.which("gh")
+        probe.run(["/usr/bin/gh", "auth", "status"], timeout=5)
+        return super().check(config)
+
+
+class TestDoctorProfile:
+    def test_profile_records_wall_time_and_probe_steps(self, tmp_config, monkeypatch):
+        import subprocess
+
+        monkeypatch.setattr("shutil.which", lambda cmd: f"/usr/bin/{cmd}")
+        monkeypatch.setattr(
+            "subprocess.run",
+            lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 0, "", ""),
+        )
+        monkeypatch.setattr(
+            doctor,
+            "get_all_channels",
+            lambda: [_ProbingChannel("github", "GitHub", 0, "ok", "可用")],
+        )
+
+        results = doctor.check_all(tmp_config, profile=True)
+
+        prof = results["github"]["profile"]
+        assert prof["elapsed_ms"] >= 0
+        assert prof["cached"] is False
+        assert [(s["step"], s["target"]) for s in prof["steps"]] == [
+            ("which", "gh"),
+            ("run", "gh auth status"),
+        ]
+        assert all("ms" in s for s in prof["steps"])
+        assert "耗时" in doctor.format_profile(results)
+
+    def test_profile_is_omitted_by_default(self, tmp_config, monkeypatch):
+        monkeypatch.setattr(
+            doctor,
+            "get_all_channels",
+            lambda: [_StubChannel("web", "网页", 0, "ok", "可用")],
+        )
+
+        results = doctor.check_all(tmp_config)
+
+        assert "profile" not in results["web"]
+
+    def test_cli_profile_json_output(self, tmp_config, monkeypatch, capsys):
+        import json
+        from unittest.mock import patch
+
+        import agent_reach.cli as cli
+
+        monkeypatch.setattr(
+            doctor,
+            "get_all_channels",
+            lambda: [_StubChannel("web", "网页", 0, "ok", "可用")],
+        )
+        monkeypatch.setattr("agent_reach.config.Config", lambda: tmp_config)
+        monkeypatch.setattr("agent_reach.commands.doctor._install_skill", lambda: print("Skill installed"))
+
+        with patch("sys.argv", ["agent-reach", "doctor", "--profile", "--json"]):
+            cli.main()
+
+        data = json.loads(capsys.readouterr().out)
+        assert data["web"]["status"] == "ok"
+        assert "elapsed_ms" in data["web"]["profile"]
+
+
+class TestDoctorStream:
+    def test_iter_results_yields_cached_then_completion_order(self, tmp_config, monkeypatch):
+        slow, fast = _SlowChannel("slow", 0.2), _SlowChannel("fast", 0)
+        cached = _CountingChannel("cached", "缓存渠道", 0, "ok", "可用")
+        cached.env_vars = []
+        monkeypatch.setattr(doctor, "get_all_channels", lambda: [slow, fast, cached])
+        doctor.check_all(tmp_config)
+        slow.env_vars = fast.env_vars = ["AGENT_REACH_TEST_TOKEN"]
+        monkeypatch.setenv("AGENT_REACH_TEST_TOKEN", "changed")
+
+        names = [name for name, _entry in doctor.iter_results(tmp_config, max_age=600)]
+
+        assert names == ["cached", "fast", "slow"]
+        assert cached.calls == 1
+
+    def test_cli_stream_emits_ndjson_with_summary(self, tmp_config, monkeypatch, capsys):
+        import json
+        from unittest.mock import patch
+
+        import agent_reach.cli as cli
+
+        monkeypatch.setattr(
+            doctor,
+            "get_all_channels",
+            lambda: [_SlowChannel("slow", 0.1), _StubChannel("gh", "GitHub", 0, "warn", "未认证")],
+        )
+        monkeypatch.setattr("agent_reach.config.Config", lambda: tmp_config)
+        monkeypatch.setattr("agent_reach.commands.doctor._install_skill", lambda: print("Skill installed"))
+
+        with patch("sys.argv", ["agent-reach", "doctor", "--stream"]):
+            cli.main()
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line.get("channel") for line in lines[:2]] == ["gh", "slow"]
+        assert lines[0]["status"] == "warn"
+        assert lines[-1]["type"] == "summary"
+        assert lines[-1]["ok"] == 1
+        assert lines[-1]["total"] == 2
+
+
+class TestDoctorLevels:
+    def test_presence_level_spawns_nothing_and_stays_offline(self, tmp_config, monkeypatch):
+        import shutil
+        import subprocess
+        import urllib.request
+
+        def forbidden(*args, **kwargs):
+            raise AssertionError("presence level must not spawn or fetch")
+
+        monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+        monkeypatch.setattr(subprocess, "run", forbidden)
+        monkeypatch.setattr(urllib.request, "urlopen", forbidden)
+        from agent_reach.transport import Transport
+        monkeypatch.setattr(Transport, "open", forbidden)
+
+        results = doctor.check_all(tmp_config, level="presence")
+
+        assert all(r["status"] != "error" for r in results.values()), results
+
+    def test_config_level_reads_mcporter_config_instead_of_spawning(self, tmp_config, tmp_path, monkeypatch):
+        import json
+        import shutil
+        import subprocess
+
+        home = tmp_path / "home"
+        (home / ".mcporter").mkdir(parents=True)
+        (home / ".mcporter" / "mcporter.json").write_text(
+            json.dumps({"mcpServers": {"exa": {"baseUrl": "https://mcp.exa.ai/mcp"}}}),
+            encoding="utf-8",
+        )
+        monkeypatch.setenv("HOME", str(home))
+        monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+
+        def forbidden(*args, **kwargs):
+            raise AssertionError("config level must not spawn")
+
+        monkeypatch.setattr(subprocess, "run", forbidden)
+        from agent_reach.channels.douyin import DouyinChannel
+        from agent_reach.channels.exa_search import ExaSearchChannel
+        from agent_reach.probe import ProbeContext
+
+        probe = ProbeContext(level="config")
+        assert ExaSearchChannel().check(tmp_config, probe=probe)[0] == "ok"
+        assert DouyinChannel().check(tmp_config, probe=probe)[0] == "off"
+
+    def test_deeper_cached_result_satisfies_shallower_level(self, tmp_path):
+        from agent_reach.doctor_cache import DoctorCache
+
+        cache = DoctorCache(tmp_path / "cache.json")
+        cache.store("live", "fp", "ok", "可用", now=1000, level="live")
+        cache.store("shallow", "fp", "ok", "已安装", now=1000, level="presence")
+
+        assert cache.lookup("live", "fp", max_age=600, now=1000, level="config") == ("ok", "可用")
+        assert cache.lookup("shallow", "fp", max_age=600, now=1000, level="config") is None
+
+    def test_cli_level_flag(self, tmp_config, monkeypatch, capsys):
+        import json
+        import sys
+
+        from agent_reach import cli
+
+        captured = {}
+
+        def fake_check_all(config, **kwargs):
+            captured.update(kwargs)
+            return {}
+
+        monkeypatch.setattr(doctor, "check_all", fake_check_all)
+        monkeypatch.setattr("agent_reach.commands.doctor._install_skill", lambda: None)
+        monkeypatch.setattr(sys, "argv", ["agent-reach", "doctor", "--level", "config", "--json"])
+        cli.main()
+
+        assert captured["level"] == "config"
+        assert json.loads(capsys.readouterr().out) == {}
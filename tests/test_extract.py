@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Tests for local HTML extraction and WebChannel's read backends."""
+
+import json
+import threading
+from email.message import Message
+from pathlib import Path
+
+import pytest
+
+import agent_reach.channels.web as web
+from agent_reach.channels.web import WebChannel
+from agent_reach.extract import extract
+from agent_reach.web_cache import WebCache
+
+CORPUS = Path(__file__).resolve().parent.parent / "benchmarks" / "extract_corpus"
+SPEC = json.loads((CORPUS / "corpus.json").read_text(encoding="utf-8"))
+
+ARTICLE = (CORPUS / "blog_post.html").read_text(encoding="utf-8")
+SPA = (CORPUS / "spa_shell.html").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("name", sorted(SPEC))
+def test_corpus(name):
+    spec = SPEC[name]
+    result = extract((CORPUS / name).read_text(encoding="utf-8"), spec["url"])
+
+    assert result.ok is spec["ok"]
+    for snippet in spec["must"]:
+        assert snippet in result.markdown
+    for snippet in spec["must_not"]:
+        assert snippet not in result.markdown
+
+
+def test_markdown_uses_jina_preamble():
+    result = extract(ARTICLE, "https://engineering.example.com/blog/sqlite-queue")
+
+    assert result.markdown.startswith(
+        "Title: Why we moved our queue to SQLite — Example Engineering\n\n"
+        "URL Source: https://engineering.example.com/blog/sqlite-queue\n\n"
+        "Markdown Content:\n# Why we moved"
+    )
+
+
+def test_nested_lists_and_implicit_closes():
+    html = "<main>" + "<p>Intro text that is long enough to matter. " * 10 + \
+        "<ul><li>One<li>Two<ul><li>Nested</ul></ul></main>"
+    markdown = extract(html).markdown
+
+    assert "- One\n- Two\n  - Nested" in markdown
+
+
+# Unclosed tags: 3000 levels under <main>, deeper than the recursion limit
+DEEP = "<html><body><main>" + "<div>" * 3000 + "<p>" + "Deeply nested text, " * 30 + "</p></body></html>"
+
+
+def test_tree_walks_survive_deep_nesting():
+    from agent_reach.extract import _pick_content, _prune, _TreeBuilder
+
+    builder = _TreeBuilder()
+    builder.feed(DEEP)
+    builder.close()
+    _prune(builder.root)
+
+    assert sum(1 for n in builder.root.iter() if n.tag == "div") == 3000
+    assert "Deeply nested text" in builder.root.text()
+    assert _pick_content(builder.root).tag == "main"
+
+
+class _FakeResponse:
+    def __init__(self, body: str, content_type: str):
+        self._body = body.encode("utf-8")
+        self.headers = Message()
+        self.headers["Content-Type"] = content_type
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def read(self, size=-1):
+        return self._body
+
+
+@pytest.fixture
+def sites(monkeypatch):
+    """Origin pages from a dict; every Jina request returns "# via jina"."""
+    origin = {}
+    requests = []
+
+    def fake_open(req, timeout=None):
+        requests.append(req.full_url)
+        if req.full_url.startswith("https://r.jina.ai/"):
+            return _FakeResponse("# via jina", "text/plain")
+        body, content_type = origin[req.full_url]
+        return _FakeResponse(body, content_type)
+
+    monkeypatch.setattr(web._opener, "open", fake_open)
+    monkeypatch.setattr(web, "_thin_hosts", set())
+    return origin, requests
+
+
+class TestBackends:
+    def test_auto_prefers_local_extraction(self, sites):
+        origin, requests = sites
+        origin["https://blog.example.com/post"] = (ARTICLE, "text/html; charset=utf-8")
+
+        page = WebChannel().read_page("https://blog.example.com/post", backend="auto")
+
+        assert page.backend == "local"
+        assert "# Why we moved our queue to SQLite" in page.text
+        assert requests == ["https://blog.example.com/post"]
+
+    def test_auto_falls_back_to_jina_and_remembers_thin_hosts(self, sites):
+        origin, requests = sites
+        origin["https://app.example.com/a"] = (SPA, "text/html")
+        origin["https://app.example.com/b"] = (SPA, "text/html")
+
+        first = WebChannel().read_page("https://app.example.com/a", backend="auto")
+        second = WebChannel().read_page("https://app.example.com/b", backend="auto")
+
+        assert (first.backend, second.backend) == ("jina", "jina")
+        assert requests == [
+            "https://app.example.com/a",
+            "https://r.jina.ai/https://app.example.com/a",
+            "https://r.jina.ai/https://app.example.com/b",
+        ]
+
+    def test_auto_falls_back_to_jina_on_deeply_nested_page(self, sites):
+        origin, requests = sites
+        origin["https://deep.example.com/"] = (DEEP, "text/html")
+
+        page = WebChannel().read_page("https://deep.example.com/", backend="auto")
+
+        assert page.backend == "jina"
+        assert requests[-1] == "https://r.jina.ai/https://deep.example.com/"
+
+    def test_local_rejects_non_html(self, sites):
+        origin, _ = sites
+        origin["https://example.com/data.json"] = ('{"a": 1}', "application/json")
+
+        with pytest.raises(ValueError, match="HTML"):
+            WebChannel().read_page("https://example.com/data.json", backend="local")
+
+    def test_race_returns_the_first_usable_result(self, sites, monkeypatch):
+        origin, _ = sites
+        origin["https://blog.example.com/post"] = (ARTICLE, "text/html")
+        release = threading.Event()
+        fetch = web.WebChannel._fetch
+
+        def slow_jina(self, *args, **kwargs):
+            release.wait(5)
+            return fetch(self, *args, **kwargs)
+
+        monkeypatch.setattr(web.WebChannel, "_fetch", slow_jina)
+        try:
+            page = WebChannel().read_page("https://blog.example.com/post", backend="race")
+        finally:
+            release.set()
+            # Let the losing Jina read finish while this test's opener is patched,
+            # or it lands in the next test's request log
+            for thread in threading.enumerate():
+                if thread.name.startswith("web-race"):
+                    thread.join(5)
+
+        assert page.backend == "local"
+
+    def test_backends_are_cached_separately(self, sites):
+        origin, requests = sites
+        origin["https://blog.example.com/post"] = (ARTICLE, "text/html")
+        cache = WebCache()
+
+        local = WebChannel().read_page("https://blog.example.com/post", cache=cache, backend="local")
+        again = WebChannel().read_page("https://blog.example.com/post", cache=cache, backend="local")
+        jina = WebChannel().read_page("https://blog.example.com/post", cache=cache)
+
+        assert again == local and again.backend == "local"
+        assert jina.backend == "jina"
+        assert len(requests) == 2
+
+    def test_cli_reports_backend(self, sites, capsys):
+        from unittest.mock import patch
+
+        from agent_reach.cli import main
+
+        origin, _ = sites
+        origin["https://blog.example.com/post"] = (ARTICLE, "text/html")
+        argv = ["agent-reach", "read", "https://blog.example.com/post", "--no-cache", "--backend", "auto"]
+        with patch("sys.argv", argv):
+            main()
+
+        captured = capsys.readouterr()
+        assert "# Why we moved our queue to SQLite" in captured.out
+        assert "local" in captured.err
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""Tests for the shared doctor probe context."""
+
+import subprocess
+import threading
+import time
+
+import pytest
+
+from agent_reach.probe import HttpProbe, ProbeContext
+
+
+class _FakeResponse:
+    status = 200
+
+    def __init__(self, body=b"{}"):
+        self._body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def read(self):
+        return self._body
+
+
+class TestProbeContext:
+    def test_which_is_memoized(self, monkeypatch):
+        calls = []
+
+        def fake_which(name):
+            calls.append(name)
+            return f"/usr/bin/{name}"
+
+        monkeypatch.setattr("shutil.which", fake_which)
+        probe = ProbeContext()
+
+        assert probe.which("yt-dlp") == "/usr/bin/yt-dlp"
+        assert probe.which("yt-dlp") == "/usr/bin/yt-dlp"
+        assert calls == ["yt-dlp"]
+
+    def test_run_is_single_flight_across_threads(self, monkeypatch):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            time.sleep(0.1)
+            return subprocess.CompletedProcess(cmd, 0, "exa  https://mcp.exa.ai/mcp", "")
+
+        monkeypatch.setattr("subprocess.run", fake_run)
+        probe = ProbeContext()
+        outputs = []
+
+        def worker():
+            outputs.append(probe.run(["mcporter", "config", "list"], timeout=5).stdout)
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert len(outputs) == 5
+        assert all("exa" in out for out in outputs)
+
+    def test_run_failure_is_shared(self, monkeypatch):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            raise subprocess.TimeoutExpired(cmd, kwargs.get("timeout"))
+
+        monkeypatch.setattr("subprocess.run", fake_run)
+        probe = ProbeContext()
+
+        for _ in range(2):
+            with pytest.raises(subprocess.TimeoutExpired):
+                probe.run(["gh", "auth", "status"], timeout=5)
+        assert len(calls) == 1
+
+
+class TestHttpProbe:
+    def test_concurrent_fetches_share_one_request(self, monkeypatch):
+        calls = []
+
+        def fake_urlopen(req, timeout=None):
+            calls.append(req.full_url)
+            time.sleep(0.1)
+            return _FakeResponse(b'{"code": 0}')
+
+        monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+        http = HttpProbe()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(http.fetch("https://api.example.com/x")))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert all(r.ok and r.json() == {"code": 0} for r in results)
+
+    def test_results_expire_after_window(self, monkeypatch):
+        calls = []
+
+        def fake_urlopen(req, timeout=None):
+            calls.append(req.full_url)
+            return _FakeResponse()
+
+        monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+
+        remembering = HttpProbe(window=60)
+        remembering.fetch("https://api.example.com/x")
+        remembering.fetch("https://api.example.com/x")
+        assert len(calls) == 1
+
+        forgetful = HttpProbe(window=0)
+        forgetful.fetch("https://api.example.com/x")
+        forgetful.fetch("https://api.example.com/x")
+        assert len(calls) == 3
+
+    def test_failure_is_reported_not_raised(self, monkeypatch):
+        from urllib.error import URLError
+
+        def fake_urlopen(req, timeout=None):
+            raise URLError("connection refused")
+
+        monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+
+        result = HttpProbe().fetch("https://api.example.com/x")
+
+        assert not result.ok
+        assert "connection refused" in result.error
+
+    def test_bilibili_check_calls_search_api_once(self, monkeypatch):
+        from agent_reach.channels import bilibili
+        from agent_reach.channels.bilibili import BilibiliChannel
+
+        calls = []
+
+        def fake_urlopen(req, timeout=None):
+            calls.append(req.full_url)
+            return _FakeResponse(b'{"code": 0}')
+
+        monkeypatch.setattr(
+            "shutil.which", lambda cmd: "/usr/bin/yt-dlp" if cmd == "yt-dlp" else None
+        )
+        monkeypatch.setattr(bilibili._opener, "open", fake_urlopen)
+
+        status, msg = BilibiliChannel().check()
+
+        assert status == "ok"
+        assert "B站 API 可用" in msg
+        assert len(calls) == 1
+
+
+
+class TestLatencyHistory:
+    def test_cold_start_uses_default(self):
+        from agent_reach.probe_latency import LatencyHistory
+
+        history = LatencyHistory()
+        history.record("gh auth status", 0.2)
+
+        assert history.timeout("gh auth status", 5) == 5
+
+    def test_timeout_follows_p99_within_bounds(self):
+        from agent_reach.probe_latency import (
+            MIN_SAMPLES,
+            MIN_TIMEOUT,
+            SAFETY_FACTOR,
+            LatencyHistory,
+        )
+
+        history = LatencyHistory()
+        for _ in range(MIN_SAMPLES):
+            history.record("fast", 0.1)
+            history.record("medium", 1.0)
+            history.record("slow", 8.0)
+
+        assert history.timeout("fast", 10) == MIN_TIMEOUT
+        assert history.timeout("medium", 10) == pytest.approx(1.0 * SAFETY_FACTOR)
+        assert history.timeout("slow", 10) == 10
+
+    def test_history_round_trips_through_disk(self, tmp_path):
+        from agent_reach.probe_latency import MIN_SAMPLES, LatencyHistory
+
+        history = LatencyHistory(tmp_path / "latency.json")
+        for _ in range(MIN_SAMPLES):
+            history.record("rdt status --json", 1.0)
+        history.save()
+
+        reloaded = LatencyHistory(tmp_path / "latency.json")
+        assert reloaded.p99("rdt status --json") == 1.0
+
+    def test_run_uses_learned_timeout_and_records_expiry(self, monkeypatch):
+        from agent_reach.probe_latency import MIN_SAMPLES, LatencyHistory
+
+        history = LatencyHistory()
+        for _ in range(MIN_SAMPLES):
+            history.record("gh auth status", 1.0)
+        seen = []
+
+        def fake_run(cmd, **kwargs):
+            seen.append(kwargs["timeout"])
+            raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+
+        monkeypatch.setattr("subprocess.run", fake_run)
+        probe = ProbeContext(latency=history)
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            probe.run(["/usr/bin/gh", "auth", "status"], timeout=5)
+
+        assert seen == [3.0]
+        assert history.samples["gh auth status"][-1] == 3.0
+        assert probe.steps[0]["timeout"] == 3.0
+
+
+def test_doctor_spawns_mcporter_config_list_once(monkeypatch, tmp_path):
+    from urllib.error import URLError
+
+    import agent_reach.channels.xueqiu as xueqiu_mod
+    import agent_reach.doctor as doctor
+    from agent_reach.config import Config
+
+    spawned = []
+
+    def offline(*_args, **_kwargs):
+        raise URLError("offline")
+
+    def fake_run(cmd, **kwargs):
+        spawned.append(tuple(cmd))
+        return subprocess.CompletedProcess(cmd, 0, "exa douyin weibo linkedin", "")
+
+    monkeypatch.setattr(
+        "shutil.which", lambda cmd: "/usr/bin/mcporter" if cmd == "mcporter" else None
+    )
+    monkeypatch.setattr("subprocess.run", fake_run)
+    monkeypatch.setattr("urllib.request.urlopen", offline)
+    monkeypatch.setattr(xueqiu_mod, "_cookies_initialized", True)
+    monkeypatch.setattr(xueqiu_mod._opener, "open", offline)
+
+    doctor.check_all(Config(config_path=tmp_path / "config.yaml"))
+
+    assert spawned.count(("/usr/bin/mcporter", "config", "list")) == 1
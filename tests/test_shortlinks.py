@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Tests for short-link canonicalization."""
+
+import urllib.error
+from email.message import Message
+
+import pytest
+
+import agent_reach.shortlinks as shortlinks
+from agent_reach.shortlinks import ShortLinkResolver, strip_tracking
+
+
+def _redirect(url, location, code=302):
+    headers = Message()
+    headers["Location"] = location
+    return urllib.error.HTTPError(url, code, "Found", headers, None)
+
+
+@pytest.fixture
+def redirects(monkeypatch):
+    """Serve redirects from a dict and record every request made."""
+    table = {}
+    requests = []
+
+    def fake_open(req, timeout=None):
+        requests.append((req.get_method(), req.full_url))
+        if req.full_url in table:
+            raise _redirect(req.full_url, table[req.full_url])
+        raise AssertionError(f"unexpected request to {req.full_url}")
+
+    monkeypatch.setattr(shortlinks._opener, "open", fake_open)
+    return table, requests
+
+
+class TestStripTracking:
+    def test_strips_bilibili_share_params_but_keeps_part(self):
+        url = "https://www.bilibili.com/video/BV1xx411?p=2&share_source=copy_link&vd_source=abc"
+        assert strip_tracking(url) == "https://www.bilibili.com/video/BV1xx411?p=2"
+
+    def test_keeps_xsec_token(self):
+        url = "https://www.xiaohongshu.com/discovery/item/1?xsec_token=tok&xsec_source=app_share&apptime=1"
+        assert strip_tracking(url) == "https://www.xiaohongshu.com/discovery/item/1?xsec_token=tok"
+
+    def test_drops_douyin_share_query(self):
+        url = "https://www.iesdouyin.com/share/video/123/?region=CN&u_code=x&did=1"
+        assert strip_tracking(url) == "https://www.iesdouyin.com/share/video/123/"
+
+    def test_share_params_of_other_hosts_are_kept(self):
+        url = "https://forum.example.com/viewthread?mid=10&timestamp=1&utm_source=x"
+        assert strip_tracking(url) == "https://forum.example.com/viewthread?mid=10&timestamp=1"
+        url = "https://space.bilibili.com/video?mid=10&timestamp=1"
+        assert strip_tracking(url) == "https://space.bilibili.com/video"
+
+    def test_untouched_query_is_not_reencoded(self):
+        url = "https://example.com/search?q=a+b&x=%2F"
+        assert strip_tracking(url) == url
+
+
+class TestShortLinkResolver:
+    def test_expands_with_head_requests_and_caches(self, redirects, tmp_path):
+        table, requests = redirects
+        table["https://b23.tv/abc"] = "https://www.bilibili.com/video/BV1xx411?share_source=copy_link"
+
+        resolver = ShortLinkResolver(tmp_path / "links.json")
+        assert resolver.resolve("https://b23.tv/abc") == "https://www.bilibili.com/video/BV1xx411"
+        resolver.save()
+
+        again = ShortLinkResolver(tmp_path / "links.json")
+        assert again.resolve("b23.tv/abc") == "https://www.bilibili.com/video/BV1xx411"
+        assert requests == [("HEAD", "https://b23.tv/abc")]
+
+    def test_follows_chained_short_links(self, redirects):
+        table, requests = redirects
+        table["https://t.co/x"] = "https://b23.tv/abc"
+        table["https://b23.tv/abc"] = "https://www.bilibili.com/video/BV1"
+
+        assert ShortLinkResolver().resolve("https://t.co/x") == "https://www.bilibili.com/video/BV1"
+        assert len(requests) == 2
+
+    def test_expired_entries_are_resolved_again(self, redirects):
+        table, requests = redirects
+        table["https://xhslink.com/a"] = "https://www.xiaohongshu.com/discovery/item/1?xsec_token=t"
+        resolver = ShortLinkResolver()
+        resolver.entries["https://xhslink.com/a"] = {"url": "stale", "resolved_at": 0}
+
+        assert resolver.resolve("https://xhslink.com/a").endswith("xsec_token=t")
+        assert len(requests) == 1
+
+    def test_network_failure_returns_original_and_is_not_cached(self, monkeypatch):
+        def offline(req, timeout=None):
+            raise urllib.error.URLError("offline")
+
+        monkeypatch.setattr(shortlinks._opener, "open", offline)
+        resolver = ShortLinkResolver()
+
+        assert resolver.resolve("https://v.douyin.com/abc/") == "https://v.douyin.com/abc/"
+        assert resolver.entries == {}
+
+    def test_regular_urls_are_not_fetched(self, redirects):
+        _table, requests = redirects
+        url = "https://github.com/user/repo?utm_source=x"
+
+        assert ShortLinkResolver().resolve(url) == "https://github.com/user/repo"
+        assert requests == []
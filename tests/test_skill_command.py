@@ -7,7 +7,7 @@ import tempfile
 import unittest
 from unittest.mock import patch
 
-from agent_reach.cli import _install_skill, _uninstall_skill
+from agent_reach.commands.skill import _install_skill, _uninstall_skill
 
 
 class TestSkillCommand(unittest.TestCase):
@@ -30,7 +30,7 @@ class TestSkillCommand(unittest.TestCase):
             os.makedirs(skill_dir)
 
             with patch(
-                "agent_reach.cli.os.path.expanduser",
+                "agent_reach.commands.skill.os.path.expanduser",
                 side_effect=lambda p: p.replace("~", tmpdir),
             ), patch.dict(os.environ, {}, clear=False):
                 # Remove OPENCLAW_HOME to avoid interference
@@ -64,7 +64,7 @@ class TestSkillCommand(unittest.TestCase):
             self.assertTrue(os.path.exists(skill_path))
 
             with patch(
-                "agent_reach.cli.os.path.expanduser",
+                "agent_reach.commands.skill.os.path.expanduser",
                 side_effect=lambda p: p.replace("~", tmpdir),
             ), patch.dict(os.environ, {}, clear=False):
                 env = os.environ.copy()
@@ -82,7 +82,7 @@ class TestSkillCommand(unittest.TestCase):
             os.makedirs(skill_parent)
 
             with patch(
-                "agent_reach.cli.os.path.expanduser",
+                "agent_reach.commands.skill.os.path.expanduser",
                 side_effect=lambda p: p.replace("~", tmpdir),
             ), patch.dict(os.environ, {}, clear=False):
                 env = os.environ.copy()
@@ -103,7 +103,7 @@ class TestSkillCommand(unittest.TestCase):
             os.makedirs(skill_parent)
 
             with patch(
-                "agent_reach.cli.os.path.expanduser",
+                "agent_reach.commands.skill.os.path.expanduser",
                 side_effect=lambda p: p.replace("~", tmpdir),
             ):
                 env = os.environ.copy()
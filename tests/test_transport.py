@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Tests for the pooled keep-alive HTTP transport."""
+
+import gzip
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agent_reach.transport import Transport, build_opener
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.seen.append(dict(self.headers))
+        body = b'{"ok": true}'
+        headers = {}
+        if self.path == "/gzip":
+            body = gzip.compress(b"hello " * 1000)
+            headers["Content-Encoding"] = "gzip"
+        elif self.path == "/missing":
+            body = b"not here"
+        self.send_response(404 if self.path == "/missing" else 200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == "/drop":
+            # Close without announcing it, like a server timing out keep-alive
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.connections = 0
+    srv.seen = []
+    thread = threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield srv, f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def opener():
+    transport = Transport()
+    # No ProxyHandler: requests go straight to the local test server
+    yield build_opener(urllib.request.ProxyHandler({}), transport=transport), transport
+    transport.close()
+
+
+class TestTransport:
+    def test_requests_to_one_host_share_a_connection(self, server, opener):
+        srv, base = server
+        op, transport = opener
+        for path in ("/t/1", "/t/1/replies", "/t/1/replies?p=2"):
+            with op.open(f"{base}{path}", timeout=5) as resp:
+                assert resp.read() == b'{"ok": true}'
+
+        assert srv.connections == 1
+        assert (transport.opened, transport.reused) == (1, 2)
+        assert all(h.get("Connection") == "keep-alive" for h in srv.seen)
+
+    def test_gzip_body_is_decoded(self, server, opener):
+        srv, base = server
+        op, _ = opener
+        with op.open(f"{base}/gzip", timeout=5) as resp:
+            head = resp.read(6)
+            rest = resp.read()
+
+        assert head + rest == b"hello " * 1000
+        assert "gzip" in srv.seen[0]["Accept-Encoding"]
+
+    def test_stale_connection_is_retried(self, server, opener):
+        srv, base = server
+        op, transport = opener
+        with op.open(f"{base}/drop", timeout=5) as resp:
+            resp.read()
+        with op.open(f"{base}/t/2", timeout=5) as resp:
+            assert resp.read() == b'{"ok": true}'
+
+        assert srv.connections == 2
+        assert transport.opened == 2
+
+    def test_http_errors_surface_and_keep_the_connection(self, server, opener):
+        srv, base = server
+        op, _ = opener
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            op.open(f"{base}/missing", timeout=5)
+        assert exc_info.value.code == 404
+        assert exc_info.value.read() == b"not here"
+        with op.open(f"{base}/t/3", timeout=5) as resp:
+            resp.read()
+
+        assert srv.connections == 1
+
+    def test_pool_size_limits_idle_connections(self, server):
+        srv, base = server
+        transport = Transport(pool_size=0)
+        op = build_opener(urllib.request.ProxyHandler({}), transport=transport)
+        for _ in range(2):
+            with op.open(f"{base}/t/4", timeout=5) as resp:
+                resp.read()
+
+        assert srv.connections == 2
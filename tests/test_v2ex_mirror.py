@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""Tests for the SQLite V2EX mirror."""
+
+import json
+import threading
+from unittest.mock import patch
+from urllib.error import URLError
+
+import pytest
+
+import agent_reach.channels.v2ex as v2ex_mod
+from agent_reach.channels.v2ex import V2EXChannel
+from agent_reach.v2ex_mirror import V2EXMirror
+
+
+class FakeV2EX:
+    """Topics per node and replies per topic, served like the v1 API."""
+
+    def __init__(self):
+        self.topics = {}  # node -> list of topic dicts
+        self.replies = {}  # topic_id -> list of reply dicts
+        self.requests = []
+        self.fail_pages = set()  # (topic_id, page) that raise
+        self._lock = threading.Lock()
+
+    def add_topic(self, node, topic_id, replies, touched):
+        self.topics.setdefault(node, [])
+        self.topics[node] = [t for t in self.topics[node] if t["id"] != topic_id]
+        self.topics[node].insert(0, {
+            "id": topic_id, "title": f"T{topic_id}", "url": f"https://www.v2ex.com/t/{topic_id}",
+            "content": "正文", "replies": replies, "created": 1, "last_modified": 1,
+            "last_touched": touched, "node": {"name": node, "title": node.title()},
+            "member": {"username": "alice"},
+        })
+        self.replies[topic_id] = [
+            {"id": topic_id * 10000 + n, "member": {"username": f"u{n}"}, "content": f"#{n}", "created": n}
+            for n in range(1, replies + 1)
+        ]
+
+    def open(self, req, timeout=None):
+        url = req.full_url
+        with self._lock:
+            self.requests.append(url)
+        query = dict(p.split("=") for p in url.split("?", 1)[1].split("&"))
+        if "replies/show" in url:
+            topic_id, page = int(query["topic_id"]), int(query["page"])
+            if (topic_id, page) in self.fail_pages:
+                raise URLError("connection reset")
+            payload = self.replies[topic_id][(page - 1) * 100:page * 100]
+        elif "node_name" in query:
+            payload = self.topics.get(query["node_name"], []) if query["page"] == "1" else []
+        else:
+            payload = [t for ts in self.topics.values() for t in ts if t["id"] == int(query["id"])]
+        return _Response(payload)
+
+    def reply_requests(self):
+        return [u for u in self.requests if "replies/show" in u]
+
+
+class _Response:
+    def __init__(self, payload):
+        self._body = json.dumps(payload).encode()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def read(self):
+        return self._body
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeV2EX()
+    monkeypatch.setattr(v2ex_mod._opener, "open", fake.open)
+    return fake
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    m = V2EXMirror(tmp_path / "v2ex.db")
+    yield m
+    m.close()
+
+
+class TestV2EXMirror:
+    def test_sync_stores_topics_and_replies(self, api, mirror):
+        api.add_topic("python", 1, replies=150, touched=100)
+        api.add_topic("python", 2, replies=0, touched=90)
+
+        report = mirror.sync(["python"])
+
+        assert report["python"] == {"new": 2, "updated": 0, "unchanged": 0, "replies": 150, "failed": 0}
+        assert mirror.stats() == {"nodes": 1, "topics": 2, "replies": 150, "pending": 0}
+        assert mirror._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_unchanged_topics_are_not_refetched(self, api, mirror):
+        api.add_topic("python", 1, replies=150, touched=100)
+        mirror.sync(["python"])
+        api.requests.clear()
+
+        report = mirror.sync(["python"])
+
+        assert report["python"]["unchanged"] == 1
+        assert api.reply_requests() == []
+
+    def test_new_replies_fetch_only_the_tail(self, api, mirror):
+        api.add_topic("python", 1, replies=250, touched=100)
+        mirror.sync(["python"])
+        api.requests.clear()
+        api.add_topic("python", 1, replies=260, touched=200)
+
+        report = mirror.sync(["python"])
+
+        assert report["python"]["updated"] == 1
+        assert [u.rsplit("page=", 1)[1] for u in api.reply_requests()] == ["3"]
+        floors = [r[0] for r in mirror._db.execute("SELECT floor FROM replies WHERE topic_id = 1")]
+        assert floors == list(range(1, 261))
+
+    def test_interrupted_sync_resumes_from_last_page(self, api, mirror):
+        api.add_topic("python", 1, replies=350, touched=100)
+        api.fail_pages.add((1, 3))
+
+        report = mirror.sync(["python"])
+        assert report["python"]["failed"] == 1
+        assert mirror.stats()["pending"] == 1
+        assert mirror.stats()["replies"] == 200
+
+        api.fail_pages.clear()
+        api.requests.clear()
+        report = mirror.sync([])
+
+        assert report["(resumed)"]["replies"] == 150
+        assert [u.rsplit("page=", 1)[1] for u in api.reply_requests()] == ["3", "4"]
+        assert mirror.stats() == {"nodes": 1, "topics": 1, "replies": 350, "pending": 0}
+
+    def test_channel_reads_fresh_mirror(self, api, mirror):
+        api.add_topic("python", 1, replies=120, touched=100)
+        mirror.sync(["python"])
+        api.requests.clear()
+        ch = V2EXChannel(mirror=mirror)
+
+        topics = ch.get_node_topics("python")
+        topic = ch.get_topic(1)
+        full = ch.get_topic(1, all_replies=True)
+
+        assert api.requests == []
+        assert topics[0]["id"] == 1 and topics[0]["node_title"] == "Python"
+        assert len(topic["replies"]) == 100
+        assert len(full["replies"]) == 120 and full["replies"][-1]["floor"] == 120
+
+    def test_stale_or_unsynced_nodes_go_to_the_network(self, api, mirror):
+        api.add_topic("python", 1, replies=0, touched=100)
+        api.add_topic("jobs", 2, replies=0, touched=100)
+        mirror.sync(["python"])
+        api.requests.clear()
+
+        V2EXChannel(mirror=mirror).get_node_topics("jobs")
+        mirror.max_age = 0
+        mirror._db.execute("UPDATE nodes SET synced_at = synced_at - 10")
+        V2EXChannel(mirror=mirror).get_topic(1)
+
+        assert len(api.requests) == 3  # jobs listing, topic 1, its replies
+
+
+def test_cli_sync(api, tmp_path, capsys, monkeypatch):
+    from agent_reach.cli import main
+    from agent_reach.config import Config
+
+    api.add_topic("python", 1, replies=5, touched=100)
+    api.add_topic("jobs", 2, replies=0, touched=100)
+    monkeypatch.setattr("agent_reach.config.Config", lambda: Config(config_path=tmp_path / "config.yaml"))
+
+    with patch("sys.argv", ["agent-reach", "v2ex", "sync", "--nodes", "python,jobs"]):
+        main()
+    with patch("sys.argv", ["agent-reach", "v2ex", "status"]):
+        main()
+
+    out = capsys.readouterr().out
+    assert "python：新增 1" in out and "回复 +5" in out
+    assert "2 个节点，2 个主题，5 条回复" in out
+    assert (tmp_path / "v2ex.db").exists()
+
+
+_default_mirror = v2ex_mod._default_mirror
+
+
+def test_channel_uses_synced_mirror_by_default(api, tmp_path, monkeypatch):
+    from agent_reach.config import Config
+
+    monkeypatch.setattr("agent_reach.config.Config", lambda: Config(config_path=tmp_path / "config.yaml"))
+    monkeypatch.setattr(v2ex_mod, "_default_mirror", _default_mirror)
+    monkeypatch.setattr(v2ex_mod, "_default_mirrors", {})
+    api.add_topic("python", 1, replies=5, touched=100)
+    ch = V2EXChannel()
+
+    # No database yet: nothing is created, requests go to the network
+    ch.get_node_topics("python")
+    assert ch.mirror is None and not (tmp_path / "v2ex.db").exists()
+
+    synced = V2EXMirror.for_config(Config(config_path=tmp_path / "config.yaml"))
+    synced.sync(["python"])
+    synced.close()
+    api.requests.clear()
+
+    assert ch.get_node_topics("python")[0]["id"] == 1
+    assert ch.get_topic(1)["replies"][0]["floor"] == 1
+    assert api.requests == []
+    v2ex_mod._default_mirrors[str(tmp_path / "v2ex.db")].close()
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Tests for V2EX quota tracking and the v1/v2 API fallback."""
+
+import json
+import time
+import urllib.error
+from email.message import Message
+
+import pytest
+
+import agent_reach.channels.v2ex as v2ex_mod
+from agent_reach.channels.v2ex import RateLimit, RateLimited, V2EXChannel
+
+
+def _headers(remaining=None, reset=None, limit=600):
+    headers = Message()
+    if remaining is not None:
+        headers["X-Rate-Limit-Limit"] = str(limit)
+        headers["X-Rate-Limit-Remaining"] = str(remaining)
+        headers["X-Rate-Limit-Reset"] = str(int(reset))
+    return headers
+
+
+class FakeResponse:
+    def __init__(self, payload, headers=None):
+        self._body = json.dumps(payload).encode("utf-8")
+        self.headers = headers if headers is not None else Message()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def read(self):
+        return self._body
+
+
+class FakeAPI:
+    """Routes v1 and v2 requests; ``fail[api]`` makes that API answer with an HTTP status."""
+
+    def __init__(self):
+        self.requests = []
+        self.fail = {}
+        self.headers = {}
+
+    def open(self, req, timeout=None):
+        url = req.full_url
+        api = "v2" if "/api/v2/" in url else "v1"
+        self.requests.append((api, url, req.get_header("Authorization")))
+        if api in self.fail:
+            code = self.fail[api]
+            raise urllib.error.HTTPError(url, code, "error", self.headers.get(api) or Message(), None)
+        headers = self.headers.get(api)
+        if api == "v2":
+            if "/replies" in url:
+                page = int(url.rsplit("p=", 1)[1])
+                count = 20 if page < 3 else 5
+                result = [{"id": page * 100 + i, "content": f"v2-{page}-{i}", "member": {"username": "u"}}
+                          for i in range(count)]
+            elif "/nodes/" in url:
+                result = [{"id": 7, "title": "via v2", "replies": 0}]
+            else:
+                result = {"id": 1, "title": "via v2", "replies": 45,
+                          "node": {"name": "python", "title": "Python"}, "member": {"username": "a"}}
+            return FakeResponse({"success": True, "message": "", "result": result}, headers)
+        if "replies/show.json" in url:
+            return FakeResponse([{"id": 1, "content": "v1", "member": {"username": "u"}}], headers)
+        return FakeResponse([{"id": 1, "title": "via v1", "replies": 1,
+                              "node": {"name": "python", "title": "Python"}}], headers)
+
+    def apis(self):
+        return [api for api, _, _ in self.requests]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeAPI()
+    monkeypatch.setattr(v2ex_mod._opener, "open", fake.open)
+    monkeypatch.setattr(v2ex_mod, "_quotas", {"v1": RateLimit(), "v2": RateLimit()})
+    return fake
+
+
+class TestRateLimit:
+    def test_headers_update_the_quota(self, api):
+        reset = time.time() + 3000
+        api.headers["v1"] = _headers(remaining=42, reset=reset)
+        ch = V2EXChannel(token="")
+        ch.get_node_topics("python")
+
+        assert ch.rate_limits()["v1"] == {"limit": 600, "remaining": 42, "reset": int(reset)}
+
+    def test_exhausted_quota_with_distant_reset_raises(self, api):
+        api.headers["v1"] = _headers(remaining=0, reset=time.time() + 1800)
+        ch = V2EXChannel(token="")
+        ch.get_node_topics("python")
+
+        with pytest.raises(RateLimited) as info:
+            ch.get_node_topics("python")
+        assert info.value.retry_after > 1700
+        assert "额度" in str(info.value)
+        assert len(api.requests) == 1  # the second call never went out
+
+    def test_exhausted_quota_with_near_reset_waits(self, api, monkeypatch):
+        slept = []
+        monkeypatch.setattr(v2ex_mod.time, "sleep", slept.append)
+        api.headers["v1"] = _headers(remaining=0, reset=time.time() + 5)
+        ch = V2EXChannel(token="")
+        ch.get_node_topics("python")
+        ch.get_node_topics("python")
+
+        assert len(api.requests) == 2
+        assert 0 < slept[0] <= 6
+
+    def test_concurrent_callers_all_wait_for_the_reset(self):
+        import threading
+
+        quota = RateLimit()
+        quota.remaining, quota.reset = 0, time.time() + 0.3
+        started = []
+
+        def call():
+            quota.acquire("v1", max_wait=5)
+            started.append(time.time())
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(started) == 4
+        assert min(started) >= quota.reset - 0.01
+
+    def test_low_quota_is_paced(self):
+        quota = RateLimit()
+        now = time.time()
+        quota.update(_headers(remaining=4, reset=now + 8))
+
+        assert quota.delay(now) == 0
+        quota.acquire("v1", max_wait=0)
+        assert quota.remaining == 3
+        assert quota.delay(now) == pytest.approx(2, abs=0.5)
+        with pytest.raises(RateLimited):
+            quota.acquire("v1", max_wait=0)
+
+    def test_429_marks_the_api_exhausted(self, api):
+        api.fail["v1"] = 429
+        with pytest.raises(RateLimited):
+            V2EXChannel(token="").get_node_topics("python")
+        assert v2ex_mod._quotas["v1"].remaining == 0
+
+
+class TestV2Fallback:
+    def test_token_routes_topics_through_v2(self, api):
+        ch = V2EXChannel(token="tok")
+        topic = ch.get_topic(1)
+
+        assert topic["title"] == "via v2"
+        assert topic["node_name"] == "python"
+        assert api.requests[0] == ("v2", "https://www.v2ex.com/api/v2/topics/1", "Bearer tok")
+        # Replies still come from v1 while it has quota
+        assert api.apis() == ["v2", "v1"]
+
+    def test_v2_out_of_quota_falls_back_to_v1(self, api):
+        api.fail["v2"] = 429
+        topics = V2EXChannel(token="tok").get_node_topics("python")
+
+        assert topics[0]["title"] == "via v1"
+        assert api.apis() == ["v2", "v1"]
+
+    def test_rejected_token_falls_back_to_v1(self, api):
+        api.fail["v2"] = 401
+        topics = V2EXChannel(token="bad").get_node_topics("python")
+
+        assert topics[0]["title"] == "via v1"
+
+    def test_v1_exhausted_reads_replies_from_v2(self, api):
+        v2ex_mod._quotas["v1"].update(_headers(remaining=0, reset=time.time() + 1800))
+        ch = V2EXChannel(token="tok")
+        topic = ch.get_topic(1, all_replies=True)
+
+        assert "v1" not in api.apis()
+        assert len(topic["replies"]) == 45
+        assert [r["floor"] for r in topic["replies"]] == list(range(1, 46))
+        assert topic["replies"][0]["content"] == "v2-1-0"
+
+    def test_without_token_v1_errors_propagate(self, api):
+        v2ex_mod._quotas["v1"].update(_headers(remaining=0, reset=time.time() + 1800))
+        with pytest.raises(RateLimited):
+            V2EXChannel(token="").get_node_topics("python")
+        assert api.requests == []
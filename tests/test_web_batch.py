@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Tests for WebChannel.read_many and `agent-reach read --batch`."""
+
+import json
+import threading
+import time
+import urllib.error
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+
+import agent_reach.channels.web as web
+from agent_reach.channels.router import split_url
+from agent_reach.channels.web import WebChannel
+
+
+class _FakeResponse:
+    def __init__(self, body: str):
+        self._body = body.encode("utf-8")
+        self.headers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def read(self):
+        return self._body
+
+
+@pytest.fixture
+def jina(monkeypatch):
+    """Serve pages from {url: (body, delay)}; track concurrent requests per host."""
+    pages = {}
+    lock = threading.Lock()
+    active = Counter()
+    peak = Counter()
+
+    def fake_open(req, timeout=None):
+        url = req.full_url.removeprefix("https://r.jina.ai/")
+        host = split_url(url)[0]
+        with lock:
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+        try:
+            body, delay = pages[url]
+            time.sleep(delay)
+            if body is None:
+                raise urllib.error.HTTPError(req.full_url, 500, "Server Error", {}, None)
+            return _FakeResponse(body)
+        finally:
+            with lock:
+                active[host] -= 1
+
+    monkeypatch.setattr(web._opener, "open", fake_open)
+    return pages, peak
+
+
+class TestReadMany:
+    def test_results_arrive_in_completion_order(self, jina):
+        pages, _ = jina
+        pages["https://a.com/slow"] = ("# slow", 0.3)
+        pages["https://b.com/fast"] = ("# fast", 0.0)
+
+        results = list(WebChannel().read_many(["https://a.com/slow", "https://b.com/fast"]))
+
+        assert [r.position for r in results] == [1, 0]
+        assert [r.text for r in results] == ["# fast", "# slow"]
+        assert all(r.ok for r in results)
+
+    def test_one_failure_does_not_abort_the_batch(self, jina):
+        pages, _ = jina
+        pages["https://a.com/1"] = ("# one", 0.0)
+        pages["https://a.com/broken"] = (None, 0.0)
+        pages["https://b.com/2"] = ("# two", 0.0)
+
+        results = {r.url: r for r in WebChannel().read_many(list(pages))}
+
+        assert not results["https://a.com/broken"].ok
+        assert "500" in results["https://a.com/broken"].error
+        assert results["https://a.com/1"].text == "# one"
+        assert results["https://b.com/2"].text == "# two"
+
+    def test_slow_page_times_out_alone(self, jina):
+        pages, _ = jina
+        pages["https://a.com/hang"] = ("# late", 1.0)
+        pages["https://b.com/ok"] = ("# ok", 0.0)
+
+        start = time.monotonic()
+        results = {r.url: r for r in WebChannel().read_many(list(pages), timeout=0.2)}
+
+        assert time.monotonic() - start < 0.9
+        assert "超时" in results["https://a.com/hang"].error
+        assert results["https://b.com/ok"].ok
+
+    def test_per_host_cap(self, jina):
+        pages, peak = jina
+        urls = [f"https://a.com/{i}" for i in range(6)] + [f"https://b.com/{i}" for i in range(2)]
+        for url in urls:
+            pages[url] = ("# page", 0.05)
+
+        results = list(WebChannel().read_many(urls, workers=8, per_host=2))
+
+        assert len(results) == 8 and all(r.ok for r in results)
+        assert peak["a.com"] == 2
+        assert peak["b.com"] <= 2
+
+    def test_queued_time_does_not_count_toward_the_deadline(self, jina):
+        pages, _ = jina
+        urls = [f"https://a.com/{i}" for i in range(4)]
+        for url in urls:
+            pages[url] = ("# page", 0.15)
+
+        # One at a time: the last page waits ~0.45 s but each fetch takes 0.15 s
+        results = list(WebChannel().read_many(urls, per_host=1, timeout=0.5))
+
+        assert all(r.ok for r in results)
+
+
+def test_cli_batch_prints_ndjson(tmp_path, monkeypatch, capsys, jina):
+    from agent_reach.cli import main
+
+    pages, _ = jina
+    pages["https://a.com/1"] = ("# one", 0.0)
+    pages["https://a.com/broken"] = (None, 0.0)
+    batch = tmp_path / "urls.txt"
+    batch.write_text("# research\nhttps://a.com/1\n\nhttps://a.com/broken\n", encoding="utf-8")
+
+    with patch("sys.argv", ["agent-reach", "read", "--batch", str(batch), "--no-cache"]):
+        main()
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    pages_out = {line["url"]: line for line in lines if line["type"] == "page"}
+    assert pages_out["https://a.com/1"]["text"] == "# one"
+    assert pages_out["https://a.com/broken"]["ok"] is False
+    assert lines[-1] == {**lines[-1], "type": "summary", "ok": 1, "total": 2}
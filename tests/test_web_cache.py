@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""Tests for the WebChannel content cache."""
+
+import urllib.error
+from email.message import Message
+
+import pytest
+
+import agent_reach.channels.web as web
+from agent_reach.channels.web import WebChannel
+from agent_reach.config import Config
+from agent_reach.web_cache import WebCache
+
+
+class _FakeResponse:
+    def __init__(self, body: str, headers=None):
+        self._body = body.encode("utf-8")
+        self.headers = Message()
+        for name, value in (headers or {}).items():
+            self.headers[name] = value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def read(self):
+        return self._body
+
+
+@pytest.fixture
+def tmp_config(tmp_path):
+    return Config(config_path=tmp_path / "config.yaml")
+
+
+@pytest.fixture
+def jina(monkeypatch):
+    """Serve pages from a dict; record (url, headers) of every request."""
+    pages = {}
+    requests = []
+
+    def fake_open(req, timeout=None):
+        url = req.full_url.removeprefix("https://r.jina.ai/")
+        headers = dict(req.header_items())
+        requests.append((url, headers))
+        body, etag = pages[url]
+        if etag and headers.get("If-none-match") == etag:
+            raise urllib.error.HTTPError(req.full_url, 304, "Not Modified", Message(), None)
+        return _FakeResponse(body, {"ETag": etag} if etag else {})
+
+    monkeypatch.setattr(web._opener, "open", fake_open)
+    return pages, requests
+
+
+class TestWebCache:
+    def test_second_read_is_served_from_disk(self, tmp_path, jina):
+        pages, requests = jina
+        pages["https://example.com/a"] = ("# A", None)
+
+        cache = WebCache(tmp_path)
+        first = WebChannel().read("https://example.com/a", cache=cache)
+        cache.save()
+        cache = WebCache(tmp_path)
+        second = WebChannel().read("https://example.com/a", cache=cache)
+
+        assert first == second == "# A"
+        assert len(requests) == 1
+        assert cache.session["hits"] == 1
+        assert list(tmp_path.glob("*.md.gz"))
+
+    def test_tracking_params_share_a_cache_entry(self, jina):
+        pages, requests = jina
+        pages["https://example.com/a?utm_source=x"] = ("# A", None)
+        cache = WebCache()
+
+        WebChannel().read("https://example.com/a?utm_source=x", cache=cache)
+        WebChannel().read("https://example.com/a", cache=cache)
+
+        assert len(requests) == 1
+
+    def test_share_params_of_other_hosts_key_separate_entries(self, jina):
+        pages, requests = jina
+        pages["https://forum.example.com/viewthread?mid=10"] = ("# 10", None)
+        pages["https://forum.example.com/viewthread?mid=11"] = ("# 11", None)
+        cache = WebCache()
+
+        first = WebChannel().read("https://forum.example.com/viewthread?mid=10", cache=cache)
+        second = WebChannel().read("https://forum.example.com/viewthread?mid=11", cache=cache)
+
+        assert (first, second) == ("# 10", "# 11")
+        assert len(requests) == 2
+        assert len(cache.entries) == 2
+
+    def test_stale_entry_is_revalidated_with_etag(self, jina):
+        pages, requests = jina
+        pages["https://example.com/a"] = ("# A", '"v1"')
+        cache = WebCache(max_age=0)
+
+        WebChannel().read("https://example.com/a", cache=cache)
+        key = next(iter(cache.entries))
+        cache.entries[key]["validated_at"] -= 10
+        text = WebChannel().read("https://example.com/a", cache=cache)
+
+        assert text == "# A"
+        assert requests[1][1]["If-none-match"] == '"v1"'
+        assert cache.session == {"hits": 0, "misses": 1, "revalidated": 1, "evictions": 0}
+
+    def test_changed_page_replaces_entry(self, jina):
+        pages, _ = jina
+        pages["https://example.com/a"] = ("# old", '"v1"')
+        cache = WebCache(max_age=-1)
+
+        WebChannel().read("https://example.com/a", cache=cache)
+        pages["https://example.com/a"] = ("# new", '"v2"')
+
+        assert WebChannel().read("https://example.com/a", cache=cache) == "# new"
+        assert cache.session["misses"] == 2
+
+    def test_byte_cap_evicts_least_recently_read(self):
+        cache = WebCache()
+        for name, accessed_at in (("a", 1), ("b", 3), ("c", 2)):
+            cache.put(name, f"https://example.com/{name}", f"# {name}")
+            cache.entries[name]["accessed_at"] = accessed_at
+        cache.max_bytes = cache.total_bytes - 1
+        cache.evict()
+
+        assert set(cache.entries) == {"b", "c"}
+        assert cache.session["evictions"] == 1
+
+    def test_counters_accumulate_across_runs(self, tmp_path, jina):
+        pages, _ = jina
+        pages["https://example.com/a"] = ("# A", None)
+        for _ in range(3):
+            cache = WebCache(tmp_path)
+            WebChannel().read("https://example.com/a", cache=cache)
+            cache.save()
+
+        assert WebCache(tmp_path).stats()["total"]["hits"] == 2
+        assert WebCache(tmp_path).stats()["total"]["misses"] == 1
+
+    def test_concurrent_processes_keep_each_others_entries(self, tmp_path):
+        first, second = WebCache(tmp_path), WebCache(tmp_path)
+        first.put("a", "https://example.com/a", "# A")
+        first.count("misses")
+        second.put("b", "https://example.com/b", "# B")
+        second.count("misses")
+        first.save()
+        second.save()
+
+        cache = WebCache(tmp_path)
+        assert set(cache.entries) == {"a", "b"}
+        assert cache.get("a")["text"] == "# A"
+        assert cache.stats()["total"]["misses"] == 2
+
+    def test_merged_entries_count_against_the_byte_cap(self, tmp_path):
+        first, second = WebCache(tmp_path), WebCache(tmp_path)
+        first.put("a", "https://example.com/a", "# A")
+        first.save()
+        second.put("b", "https://example.com/b", "# B")
+        second.entries["b"]["accessed_at"] = first.entries["a"]["accessed_at"] + 1
+        second.max_bytes = second.total_bytes
+        second.save()
+
+        assert set(WebCache(tmp_path).entries) == {"b"}
+        assert not (tmp_path / "a.md.gz").exists()
+
+    def test_repeated_saves_do_not_double_count(self, tmp_path):
+        cache = WebCache(tmp_path)
+        cache.count("hits")
+        cache.save()
+        cache.count("hits")
+        cache.save()
+
+        assert cache.stats()["total"]["hits"] == 2
+        assert WebCache(tmp_path).stats()["total"]["hits"] == 2
+
+    def test_cli_no_cache_bypasses_cache(self, tmp_config, monkeypatch, capsys, jina):
+        from unittest.mock import patch
+
+        from agent_reach.cli import main
+
+        pages, requests = jina
+        pages["https://example.com/a"] = ("# A", None)
+        monkeypatch.setattr("agent_reach.config.Config", lambda: tmp_config)
+        for _ in range(2):
+            with patch("sys.argv", ["agent-reach", "read", "https://example.com/a", "--no-cache"]):
+                main()
+
+        assert capsys.readouterr().out == "# A\n# A\n"
+        assert len(requests) == 2
+        assert not (tmp_config.config_dir / "web-cache").exists()
+
+
+class TestReaderOptions:
+    def test_options_become_headers_and_key_the_cache(self, jina):
+        from agent_reach.channels.web import ReaderOptions
+
+        pages, requests = jina
+        pages["https://example.com/a"] = ("# A", None)
+        cache = WebCache()
+
+        WebChannel().read("https://example.com/a", cache=cache)
+        WebChannel().read("https://example.com/a", cache=cache,
+                          options=ReaderOptions(target_selector="main", images=False))
+        WebChannel().read("https://example.com/a", cache=cache,
+                          options=ReaderOptions(target_selector="main", images=False))
+
+        assert len(requests) == 2
+        assert "X-target-selector" not in requests[0][1]
+        assert requests[1][1]["X-target-selector"] == "main"
+        assert requests[1][1]["X-retain-images"] == "none"
+        assert cache.session["hits"] == 1
+
+    def test_default_options_keep_existing_cache_keys(self):
+        from agent_reach.channels.web import ReaderOptions
+
+        assert ReaderOptions().cache_options() == {"accept": "text/plain"}
+
+    def test_site_profile_applies_and_explicit_options_win(self, jina):
+        from agent_reach.channels.web import ReaderOptions, options_for
+
+        profile = options_for("https://foo.readthedocs.io/en/latest/")
+        assert "nav" in profile.remove_selector
+        assert profile.images is False
+
+        merged = options_for("https://foo.readthedocs.io/", ReaderOptions(images=True, target_selector="main"))
+        assert (merged.images, merged.target_selector) == (True, "main")
+        assert merged.remove_selector == profile.remove_selector
+
+        assert options_for("https://foo.readthedocs.io/", profile=False) == ReaderOptions()
+        assert options_for("https://example.com/") == ReaderOptions()
+
+    def test_cli_flags(self, monkeypatch, capsys, jina):
+        from unittest.mock import patch
+
+        from agent_reach.cli import main
+
+        pages, requests = jina
+        pages["https://docs.python.org/3/"] = ("# Python", None)
+        argv = ["agent-reach", "read", "https://docs.python.org/3/", "--no-cache",
+                "--remove", "nav", "--format", "text", "--no-links", "--no-profile"]
+        with patch("sys.argv", argv):
+            main()
+
+        headers = requests[0][1]
+        assert headers["X-remove-selector"] == "nav"
+        assert headers["X-return-format"] == "text"
+        assert headers["X-md-link-style"] == "discarded"
+        assert "X-target-selector" not in headers  # profile disabled
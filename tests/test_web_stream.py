@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Tests for WebChannel.read_stream and `agent-reach read --output`."""
+
+import io
+from unittest.mock import patch
+
+import pytest
+
+import agent_reach.channels.web as web
+from agent_reach.channels.web import TRUNCATION_MARKER, WebChannel, _decode_capped
+
+
+class _FakeResponse(io.BytesIO):
+    headers: dict = {}
+    consumed = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.consumed += len(data)
+        return data
+
+
+@pytest.fixture
+def jina(monkeypatch):
+    """Serve one body; return the response so tests can see how much was read."""
+    served = {}
+
+    def fake_open(req, timeout=None):
+        served["resp"] = _FakeResponse(served["body"].encode("utf-8"))
+        return served["resp"]
+
+    monkeypatch.setattr(web._opener, "open", fake_open)
+    return served
+
+
+class TestDecodeCapped:
+    def test_multibyte_characters_split_across_chunks(self, monkeypatch):
+        monkeypatch.setattr(web, "STREAM_CHUNK", 4)
+        text = "网页内容 — 读取"
+        chunks = list(_decode_capped(io.BytesIO(text.encode("utf-8")).read))
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == text
+
+    def test_byte_cap_drops_a_split_character(self):
+        chunks = list(_decode_capped(io.BytesIO("ab网页".encode("utf-8")).read, max_bytes=4))
+
+        assert chunks == ["ab", TRUNCATION_MARKER]
+
+    def test_body_exactly_at_the_cap_is_not_truncated(self):
+        assert list(_decode_capped(io.BytesIO(b"abcd").read, max_bytes=4)) == ["abcd"]
+
+    def test_char_cap(self):
+        chunks = list(_decode_capped(io.BytesIO("网页内容".encode("utf-8")).read, max_chars=2))
+
+        assert chunks == ["网页", TRUNCATION_MARKER]
+
+
+class TestReadStream:
+    def test_stops_reading_at_max_bytes(self, jina, monkeypatch):
+        monkeypatch.setattr(web, "STREAM_CHUNK", 1024)
+        jina["body"] = "x" * 100_000
+
+        text = "".join(WebChannel().read_stream("https://example.com/big", max_bytes=2000))
+
+        assert text == "x" * 2000 + TRUNCATION_MARKER
+        assert jina["resp"].consumed <= 2001
+        assert jina["resp"].closed
+
+    def test_cli_output_streams_to_file(self, tmp_path, capsys, jina):
+        from agent_reach.cli import main
+
+        jina["body"] = "# Title\n\n" + "段落。" * 1000
+        out = tmp_path / "page.md"
+        argv = ["agent-reach", "read", "https://example.com/doc", "--no-cache", "-o", str(out)]
+        with patch("sys.argv", argv):
+            main()
+
+        assert out.read_text(encoding="utf-8") == jina["body"]
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "已写入" in captured.err
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_cli_max_chars_to_stdout(self, capsys, jina):
+        from agent_reach.cli import main
+
+        jina["body"] = "abcdef"
+        with patch("sys.argv", ["agent-reach", "read", "example.com", "--no-cache", "--max-chars", "3"]):
+            main()
+
+        assert capsys.readouterr().out == "abc" + TRUNCATION_MARKER